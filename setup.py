@@ -8,6 +8,7 @@ setup(
     packages=find_packages(where='src'),
     package_dir={'': 'src'},
     install_requires=[
+        'numpy',
         'pandas',
         'matplotlib',
         'seaborn',
@@ -17,4 +18,8 @@ setup(
         'pytest-mock',
         # Add other dependencies as needed
     ],
+    extras_require={
+        'fast': ['pyarrow'],  # pyarrow CSV backend
+        'excel': ['openpyxl'],  # tools/excel_converter.py
+    },
 )
@@ -0,0 +1,217 @@
+# batch_loader.py
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from config_loader import ConfigLoader
+from data_loader import DataLoader
+from instrumentation import StageRecorder
+from resampling import interpolate_to_grid
+
+logger = logging.getLogger(__name__)
+
+
+class RunBatch:
+    """Online signals of several runs on a common elapsed-hours grid, plus their offline data."""
+
+    def __init__(self, runs: List[str], grid: np.ndarray, signals: Dict[str, np.ndarray],
+                 offline_data: Dict[str, pd.DataFrame], failed: Dict[str, str]):
+        """
+        Initialize the RunBatch.
+
+        :param runs: Run names, in the order of the rows of the signal arrays.
+        :param grid: Elapsed hours of the grid points.
+        :param signals: One array of shape (runs, grid points) per online signal.
+        :param offline_data: Offline DataFrame of every run.
+        :param failed: Error message of every run that could not be loaded.
+        """
+        self.runs = runs
+        self.grid = grid
+        self.signals = signals
+        self.offline_data = offline_data
+        self.failed = failed
+
+    def frame(self, signal: str) -> pd.DataFrame:
+        """
+        Return one signal as a DataFrame indexed by elapsed hours with one column per run.
+
+        :param signal: Signal name, e.g. 'sO2'.
+        :return: DataFrame viewing the stacked array.
+        """
+        return pd.DataFrame(
+            self.signals[signal].T,
+            index=pd.Index(self.grid, name='elapsed_hours'),
+            columns=pd.Index(self.runs, name='run'),
+            copy=False
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return all signals as one long DataFrame with a (run, elapsed_hours) MultiIndex.
+
+        :return: DataFrame with one column per signal.
+        """
+        index = pd.MultiIndex.from_product([self.runs, self.grid], names=['run', 'elapsed_hours'])
+        return pd.DataFrame({signal: values.ravel() for signal, values in self.signals.items()}, index=index)
+
+
+class BatchLoader:
+    """Class to load many runs concurrently and resample them onto a common time grid."""
+
+    def __init__(self, config: ConfigLoader, project_root: Path, use_cache: bool = True,
+                 recorder: Optional[StageRecorder] = None):
+        """
+        Initialize the BatchLoader with configuration settings and project root.
+
+        :param config: Instance of ConfigLoader containing configuration parameters.
+        :param project_root: Path object representing the project root directory.
+        :param use_cache: Whether the parsed-data cache may be used (if enabled in the configuration).
+        :param recorder: StageRecorder measuring the batch stages (optional; disabled by default).
+        """
+        self.config = config
+        self.project_root = project_root
+        self.use_cache = use_cache
+        self.recorder = recorder if recorder is not None else StageRecorder()
+        batch_config = (config.get('data_loader') or {}).get('batch') or {}
+        self.online_pattern = batch_config.get('online_pattern', 'onlindata_*.txt')
+        self.offline_pattern = batch_config.get('offline_pattern', 'offlindata_*.txt')
+        self.grid_step_hours = batch_config.get('grid_step_hours', 0.1)
+        self.max_gap_hours = batch_config.get('max_gap_hours')
+        self.workers = batch_config.get('workers', 4)
+        self.numeric_columns = config.get('data_processor', 'online_numeric_columns', [])
+        self.signals = batch_config.get('signals') or self.numeric_columns
+
+    def find_runs(self, runs: Union[str, Path, Iterable[Union[str, Path]]]) -> List[Path]:
+        """
+        Resolve run directories from a glob pattern or a list of directories.
+
+        :param runs: Glob pattern relative to the project root (e.g. 'data/hk*'),
+            a single directory, or a list of directories.
+        :return: Sorted run directories.
+        """
+        if isinstance(runs, str) and any(char in runs for char in '*?['):
+            return sorted(path for path in self.project_root.glob(runs) if path.is_dir())
+        if isinstance(runs, (str, Path)):
+            runs = [runs]
+        return [self.project_root / run for run in runs]
+
+    def load_run(self, run_dir: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Load and process the offline and online data of one run directory.
+
+        :param run_dir: Directory with one offline and one online file.
+        :return: Tuple of the offline and the processed online DataFrame.
+        """
+        loader = DataLoader(self.config, self.project_root, use_cache=self.use_cache)
+        loader.offline_file = self._find_file(run_dir, self.offline_pattern)
+        loader.online_file = self._find_file(run_dir, self.online_pattern)
+        loader.load_processed_data(self.numeric_columns)
+        return loader.offline_data, loader.online_data
+
+    @staticmethod
+    def run_names(run_dirs: List[Path]) -> List[str]:
+        """
+        Name runs by their path relative to the common parent of all run directories.
+
+        Runs in one directory keep their directory name ('run_a'); runs with the same
+        directory name under different parents stay apart ('line_1/run_a', 'line_2/run_a').
+
+        :param run_dirs: Run directories.
+        :return: Run names, in the order of run_dirs.
+        """
+        paths = [os.path.abspath(run_dir) for run_dir in run_dirs]
+        if len(set(paths)) < len(paths):
+            duplicates = sorted({path for path in paths if paths.count(path) > 1})
+            logger.error("Run directories given more than once: %s", duplicates)
+            raise ValueError(f"Run directories given more than once: {duplicates}")
+        if not paths:
+            return []
+        root = os.path.commonpath([os.path.dirname(path) for path in paths])
+        return [Path(os.path.relpath(path, root)).as_posix() for path in paths]
+
+    @staticmethod
+    def _find_file(run_dir: Path, pattern: str) -> Path:
+        """
+        Find the single file of a run directory matching a pattern.
+
+        :param run_dir: Run directory.
+        :param pattern: Glob pattern of the file name.
+        :return: Path of the file.
+        """
+        matches = sorted(run_dir.glob(pattern))
+        if not matches:
+            raise FileNotFoundError(f"No file matching '{pattern}' in {run_dir}")
+        if len(matches) > 1:
+            logger.warning("Several files match '%s' in %s; using %s.", pattern, run_dir, matches[0].name)
+        return matches[0]
+
+    def load(self, runs: Union[str, Path, Iterable[Union[str, Path]]],
+             grid: Optional[np.ndarray] = None) -> RunBatch:
+        """
+        Load several runs concurrently and resample their online signals onto a common grid.
+
+        Runs that cannot be loaded are skipped and listed in RunBatch.failed. Runs are
+        named by their path relative to the common parent of the run directories (see
+        run_names()).
+
+        :param runs: Glob pattern relative to the project root, a directory, or a list of directories.
+        :param grid: Elapsed hours to resample onto (optional; default is 0 to the longest
+            run in steps of 'grid_step_hours').
+        :return: RunBatch with one (runs, grid points) array per signal.
+        """
+        run_dirs = self.find_runs(runs)
+        names = self.run_names(run_dirs)
+        logger.info("Loading %s runs with %s thread(s).", len(run_dirs), self.workers)
+        loaded: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+        failed: Dict[str, str] = {}
+        with self.recorder.stage('batch_load', runs=len(run_dirs)) as stage:
+            with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+                futures = {name: executor.submit(self.load_run, run_dir) for name, run_dir in zip(names, run_dirs)}
+                for name, future in futures.items():
+                    try:
+                        loaded[name] = future.result()
+                    except Exception as e:
+                        logger.error("Skipping run %s: %s", name, e)
+                        failed[name] = str(e)
+            stage.rows = sum(len(online_data) for _, online_data in loaded.values())
+
+        if grid is None:
+            end = max(
+                (np.nanmax(online_data['elapsed_hours'].to_numpy(), initial=0.0) for _, online_data in loaded.values()),
+                default=0.0
+            )
+            grid = np.arange(0.0, end + self.grid_step_hours / 2, self.grid_step_hours)
+
+        runs_loaded = list(loaded)
+        signals = {signal: np.full((len(runs_loaded), len(grid)), np.nan) for signal in self.signals}
+        with self.recorder.stage('resample', rows=len(runs_loaded) * len(grid)):
+            for row, name in enumerate(runs_loaded):
+                online_data = loaded[name][1]
+                present = [signal for signal in self.signals if signal in online_data.columns]
+                missing = [signal for signal in self.signals if signal not in online_data.columns]
+                if missing:
+                    logger.warning("Run %s has no signals %s; they are left empty.", name, missing)
+                if not present:
+                    continue
+                resampled = interpolate_to_grid(
+                    online_data['elapsed_hours'].to_numpy(dtype=float),
+                    np.column_stack([online_data[signal].to_numpy(dtype=float) for signal in present]),
+                    grid,
+                    max_gap=self.max_gap_hours
+                )
+                for column, signal in enumerate(present):
+                    signals[signal][row] = resampled[:, column]
+
+        logger.info("Resampled %s runs onto %s grid points.", len(runs_loaded), len(grid))
+        return RunBatch(
+            runs=runs_loaded,
+            grid=grid,
+            signals=signals,
+            offline_data={name: offline_data for name, (offline_data, _) in loaded.items()},
+            failed=failed
+        )
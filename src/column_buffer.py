@@ -0,0 +1,108 @@
+# column_buffer.py
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _common_dtype(left: np.dtype, right: np.dtype) -> np.dtype:
+    """
+    Dtype that can hold values of both dtypes, object if numpy has none.
+
+    :param left: First dtype.
+    :param right: Second dtype.
+    :return: The common dtype.
+    """
+    try:
+        return np.result_type(left, right)
+    except TypeError:
+        return np.dtype(object)
+
+
+class ColumnBuffer:
+    """Growable 1-D array; its capacity doubles, so appending n values costs amortized O(n)."""
+
+    def __init__(self, values: Any = None):
+        """
+        Initialize the ColumnBuffer.
+
+        :param values: Initial values (optional).
+        """
+        values = np.asarray(values if values is not None else [])
+        self._data = np.empty(max(len(values), 16), dtype=values.dtype)
+        self._data[:len(values)] = values
+        self._length = len(values)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, values: Any) -> None:
+        """
+        Append values, growing the buffer if needed.
+
+        Views returned by view() before the call keep their values.
+
+        :param values: Values to append; an incompatible dtype promotes the buffer (e.g. to object).
+        """
+        values = np.asarray(values)
+        length = self._length + len(values)
+        dtype = self._data.dtype if values.dtype == self._data.dtype else _common_dtype(self._data.dtype, values.dtype)
+        if length > len(self._data) or dtype != self._data.dtype:
+            data = np.empty(max(length, 2 * len(self._data)), dtype=dtype)
+            data[:self._length] = self._data[:self._length]
+            self._data = data
+        self._data[self._length:length] = values
+        self._length = length
+
+    def view(self) -> np.ndarray:
+        """
+        View of the filled part of the buffer; no values are copied.
+
+        :return: Array of length len(self).
+        """
+        return self._data[:self._length]
+
+
+class FrameBuffer:
+    """Column buffers behind a DataFrame that only grows at the end."""
+
+    def __init__(self, frame: Optional[pd.DataFrame] = None):
+        """
+        Initialize the FrameBuffer.
+
+        :param frame: Initial rows (optional); its columns are copied once.
+        """
+        self._columns: Dict[Any, ColumnBuffer] = {}
+        self._length = 0
+        if frame is not None:
+            self.append(frame)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, frame: pd.DataFrame) -> None:
+        """
+        Append rows; only the new rows are copied.
+
+        :param frame: Rows with the columns of the earlier rows (any columns for the first rows).
+        """
+        if self._columns and list(frame.columns) != list(self._columns):
+            logger.error("Cannot append columns %s to columns %s.", list(frame.columns), list(self._columns))
+            raise ValueError(f"Cannot append columns {list(frame.columns)} to columns {list(self._columns)}.")
+        for column, values in frame.items():
+            if column in self._columns:
+                self._columns[column].append(values.to_numpy())
+            else:
+                self._columns[column] = ColumnBuffer(values.to_numpy())
+        self._length += len(frame)
+
+    def frame(self) -> pd.DataFrame:
+        """
+        DataFrame of all rows with a RangeIndex, built from views of the buffers.
+
+        :return: The DataFrame; building it costs O(columns), not O(rows).
+        """
+        return pd.DataFrame({column: buffer.view() for column, buffer in self._columns.items()}, copy=False)
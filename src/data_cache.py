@@ -0,0 +1,232 @@
+# data_cache.py
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the parsing or processing code changes the cached frames.
+CACHE_VERSION = 2
+
+SCHEMA_FILE = 'schema.json'
+
+
+class DataCache:
+    """Content-addressed on-disk cache for parsed DataFrames.
+
+    Every entry is a directory holding one ``.npy`` file per column plus a JSON
+    schema. Numeric and datetime columns are memory-mapped on load; string
+    columns are stored as fixed-width unicode arrays with a missing-value mask,
+    and categorical columns as their integer codes plus an array of categories.
+    """
+
+    def __init__(self, cache_dir: Path, max_size_mb: float = 512, validation: str = 'mtime'):
+        """
+        Initialize the DataCache.
+
+        :param cache_dir: Directory in which the cache entries are stored.
+        :param max_size_mb: Total cache size above which the least recently used entries are evicted.
+        :param validation: 'mtime' to key entries by file size and modification time, 'hash' to key
+            them by a SHA-256 hash of the file content.
+        """
+        if validation not in ('mtime', 'hash'):
+            raise ValueError("Cache validation must be either 'mtime' or 'hash'.")
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.validation = validation
+
+    def key(self, file_path: Path, settings: Dict[str, Any]) -> str:
+        """
+        Compute the cache key for a source file and the settings used to parse it.
+
+        :param file_path: Path to the source file, or a run store directory (identified by its schema).
+        :param settings: Loader settings that influence the parsed frame.
+        :return: Hex digest identifying the cache entry.
+        """
+        file_path = Path(file_path)
+        digest = hashlib.sha256()
+        digest.update(str(file_path.resolve()).encode())
+        if file_path.is_dir():
+            file_path = file_path / SCHEMA_FILE  # Rewritten whenever the run store is replaced
+        if self.validation == 'hash':
+            with open(file_path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1 << 20), b''):
+                    digest.update(chunk)
+        else:
+            stat = file_path.stat()
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+        digest.update(f"{CACHE_VERSION}:{pd.__version__}:{np.__version__}".encode())
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Load a cached DataFrame.
+
+        :param key: Cache key returned by key().
+        :return: The cached DataFrame, or None on a cache miss.
+        """
+        entry = self.cache_dir / key
+        schema_path = entry / SCHEMA_FILE
+        if not schema_path.is_file():
+            return None
+        try:
+            frame = read_frame(entry)
+            os.utime(schema_path)  # Mark the entry as recently used
+            return frame
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Discarding unreadable cache entry %s: %s", key, e)
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+    def store(self, key: str, data: pd.DataFrame) -> None:
+        """
+        Store a DataFrame in the cache and evict old entries if the cache is too large.
+
+        :param key: Cache key returned by key().
+        :param data: DataFrame to store.
+        """
+        write_frame_atomic(self.cache_dir / key, data)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits into its size limit.
+        """
+        if not self.cache_dir.is_dir():
+            return
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            schema_path = entry / SCHEMA_FILE
+            if entry.is_dir() and schema_path.is_file():
+                size = sum(path.stat().st_size for path in entry.iterdir())
+                entries.append((schema_path.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_size_bytes:
+                break
+            logger.info("Evicting cache entry %s (%.1f MB).", entry.name, size / 1e6)
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        """
+        Remove all cache entries.
+        """
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def write_frame(directory: Path, data: pd.DataFrame) -> None:
+    """
+    Write a DataFrame as one ``.npy`` file per column plus a JSON schema.
+
+    Numeric and datetime columns are written as raw arrays, categorical columns as
+    their integer codes plus an array of categories, and string columns as
+    fixed-width unicode arrays with a missing-value mask.
+
+    :param directory: Existing directory to write the files to.
+    :param data: DataFrame to write.
+    """
+    directory = Path(directory)
+    columns = []
+    for position, name in enumerate(data.columns):
+        column = {'name': name, 'file': f"{position}.npy"}
+        series = data[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            np.save(directory / column['file'], series.cat.codes.to_numpy())
+            column['categories'] = f"{position}.categories.npy"
+            np.save(
+                directory / column['categories'],
+                categories.to_numpy(dtype=str) if categories.dtype == object else categories.to_numpy()
+            )
+            column['kind'] = 'category'
+        elif series.dtype == object:
+            missing = series.isna().to_numpy()
+            np.save(directory / column['file'], series.where(~missing, '').astype(str).to_numpy(dtype=str))
+            column['mask'] = f"{position}.mask.npy"
+            np.save(directory / column['mask'], missing)
+            column['kind'] = 'string'
+        else:
+            np.save(directory / column['file'], series.to_numpy())
+            column['kind'] = 'array'
+        columns.append(column)
+    with open(directory / SCHEMA_FILE, 'w') as file:
+        json.dump({'version': CACHE_VERSION, 'rows': len(data), 'columns': columns}, file)
+
+
+def write_frame_atomic(directory: Path, data: pd.DataFrame) -> None:
+    """
+    Write a DataFrame like write_frame() into a directory that appears complete or not at all.
+
+    The files are written to a staging directory next to it, which then replaces
+    the directory, so readers never see a partial entry. An existing directory is
+    replaced; the staging directory is removed if writing fails.
+
+    :param directory: Directory to write; its parent is created if needed.
+    :param data: DataFrame to write.
+    """
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = directory.parent / f".{directory.name}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+    try:
+        write_frame(staging, data)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(staging, directory)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def read_frame(directory: Path) -> pd.DataFrame:
+    """
+    Read a DataFrame written by write_frame().
+
+    Numeric, datetime and categorical columns are memory-mapped read-only and used
+    without copying, so the pages are shared by every process that reads the same
+    files. String columns are materialized as Python objects.
+
+    :param directory: Directory holding the schema and the column files.
+    :return: The DataFrame.
+    """
+    directory = Path(directory)
+    with open(directory / SCHEMA_FILE, 'r') as file:
+        schema = json.load(file)
+    data = {}
+    for column in schema['columns']:
+        values = np.load(directory / column['file'], mmap_mode='r').view(np.ndarray)
+        if column['kind'] == 'string':
+            missing = np.load(directory / column['mask'])
+            values = values.astype(object)
+            values[missing] = np.nan
+        elif column['kind'] == 'category':
+            categories = np.load(directory / column['categories'])
+            if categories.dtype.kind == 'U':
+                categories = categories.astype(object)
+            values = _categorical_from_codes(values, categories)
+        data[column['name']] = values
+    return pd.DataFrame(data, columns=[column['name'] for column in schema['columns']], copy=False)
+
+
+def _categorical_from_codes(codes: np.ndarray, categories: np.ndarray) -> pd.Categorical:
+    """
+    Build a Categorical from stored codes, skipping the validation pass where pandas allows it.
+
+    :param codes: Integer codes, -1 for missing values.
+    :param categories: Categories.
+    :return: The Categorical.
+    """
+    try:
+        return pd.Categorical.from_codes(codes, categories=categories, validate=False)
+    except TypeError:  # pandas < 2.1 always validates
+        return pd.Categorical.from_codes(codes, categories=categories)
@@ -1,73 +1,797 @@
 # data_loader.py
-from io import StringIO
+import importlib.util
+import json
+import os
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO, TextIOWrapper
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import logging
-from typing import List, Optional, Tuple, Any, Dict
+from typing import List, Optional, Tuple, Any, Dict, Iterable, Iterator, Union
 
+from column_buffer import FrameBuffer
 from config_loader import ConfigLoader
+from data_cache import CACHE_VERSION, SCHEMA_FILE, DataCache, read_frame, write_frame_atomic
+from instrumentation import StageRecorder
+from kla_header import KlaHeader, kla_time_index, parse_kla_header
+from time_parser import ZEIT_EPOCH, elapsed_hours, parse_elapsed_time
 
 logger = logging.getLogger(__name__)
 
+# Tokens treated as missing values in the offline and online exports.
+NA_VALUES = ['#NAN', 'NaN', 'nan', '#DIV/0!', 'inf', '-inf']
+
+# pandas' default missing-value tokens, which apply on top of NA_VALUES.
+DEFAULT_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+                     '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+                     'n/a', 'nan', 'null']
+
+MISSING_TOKENS = frozenset(NA_VALUES) | frozenset(DEFAULT_NA_VALUES)
+
+# Parser backends, fastest first. 'auto' tries them in this order and falls
+# back to the next one whenever a backend cannot handle a file.
+PARSER_BACKENDS = ('pyarrow', 'c', 'numpy', 'python')
+
+# Separators written as escape sequences in config.yaml (e.g. '\t' in single quotes).
+# The python engine reads them as regular expressions, the other backends need the
+# literal character.
+ESCAPED_SEPARATORS = {'\\t': '\t', '\\|': '|'}
+
+# Encoding and field delimiter of the KLA exports.
+KLA_ENCODING = 'utf-16-le'
+KLA_DELIMITER = ';'
+
+# Number of data lines inspected to classify columns before parsing them in full.
+SNIFF_ROWS = 1000
+
+# Column types of the 'schema' configuration
+SCHEMA_TYPES = ('float', 'int', 'str')
+
+# Compact mode: string columns that are redundant once the time columns are parsed,
+# and the largest share of distinct values for which a string column is categorized.
+PARSED_STRING_COLUMNS = {'online': ['Zeit']}
+MAX_CATEGORY_RATIO = 0.5
+
+# Most decimal places a float column may have to be stored as float32.
+MAX_FLOAT32_DECIMALS = 6
+
+
+def _parse_kla_number(field: str) -> float:
+    """
+    Parse a KLA value with ',' as decimal separator, returning NaN if it is not a number.
+
+    :param field: Raw field from a KLA data row.
+    :return: Parsed value.
+    """
+    try:
+        return float(field.replace(',', '.'))
+    except ValueError:
+        return np.nan
+
+
 class DataLoader:
     """Class to handle loading and processing of offline, online, and KLA data."""
 
-    def __init__(self, config: ConfigLoader, project_root: Path):
+    def __init__(self, config: ConfigLoader, project_root: Path, use_cache: bool = True,
+                 recorder: Optional[StageRecorder] = None):
         """
         Initialize the DataLoader with configuration settings and project root.
 
         :param config: Instance of ConfigLoader containing configuration parameters.
         :param project_root: Path object representing the project root directory.
+        :param use_cache: Whether the parsed-data cache may be used (if enabled in the
+            configuration).
+        :param recorder: StageRecorder measuring the loading stages (optional; disabled by default).
         """
         data_loader_config = config.get('data_loader')
         self.offline_file = project_root / data_loader_config.get('offline_file')
         self.online_file = project_root / data_loader_config.get('online_file')
         self.kla_dir = project_root / data_loader_config.get('kla_dir', 'data/data(kla)/')
-        self.column_separator = data_loader_config.get('column_separator', '\t')
+        column_separator = data_loader_config.get('column_separator', '\t')
+        self.column_separator = ESCAPED_SEPARATORS.get(column_separator, column_separator)
         self.decimal_separator = data_loader_config.get('decimal_separator', ',')
         self.encoding = data_loader_config.get('encoding', 'utf-8')
+        self.parser_backend = data_loader_config.get('parser_backend', 'auto')
+        # Most files read at the same time by fetch_files()
+        self.io_workers = max(1, data_loader_config.get('io_workers', 4))
+        if self.parser_backend != 'auto' and self.parser_backend not in PARSER_BACKENDS:
+            raise ValueError(
+                f"Unknown parser backend '{self.parser_backend}'. "
+                f"Choose 'auto' or one of {list(PARSER_BACKENDS)}."
+            )
+        # Column types of the offline and online files, applied while parsing
+        schema_config = data_loader_config.get('schema') or {}
+        self.schema: Dict[str, Dict[str, str]] = {
+            dataset: dict(schema_config.get(dataset) or {}) for dataset in ('offline', 'online')
+        }
+        declared_types = {kind for columns in self.schema.values() for kind in columns.values()}
+        unknown_types = declared_types - set(SCHEMA_TYPES)
+        if unknown_types:
+            raise ValueError(
+                f"Unknown column types {sorted(unknown_types)} in the schema. "
+                f"Use {list(SCHEMA_TYPES)}."
+            )
+        # Compact mode downcasts and categorizes the loaded frames to save memory
+        self.compact = data_loader_config.get('compact', False)
         self.offline_data: Optional[pd.DataFrame] = None
         self.online_data: Optional[pd.DataFrame] = None
+        self.recorder = recorder if recorder is not None else StageRecorder()
+
+        # State of poll_online_data(): byte offset of the next unread line, the header line,
+        # the (device, inode) of the followed file, and the buffers behind the frame it built
+        self._follow_offset: Optional[int] = None
+        self._follow_header: bytes = b''
+        self._follow_identity: Optional[Tuple[int, int]] = None
+        self._follow_buffer: Optional[FrameBuffer] = None
+        self._follow_frame: Optional[pd.DataFrame] = None
+
+        cache_config = data_loader_config.get('cache') or {}
+        self.cache: Optional[DataCache] = None
+        if use_cache and cache_config.get('enabled', False):
+            self.cache = DataCache(
+                project_root / cache_config.get('dir', '.cache'),
+                max_size_mb=cache_config.get('max_size_mb', 512),
+                validation=cache_config.get('validation', 'mtime')
+            )
+
+    def load_processed_data(self, online_numeric_columns: List[str]) -> None:
+        """
+        Load offline and online data, process the online time column and convert the
+        online numeric columns.
+
+        When the cache is enabled, the fully typed frames are read from the cache if
+        the source files and loader settings are unchanged, and stored there otherwise.
+        In compact mode both frames are compacted before they are cached.
+
+        :param online_numeric_columns: Columns to convert to numeric in the online data.
+        """
+        if self.cache is None:
+            self._load_and_process(online_numeric_columns)
+            return
+
+        settings = {
+            'column_separator': self.column_separator,
+            'decimal_separator': self.decimal_separator,
+            'encoding': self.encoding,
+            'compact': self.compact,
+            'schema': self.schema
+        }
+        offline_key = self.cache.key(self.offline_file, {**settings, 'dataset': 'offline'})
+        online_key = self.cache.key(
+            self.online_file,
+            {**settings, 'dataset': 'online', 'numeric_columns': list(online_numeric_columns)}
+        )
+        with self.recorder.stage('cache_load') as stage:
+            offline_data = self.cache.load(offline_key)
+            online_data = self.cache.load(online_key)
+            stage.rows = len(online_data) if online_data is not None else None
+        if offline_data is not None and online_data is not None:
+            logger.info("Loaded offline and online data from the cache.")
+            self.offline_data = offline_data
+            self.online_data = online_data
+            return
+
+        logger.info("Cache miss: parsing offline and online data.")
+        self._load_and_process(online_numeric_columns)
+        try:
+            with self.recorder.stage('cache_store', rows=len(self.online_data)):
+                self.cache.store(offline_key, self.offline_data)
+                self.cache.store(online_key, self.online_data)
+        except OSError as e:
+            logger.warning("Could not write the data cache: %s", e)
+
+    def _load_and_process(self, online_numeric_columns: List[str]) -> None:
+        """
+        Parse both files and apply the online time and numeric conversions.
+
+        :param online_numeric_columns: Columns to convert to numeric in the online data.
+        """
+        input_bytes = None
+        if self.recorder.enabled:
+            try:
+                input_bytes = self.offline_file.stat().st_size + self.online_file.stat().st_size
+            except OSError:
+                pass  # load_data() reports the missing file
+        with self.recorder.stage('parse', input_bytes=input_bytes) as stage:
+            self.load_data()
+            rows = len(self.online_data) if self.online_data is not None else None
+            stage.rows = rows
+        with self.recorder.stage('time_conversion', rows=rows):
+            self.process_online_time_column()
+        # Columns typed by the schema are already numeric
+        untyped_columns = self._untyped_columns(online_numeric_columns, 'online')
+        if untyped_columns:
+            with self.recorder.stage('numeric_conversion', rows=rows):
+                self.convert_columns_to_numeric(untyped_columns, dataset='online')
+        if self.compact:
+            with self.recorder.stage('compact', rows=rows):
+                self.compact_data('offline')
+                self.compact_data('online')
 
     def load_data(self) -> None:
         """
         Load offline and online data from their respective files into pandas DataFrames.
+
+        Both files are read concurrently (see fetch_files()), and each is parsed as
+        soon as its bytes have arrived.
         """
         try:
-            logger.info(f"Loading offline data from {self.offline_file.resolve()}")
-            self.offline_data = pd.read_csv(
-                self.offline_file,
-                sep=self.column_separator,
-                na_values=['#NAN', 'NaN', 'nan', '#DIV/0!', 'inf', '-inf'],
-                decimal=self.decimal_separator,
-                engine='python'  # Specify engine to avoid ParserWarning
-            )
-            logger.info("Offline data loaded successfully.")
-
-            logger.info(f"Loading online data from {self.online_file.resolve()}")
-            self.online_data = pd.read_csv(
-                self.online_file,
-                sep=self.column_separator,
-                na_values=['#NAN', 'NaN', 'nan', '#DIV/0!', 'inf', '-inf'],
-                decimal=self.decimal_separator,
-                encoding=self.encoding,
-                engine='python'  # Specify engine to avoid ParserWarning
-            )
-            logger.info("Online data loaded successfully.")
+            logger.info("Loading offline data from %s", self.offline_file.resolve())
+            logger.info("Loading online data from %s", self.online_file.resolve())
+            file_paths = [self.offline_file, self.online_file]
+            for index, file_path, content in self.fetch_files(file_paths):
+                if index == 0:
+                    self.offline_data = self.read_table(
+                        file_path, content=content, dataset='offline'
+                    )
+                    logger.info("Offline data loaded successfully.")
+                else:
+                    self.online_data = self.read_table(
+                        file_path, encoding=self.encoding, content=content, dataset='online'
+                    )
+                    logger.info("Online data loaded successfully.")
         except FileNotFoundError as e:
-            logger.error(f"File not found: {e.filename}")
+            logger.error("File not found: %s", e.filename)
             raise
         except pd.errors.ParserError as e:
-            logger.error(f"Error parsing CSV file: {e}")
+            logger.error("Error parsing CSV file: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error while loading data: {e}")
+            logger.error("Unexpected error while loading data: %s", e)
             raise
 
+    def fetch_files(self, file_paths: List[Path],
+                    ordered: bool = False) -> Iterator[Tuple[int, Path, Optional[bytes]]]:
+        """
+        Read several files concurrently and yield each one as soon as its bytes have arrived.
+
+        At most io_workers files are read at the same time, which hides the latency
+        of network-mounted storage; the caller parses every file while the
+        remaining reads continue. A file that cannot be read is yielded without
+        content, so that the caller's parser opens it and reports the error as usual.
+
+        :param file_paths: Files to read.
+        :param ordered: Yield the files in the order of file_paths instead of the order of arrival;
+            later files are still read in the background.
+        :return: Iterator of (position in file_paths, path, content or None).
+        """
+        if len(file_paths) <= 1:
+            for index, file_path in enumerate(file_paths):
+                yield index, file_path, self._read_bytes(file_path)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.io_workers, len(file_paths))) as executor:
+            futures = {
+                executor.submit(self._read_bytes, file_path): index
+                for index, file_path in enumerate(file_paths)
+            }
+            for future in (futures if ordered else as_completed(futures)):
+                index = futures[future]
+                yield index, file_paths[index], future.result()
+
+    @staticmethod
+    def _read_bytes(file_path: Path) -> Optional[bytes]:
+        """
+        Read the content of a file.
+
+        :param file_path: Path to the file.
+        :return: The content, or None if the file cannot be read.
+        """
+        try:
+            return Path(file_path).read_bytes()
+        except OSError as e:
+            logger.debug("Could not prefetch %s: %s", file_path, e)
+            return None
+
+    def load_offline_data(self) -> None:
+        """
+        Load only the offline data, e.g. when the online data is streamed in chunks.
+        """
+        try:
+            logger.info("Loading offline data from %s", self.offline_file.resolve())
+            self.offline_data = self.read_table(self.offline_file, dataset='offline')
+            logger.info("Offline data loaded successfully.")
+        except FileNotFoundError as e:
+            logger.error("File not found: %s", e.filename)
+            raise
+        except pd.errors.ParserError as e:
+            logger.error("Error parsing CSV file: %s", e)
+            raise
+
+    def iter_online_chunks(self, chunk_size: int,
+                           numeric_columns: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        Stream the online file as typed chunks, keeping memory bounded by the chunk size.
+
+        Each chunk already has the 'time' and 'elapsed_hours' columns and the given
+        numeric columns converted, exactly like the frame built by load_data(),
+        process_online_time_column() and convert_columns_to_numeric().
+
+        :param chunk_size: Number of rows per chunk.
+        :param numeric_columns: Columns to convert to numeric in every chunk.
+        :return: Iterator over the online data chunks.
+        """
+        # Only the C and python engines can read in chunks
+        backend = 'python' if self.parser_backend == 'python' else 'c'
+        logger.info("Streaming online data from %s in chunks of %s rows.",
+                    self.online_file.resolve(), chunk_size)
+        try:
+            reader = self._open_chunk_reader(backend, chunk_size)
+        except ValueError:  # e.g. a regex separator the C engine cannot handle
+            backend = 'python'
+            reader = self._open_chunk_reader(backend, chunk_size)
+
+        with reader:
+            for number, chunk in enumerate(reader):
+                self._prepare_online_chunk(chunk, numeric_columns, backend)
+                logger.debug("Parsed online chunk %d with %d rows.", number, len(chunk))
+                yield chunk
+
+    def _prepare_online_chunk(self, chunk: pd.DataFrame, numeric_columns: List[str],
+                              backend: str) -> None:
+        """
+        Type a freshly parsed online chunk: decimal columns, time columns and numeric columns.
+
+        :param chunk: Online rows parsed with the given backend, updated in place.
+        :param numeric_columns: Columns to convert to numeric.
+        :param backend: Parser backend that produced the chunk.
+        """
+        if backend != 'python':
+            self._coerce_decimal_columns(chunk, skip=self.schema['online'])
+        self._apply_schema(chunk, self.schema['online'])
+        self._add_time_columns(chunk)
+        for column in self._untyped_columns(numeric_columns, 'online'):
+            if column in chunk.columns:
+                chunk[column] = pd.to_numeric(chunk[column], errors='coerce')
+
+    def poll_online_data(self, numeric_columns: List[str]) -> pd.DataFrame:
+        """
+        Parse only the rows appended to the online file since the previous poll.
+
+        The first poll parses the whole file. Later polls seek to the remembered byte
+        offset and parse the complete lines written since then; a partially written
+        last line is left for the next poll. The new rows are typed like
+        iter_online_chunks() chunks and appended to growable column buffers, and
+        online_data is rebuilt as views of them, so a poll costs O(new rows) rather
+        than O(all rows). If the file was replaced (another inode), rewritten (another
+        header line) or truncated, following restarts from the beginning.
+
+        :param numeric_columns: Columns to convert to numeric in the new rows.
+        :return: DataFrame containing only the new rows (empty if nothing was appended).
+        """
+        with open(self.online_file, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            identity = (stat.st_dev, stat.st_ino)
+            if self._follow_offset is not None and (
+                identity != self._follow_identity
+                or stat.st_size < self._follow_offset
+                or file.readline() != self._follow_header
+            ):
+                logger.warning("%s was replaced or rewritten; following it from the beginning.",
+                               self.online_file)
+                self._follow_offset = None
+                self.online_data = None
+            if self._follow_offset is None:
+                file.seek(0)
+                self._follow_header = file.readline()
+                self._follow_offset = file.tell()
+                self._follow_identity = identity
+            file.seek(self._follow_offset)
+            appended = file.read()
+
+        complete = appended[:appended.rfind(b'\n') + 1]
+        if not complete.strip():
+            return self.online_data.iloc[0:0] if self.online_data is not None else pd.DataFrame()
+        self._follow_offset += len(complete)
+
+        backend = 'python' if self.parser_backend == 'python' else 'c'
+        buffer = BytesIO(self._follow_header + complete)
+        schema = self.schema['online']
+        try:
+            new_rows = self._parse_with_backend(backend, buffer, self.encoding, schema)
+        except ValueError:
+            backend = 'python'
+            buffer.seek(0)
+            new_rows = self._parse_with_backend(backend, buffer, self.encoding, schema)
+        self._prepare_online_chunk(new_rows, numeric_columns, backend)
+
+        if self.online_data is None:
+            self._follow_buffer = FrameBuffer()
+        elif self.online_data is not self._follow_frame:
+            # online_data was set elsewhere; copy it into fresh buffers once
+            self._follow_buffer = FrameBuffer(self.online_data)
+        start = len(self._follow_buffer)
+        new_rows.index = pd.RangeIndex(start, start + len(new_rows))
+        self._follow_buffer.append(new_rows)
+        self.online_data = self._follow_frame = self._follow_buffer.frame()
+        logger.info("Parsed %s new online rows (%s in total).",
+                    len(new_rows), len(self.online_data))
+        return new_rows
+
+    def _open_chunk_reader(self, backend: str, chunk_size: int) -> pd.io.parsers.TextFileReader:
+        """
+        Open a chunked reader over the online file.
+
+        :param backend: 'c' or 'python'.
+        :param chunk_size: Number of rows per chunk.
+        :return: The pandas chunk reader.
+        """
+        return pd.read_csv(
+            self.online_file,
+            sep=self.column_separator,
+            na_values=NA_VALUES,
+            decimal=self.decimal_separator if backend == 'python' else '.',
+            encoding=self.encoding,
+            engine=backend,
+            dtype=self._string_dtypes(self.schema['online']),
+            chunksize=chunk_size
+        )
+
+    def read_table(self, file_path: Path, encoding: Optional[str] = None,
+                   content: Optional[bytes] = None, dataset: Optional[str] = None) -> pd.DataFrame:
+        """
+        Read a delimited text file with the configured parser backend.
+
+        A run store directory (see export_data() and tools/excel_converter.py) is
+        opened with data_cache.read_frame() instead, so typed columns are not
+        parsed again.
+
+        With the 'auto' backend the candidates in PARSER_BACKENDS are tried in
+        order and the first one that can handle the file wins. The python engine
+        is only reached when all faster backends have failed. Every backend
+        produces the same frame as the python engine: NA_VALUES become NaN and
+        numbers written with either the configured decimal separator or '.'
+        are parsed as numbers. The column types of the dataset's schema are applied
+        while parsing; the types of the other columns are inferred.
+
+        :param file_path: Path to the delimited text file or run store directory.
+        :param encoding: Text encoding of the file (optional).
+        :param content: Content of the file, already read e.g. by fetch_files() (optional).
+        :param dataset: 'offline' or 'online', selecting the schema (optional; default is no
+            schema).
+        :return: DataFrame containing the parsed file.
+        """
+        schema = self.schema.get(dataset, {}) if dataset is not None else {}
+        if content is None and (Path(file_path) / SCHEMA_FILE).is_file():
+            logger.debug("Opening the run store %s.", file_path)
+            data = read_frame(file_path)
+            self._apply_schema(data, schema)
+            return data
+
+        source = file_path if content is None else content
+        if self.parser_backend != 'auto':
+            return self._parse_with_backend(self.parser_backend, source, encoding, schema)
+
+        candidates = [backend for backend in PARSER_BACKENDS if self._backend_available(backend)]
+        for backend in candidates[:-1]:
+            try:
+                data = self._parse_with_backend(backend, source, encoding, schema)
+                logger.debug("Parsed %s with the '%s' backend.", file_path, backend)
+                return data
+            except (ImportError, OSError, ValueError, pd.errors.ParserError) as e:
+                logger.debug("Backend '%s' cannot handle %s: %s", backend, file_path, e)
+        return self._parse_with_backend(candidates[-1], source, encoding, schema)
+
+    def _parse_with_backend(self, backend: str, file_path: Union[Path, bytes, BytesIO],
+                            encoding: Optional[str], schema: Dict[str, str]) -> pd.DataFrame:
+        """
+        Read a delimited text file with one parser backend and apply a schema.
+
+        :param backend: One of PARSER_BACKENDS.
+        :param file_path: Path to the delimited text file, its content, or a binary buffer
+            (not for 'numpy').
+        :param encoding: Text encoding of the file (optional).
+        :param schema: Column types by column name.
+        :return: DataFrame containing the parsed file.
+        """
+        data = self._read_with_backend(backend, file_path, encoding, schema)
+        self._apply_schema(data, schema)
+        return data
+
+    def _untyped_columns(self, columns: List[str], dataset: str) -> List[str]:
+        """
+        Select the columns the schema of a dataset does not declare as numbers.
+
+        :param columns: Column names.
+        :param dataset: 'offline' or 'online'.
+        :return: Columns that still need a numeric conversion.
+        """
+        schema = self.schema.get(dataset, {})
+        return [column for column in columns if schema.get(column) not in ('float', 'int')]
+
+    @staticmethod
+    def _string_dtypes(schema: Dict[str, str]) -> Dict[str, Any]:
+        """
+        read_csv dtypes that keep the string columns of a schema as strings.
+
+        :param schema: Column types by column name.
+        :return: dtype mapping.
+        """
+        return {column: object for column, kind in schema.items() if kind == 'str'}
+
+    def _apply_schema(self, data: pd.DataFrame, schema: Dict[str, str]) -> None:
+        """
+        Give the columns of a parsed frame the types declared in a schema, in place.
+
+        Columns the parser already produced with the declared type are left as they
+        are. Declared numeric columns that still hold strings (e.g. numbers with the
+        decimal separator, or stray text) are parsed in one pass; tokens that are
+        not numbers become NaN. 'int' columns with missing or fractional values stay
+        float.
+
+        :param data: Parsed DataFrame.
+        :param schema: Column types by column name.
+        """
+        for column, kind in schema.items():
+            if column not in data.columns:
+                continue
+            series = data[column]
+            if kind == 'str':
+                if series.dtype != object:
+                    raise ValueError(
+                        f"Column '{column}' is declared as 'str' but was parsed as {series.dtype}."
+                    )
+                continue
+            if kind == 'int' and pd.api.types.is_integer_dtype(series.dtype):
+                continue
+            if kind == 'float' and pd.api.types.is_float_dtype(series.dtype):
+                continue
+            if series.dtype == object:
+                if self.decimal_separator != '.':
+                    series = series.str.replace(self.decimal_separator, '.', regex=False)
+                values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+                values[np.isinf(values)] = np.nan
+            else:
+                values = series.to_numpy(dtype=np.float64)
+            if (kind == 'int' and not np.isnan(values).any()
+                    and np.array_equal(values, np.round(values))):
+                values = values.astype(np.int64)
+            data[column] = values
+
+    @staticmethod
+    def _backend_available(backend: str) -> bool:
+        """
+        Check whether the optional dependency of a parser backend is installed.
+
+        :param backend: Name of the parser backend.
+        :return: True if the backend can be used.
+        """
+        if backend == 'pyarrow':
+            return importlib.util.find_spec('pyarrow') is not None
+        return True
+
+    def _read_with_backend(self, backend: str, file_path: Union[Path, bytes, BytesIO],
+                           encoding: Optional[str],
+                           schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Read a delimited text file with one specific parser backend.
+
+        :param backend: One of PARSER_BACKENDS.
+        :param file_path: Path to the delimited text file, its content, or a binary buffer
+            (not for 'numpy').
+        :param encoding: Text encoding of the file (optional).
+        :param schema: Column types by column name (optional); string columns are read as strings.
+        :return: DataFrame containing the parsed file.
+        """
+        schema = schema or {}
+        if backend == 'numpy':
+            return self._read_with_numpy(file_path, encoding, schema)
+        if isinstance(file_path, bytes):
+            file_path = BytesIO(file_path)
+
+        # The C and pyarrow engines only accept their decimal separator, so they
+        # parse '.' natively and the configured separator is handled afterwards.
+        data = pd.read_csv(
+            file_path,
+            sep=self.column_separator,
+            na_values=NA_VALUES,
+            decimal=self.decimal_separator if backend == 'python' else '.',
+            encoding=encoding,
+            engine=backend,
+            # pyarrow converts numbers to strings instead; _apply_schema() rejects that
+            dtype=self._string_dtypes(schema) if backend != 'pyarrow' else None
+        )
+        if backend == 'pyarrow':
+            data = self._normalise_pyarrow_frame(data)
+        if backend != 'python':
+            self._coerce_decimal_columns(data, skip=schema)
+        return data
+
+    @staticmethod
+    def _normalise_pyarrow_frame(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Align a frame read by pyarrow with the python engine's output.
+
+        Frames in which pyarrow inferred date or time types are rejected, since
+        the python engine keeps such columns as strings and the downstream time
+        processing depends on that. Missing strings become NaN instead of None.
+
+        :param data: DataFrame returned by the pyarrow engine.
+        :return: The normalised DataFrame.
+        """
+        for column in data.columns:
+            series = data[column]
+            if series.dtype == object:
+                inferred = pd.api.types.infer_dtype(series, skipna=True)
+                if inferred not in ('string', 'empty'):
+                    raise ValueError(f"pyarrow inferred '{inferred}' values for column '{column}'.")
+                data[column] = series.where(series.notna(), np.nan)
+            elif not (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)):
+                raise ValueError(f"pyarrow inferred dtype '{series.dtype}' for column '{column}'.")
+        return data
+
+    def _coerce_decimal_columns(self, data: pd.DataFrame, skip: Iterable[str] = ()) -> None:
+        """
+        Parse string columns that the python engine would have read as numbers.
+
+        The python engine accepts '.' as well as the configured decimal separator,
+        while the C and pyarrow engines are called with '.' and leave columns
+        using the configured separator as strings.
+
+        :param data: DataFrame to update in place.
+        :param skip: Columns whose type is declared in the schema and not sniffed.
+        """
+        if self.decimal_separator == '.':
+            return
+        for column in data.columns:
+            if data[column].dtype != object or column in skip:
+                continue
+            sample = data[column].dropna().head(SNIFF_ROWS)
+            try:
+                pd.to_numeric(
+                    sample.str.replace(self.decimal_separator, '.', regex=False), errors='raise'
+                )
+                values = data[column].str.replace(self.decimal_separator, '.', regex=False)
+                data[column] = pd.to_numeric(values, errors='raise')
+            except (ValueError, TypeError):
+                continue
+
+    def _read_with_numpy(self, file_path: Union[Path, bytes], encoding: Optional[str],
+                         schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Read a delimited text file with NumPy's C text reader.
+
+        Columns declared in the schema are read as their type; the others are
+        classified on the first SNIFF_ROWS lines. The columns of each kind are read
+        in one pass. A block that fails to parse is re-read as the next, more
+        general kind. Files with quoted fields or ragged rows raise ValueError.
+
+        :param file_path: Path to the delimited text file, or its content.
+        :param encoding: Text encoding of the file (optional).
+        :param schema: Column types by column name (optional).
+        :return: DataFrame containing the parsed file.
+        """
+        schema = schema or {}
+        if len(self.column_separator) != 1:
+            raise ValueError("The NumPy reader only supports single-character separators.")
+
+        encoding = encoding or 'utf-8'
+
+        def open_text():
+            if isinstance(file_path, bytes):
+                return TextIOWrapper(BytesIO(file_path), encoding=encoding)
+            return open(file_path, 'r', encoding=encoding)
+
+        with open_text() as file:
+            header = file.readline().rstrip('\r\n')
+            sample = [line.rstrip('\r\n') for _, line in zip(range(SNIFF_ROWS), file)]
+
+        if '"' in header or any('"' in line for line in sample):
+            raise ValueError("The NumPy reader does not support quoted fields.")
+
+        columns = header.split(self.column_separator)
+        if not sample:
+            return pd.DataFrame(columns=columns)
+
+        sample_array = np.array([line.split(self.column_separator) for line in sample])
+        if sample_array.ndim != 2 or sample_array.shape[1] != len(columns):
+            raise ValueError("Rows in the sample do not match the header.")
+
+        kinds = {'int': [], 'float': [], 'decimal': [], 'str': []}
+        for index, column in enumerate(columns):
+            kind = schema.get(column) or self._classify_column(sample_array[:, index])
+            kinds[kind].append(index)
+
+        result: Dict[str, np.ndarray] = {}
+        cascade = (
+            ('int', np.int64, 'float'),
+            ('float', np.float64, 'decimal'),
+            ('decimal', str, 'str'),
+            ('str', str, None)
+        )
+        for kind, dtype, fallback in cascade:
+            indices = kinds[kind]
+            if not indices:
+                continue
+            try:
+                with open_text() as file:
+                    block = np.loadtxt(
+                        file,
+                        dtype=dtype,
+                        delimiter=self.column_separator,
+                        comments=None,
+                        skiprows=1,
+                        usecols=indices,
+                        ndmin=2
+                    )
+                columns_read = [block[:, position] for position in range(len(indices))]
+                if kind == 'float':
+                    for values in columns_read:
+                        values[np.isinf(values)] = np.nan
+                elif kind == 'decimal':
+                    columns_read = [self._parse_decimal_column(values) for values in columns_read]
+            except ValueError:
+                if fallback is None:
+                    raise
+                kinds[fallback].extend(indices)
+                continue
+            if kind == 'str':
+                columns_read = [self._parse_string_column(values) for values in columns_read]
+            for index, values in zip(indices, columns_read):
+                result[columns[index]] = values
+
+        return pd.DataFrame({column: result[column] for column in columns})
+
+    def _classify_column(self, values: np.ndarray) -> str:
+        """
+        Classify sampled tokens of one column as 'int', 'float', 'decimal' or 'str'.
+
+        'decimal' columns parse as floats once missing-value tokens are masked and
+        the configured decimal separator is replaced by '.'.
+
+        :param values: Sampled raw tokens of one column.
+        :return: The column kind.
+        """
+        for kind, dtype in (('int', np.int64), ('float', np.float64)):
+            try:
+                values.astype(dtype)
+                return kind
+            except ValueError:
+                continue
+        try:
+            self._parse_decimal_column(values)
+            return 'decimal'
+        except ValueError:
+            return 'str'
+
+    def _parse_decimal_column(self, values: np.ndarray) -> np.ndarray:
+        """
+        Parse string tokens as floats, honouring missing values and the decimal separator.
+
+        :param values: Raw tokens of one column.
+        :return: Float array with NaN for missing values.
+        :raises ValueError: If a token is not a number.
+        """
+        missing = pd.Series(values).isin(MISSING_TOKENS).to_numpy()
+        numeric = np.where(missing, 'nan', values)
+        if self.decimal_separator != '.':
+            numeric = np.char.replace(numeric, self.decimal_separator, '.')
+        floats = numeric.astype(np.float64)
+        floats[np.isinf(floats)] = np.nan
+        return floats
+
+    @staticmethod
+    def _parse_string_column(values: np.ndarray) -> np.ndarray:
+        """
+        Convert string tokens to an object array with NaN for missing values.
+
+        :param values: Raw tokens of one column.
+        :return: Object array.
+        """
+        objects = values.astype(object)
+        objects[pd.Series(objects).isin(MISSING_TOKENS).to_numpy()] = np.nan
+        return objects
+
     def process_online_time_column(self) -> None:
         """
-        Clean the 'Zeit' column in online data and convert it to a datetime object.
+        Parse the 'Zeit' column in online data into 'time' and 'elapsed_hours' columns.
         Assumes the presence of a 'Zeit' column in the online_data DataFrame.
+
+        'Zeit' holds the elapsed run time ('HH:MM:SS.ffffff', prefixed by an Excel
+        1900 date once the run exceeds one day). It is parsed in one vectorized pass,
+        keeping the fractional seconds. 'time' is the elapsed time added to
+        ZEIT_EPOCH (1900-01-01) and 'elapsed_hours' is the elapsed time in hours.
         """
         if self.online_data is None:
             logger.error("Online data is not loaded. Call load_data() first.")
@@ -79,17 +803,23 @@ class DataLoader:
 
         logger.info("Processing 'Zeit' column in online data.")
         try:
-            self.online_data['time'] = self.online_data['Zeit'].str.split('.').str[0]
-            self.online_data['time'] = pd.to_datetime(
-                self.online_data['time'],
-                format='%H:%M:%S',
-                errors='coerce'
-            )
+            self._add_time_columns(self.online_data)
             logger.info("'Zeit' column processed successfully.")
         except Exception as e:
-            logger.error(f"Error processing 'Zeit' column: {e}")
+            logger.error("Error processing 'Zeit' column: %s", e)
             raise
 
+    @staticmethod
+    def _add_time_columns(data: pd.DataFrame) -> None:
+        """
+        Add the 'time' and 'elapsed_hours' columns parsed from 'Zeit'.
+
+        :param data: Online DataFrame (or chunk) to update in place.
+        """
+        offsets = parse_elapsed_time(data['Zeit'])
+        data['time'] = ZEIT_EPOCH + offsets.view('timedelta64[ns]')
+        data['elapsed_hours'] = elapsed_hours(offsets)
+
     def convert_columns_to_numeric(self, columns: List[str], dataset: str = 'online') -> None:
         """
         Convert specified columns in the selected dataset to numeric types.
@@ -99,90 +829,331 @@ class DataLoader:
         """
         data = self._get_dataset(dataset)
         if data is None:
-            logger.error(f"{dataset.capitalize()} data is not loaded.")
+            logger.error("%s data is not loaded.", dataset.capitalize())
             raise ValueError(f"{dataset.capitalize()} data is not loaded.")
 
-        logger.info(f"Converting columns {columns} to numeric in {dataset} data.")
+        logger.info("Converting columns %s to numeric in %s data.", columns, dataset)
+        converted = 0
         for column in columns:
             if column not in data.columns:
-                logger.warning(f"Column '{column}' not found in {dataset} data. Skipping.")
+                logger.warning("Column '%s' not found in %s data. Skipping.", column, dataset)
                 continue
             try:
                 data[column] = pd.to_numeric(data[column], errors='coerce')
-                logger.info(f"Column '{column}' converted to numeric.")
+                logger.debug("Column '%s' converted to numeric.", column)
+                converted += 1
             except Exception as e:
-                logger.error(f"Error converting column '{column}' to numeric: {e}")
+                logger.error("Error converting column '%s' to numeric: %s", column, e)
                 raise
+        logger.info("%s of %s columns converted to numeric.", converted, len(columns))
+
+    def compact_data(self, dataset: str = 'online') -> None:
+        """
+        Reduce the memory footprint of the selected dataset in place.
+
+        Float columns are downcast to float32 if that keeps every value exactly at its
+        exported number of decimals. String columns that were parsed into typed
+        columns (online 'Zeit', kept as the int64-backed 'time' and 'elapsed_hours')
+        are dropped, and other string columns with few distinct values are
+        categorized. A per-column memory report is logged before and after.
+
+        :param dataset: Which dataset to compact ('online' or 'offline').
+        """
+        data = self._get_dataset(dataset)
+        if data is None:
+            logger.error("%s data is not loaded.", dataset.capitalize())
+            raise ValueError(f"{dataset.capitalize()} data is not loaded.")
+
+        logger.info("Compacting %s data.", dataset)
+        before = self.memory_report(data)
+        redundant = [
+            column for column in PARSED_STRING_COLUMNS.get(dataset.lower(), [])
+            if column in data.columns and 'time' in data.columns
+        ]
+        data.drop(columns=redundant, inplace=True)
+        for column in data.columns:
+            values = data[column]
+            if values.dtype == np.float64 and self._float32_lossless(values.to_numpy()):
+                data[column] = values.astype(np.float32)
+            elif values.dtype == object and values.nunique() <= MAX_CATEGORY_RATIO * len(values):
+                data[column] = values.astype('category')
+        after = self.memory_report(data)
+        self._log_memory_report(dataset, before, after)
+
+    @staticmethod
+    def _float32_lossless(values: np.ndarray) -> bool:
+        """
+        Check whether float values survive a float32 round trip at their number of decimals.
+
+        :param values: float64 values.
+        :return: True if every finite value has at most MAX_FLOAT32_DECIMALS decimals and
+            rounds back to itself from float32.
+        """
+        finite = values[np.isfinite(values)]
+        if len(finite) == 0:
+            return True
+        for decimals in range(MAX_FLOAT32_DECIMALS + 1):
+            if np.array_equal(np.round(finite, decimals), finite):
+                break
+        else:
+            return False
+        restored = finite.astype(np.float32).astype(np.float64)
+        return np.array_equal(np.round(restored, decimals), finite)
+
+    @staticmethod
+    def memory_report(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Report the dtype and memory usage of every column.
+
+        :param data: DataFrame to inspect.
+        :return: DataFrame indexed by column name with the columns 'dtype' and 'bytes'
+            (including the Python objects of string columns).
+        """
+        usage = data.memory_usage(index=False, deep=True)
+        return pd.DataFrame({'dtype': data.dtypes.astype(str), 'bytes': usage})
+
+    @staticmethod
+    def _log_memory_report(dataset: str, before: pd.DataFrame, after: pd.DataFrame) -> None:
+        """
+        Log the memory usage per column before and after compacting.
+
+        :param dataset: Name of the dataset.
+        :param before: memory_report() before compacting.
+        :param after: memory_report() after compacting.
+        """
+        logger.info("Memory usage of %s data per column (before -> after):", dataset)
+        for column, row in before.iterrows():
+            if column in after.index:
+                new = after.loc[column]
+                logger.info(
+                    "  %s: %s %.2f MB -> %s %.2f MB",
+                    column, row['dtype'], row['bytes'] / 1e6, new['dtype'], new['bytes'] / 1e6
+                )
+            else:
+                logger.info("  %s: %s %.2f MB -> dropped", column, row['dtype'], row['bytes'] / 1e6)
+        total_before = before['bytes'].sum()
+        total_after = after['bytes'].sum()
+        logger.info(
+            "  Total: %.2f MB -> %.2f MB (%.0f%% saved)",
+            total_before / 1e6, total_after / 1e6,
+            100 * (1 - total_after / total_before) if total_before else 0
+        )
+
+    def export_data(self, directory: Path, dataset: str = 'online') -> Path:
+        """
+        Export the typed columns of the selected dataset to a run store directory.
+
+        Every column is written as a raw ``.npy`` array next to a small JSON schema
+        (see data_cache.write_frame()). An existing export in the directory is replaced.
+
+        :param directory: Directory of the run store entry.
+        :param dataset: Which dataset to export ('online' or 'offline').
+        :return: The directory.
+        """
+        data = self._get_dataset(dataset)
+        if data is None:
+            logger.error("%s data is not loaded.", dataset.capitalize())
+            raise ValueError(f"{dataset.capitalize()} data is not loaded.")
+
+        directory = Path(directory)
+        logger.info("Exporting %s rows of %s data to %s", len(data), dataset, directory.resolve())
+        try:
+            write_frame_atomic(directory, data)
+        except Exception as e:
+            logger.error("Error exporting %s data: %s", dataset, e)
+            raise
+        logger.info("%s data exported successfully.", dataset.capitalize())
+        return directory
+
+    def import_data(self, directory: Path, dataset: str = 'online') -> pd.DataFrame:
+        """
+        Open a run store directory written by export_data() as the selected dataset.
+
+        Numeric, datetime and categorical columns are memory-mapped read-only without
+        copying, so opening a run takes milliseconds regardless of its length and
+        processes that open the same run share its pages.
+
+        :param directory: Directory of the run store entry.
+        :param dataset: Which dataset to set ('online' or 'offline').
+        :return: The imported DataFrame.
+        """
+        self._get_dataset(dataset)  # Validate the dataset name
+        directory = Path(directory)
+        schema_path = directory / SCHEMA_FILE
+        if not schema_path.is_file():
+            logger.error("Run store schema not found: %s", schema_path.resolve())
+            raise FileNotFoundError(f"Run store schema not found: {schema_path}")
+
+        logger.info("Opening %s data from the run store %s", dataset, directory.resolve())
+        try:
+            with open(schema_path, 'r') as file:
+                version = json.load(file).get('version')
+            if version != CACHE_VERSION:
+                logger.warning(
+                    "Run store %s was written with format version %s, the current version is %s.",
+                    directory, version, CACHE_VERSION
+                )
+            data = read_frame(directory)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error("Error reading the run store %s: %s", directory, e)
+            raise
+        setattr(self, f"{dataset.lower()}_data", data)
+        logger.info("Opened %s rows of %s data.", len(data), dataset)
+        return data
 
     def find_data_start(self, file_path: str, delimiter: str = ';') -> Tuple[int, Optional[str], Optional[str]]:
         """
         Finds the line where the actual data begins in the specified file.
 
+        The header is located like load_kla_data() does (see _read_kla_header()).
+
         :param file_path: Path to the file to search.
-        :param delimiter: Delimiter used in the file.
+        :param delimiter: Delimiter used in the file (unused; kept for compatibility).
         :return: Tuple containing the data start line number, header line, and units line.
         """
-        logger.info(f"Finding data start in file: {file_path}")
+        logger.info("Finding data start in file: %s", file_path)
         try:
-            with open(file_path, 'r', encoding='utf-16-le') as file:
-                for i, line in enumerate(file):
-                    if line.startswith('Time'):
-                        header_line = line.strip()
-                        units_line = next(file, '').strip()
-                        logger.info(f"Data starts at line {i + 2}")
-                        return i + 2, header_line, units_line
-            logger.warning("Header with 'Time' was not found.")
-            return 0, None, None
+            with open(file_path, 'r', encoding=KLA_ENCODING) as file:
+                metadata_lines, header_line, units_line = self._read_kla_header(file)
+            if header_line is None:
+                logger.warning("Header with 'Time' was not found.")
+                return 0, None, None
+            logger.info("Data starts at line %s", len(metadata_lines) + 2)
+            return len(metadata_lines) + 2, header_line, units_line
         except FileNotFoundError:
-            logger.error(f"File not found: {file_path}")
+            logger.error("File not found: %s", file_path)
             raise
         except Exception as e:
-            logger.error(f"Error while finding data start: {e}")
+            logger.error("Error while finding data start: %s", e)
             raise
 
-    def load_kla_data(self, file_path: str) -> pd.DataFrame:
+    def load_kla_data(self, file_path: str, content: Optional[bytes] = None) -> pd.DataFrame:
         """
         Loads and processes data from the KLA dataset.
 
+        The file is read in a single pass: the metadata block up to the 'Time' header
+        is parsed into a KlaHeader, the units line is consumed, and each data row is
+        parsed straight into typed column buffers. 'Time' is built from the measurement
+        start and mean sampling interval of the header and only spot-checked against
+        the rows (see kla_header.kla_time_index()). The units are stored in
+        ``DataFrame.attrs['units']`` and the header in ``DataFrame.attrs['header']``.
+
         :param file_path: Path to the KLA data file.
+        :param content: Content of the file, already read e.g. by fetch_files() (optional).
         :return: DataFrame containing the loaded KLA data.
         """
-        logger.info(f"Loading KLA data from {file_path}")
-        data_start, header_line, units_line = self.find_data_start(file_path)
-
-        if header_line is None:
-            logger.error("Header with 'Time' was not found.")
-            raise ValueError("Header with 'Time' was not found.")
+        logger.info("Loading KLA data from %s", file_path)
+        try:
+            if content is not None:
+                file = TextIOWrapper(BytesIO(content), encoding=KLA_ENCODING)
+            else:
+                file = open(file_path, 'r', encoding=KLA_ENCODING)
+            with file:
+                metadata_lines, header_line, units_line = self._read_kla_header(file)
+                if header_line is None:
+                    raise ValueError("Header with 'Time' was not found.")
 
-        columns = [col.strip() for col in header_line.split(';') if col.strip()]
-        logger.debug(f"Columns found: {columns}")
+                header = parse_kla_header(metadata_lines, KLA_DELIMITER)
+                logger.debug("KLA header: %s", header)
+                columns = [col.strip() for col in header_line.split(KLA_DELIMITER) if col.strip()]
+                logger.debug("Columns found: %s", columns)
+                kla_data = self._read_kla_rows(file, columns, header)
 
-        try:
-            with open(file_path, 'r', encoding='utf-16-le') as file:
-                for _ in range(data_start):
-                    next(file)
-                data_str = ''.join(file.readlines())
-
-            kla_data = pd.read_csv(
-                StringIO(data_str),
-                delimiter=';',
-                decimal=',',
-                names=columns,
-                usecols=columns,
-                engine='python',
-                skip_blank_lines=True
-            )
+            units = [unit.strip() for unit in (units_line or '').split(KLA_DELIMITER)]
+            kla_data.attrs['units'] = dict(zip(columns, units))
+            kla_data.attrs['header'] = header
             logger.info("KLA data loaded successfully.")
             return kla_data
         except FileNotFoundError:
-            logger.error(f"File not found: {file_path}")
+            logger.error("File not found: %s", file_path)
             raise
-        except pd.errors.ParserError as e:
-            logger.error(f"Error parsing KLA CSV file: {e}")
+        except ValueError as e:  # Also UnicodeDecodeError
+            logger.error("Malformed KLA file %s: %s", file_path, e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error while loading KLA data: {e}")
+            logger.error("Unexpected error while loading KLA data: %s", e)
+            raise
+
+    def load_kla_header(self, file_path: str) -> KlaHeader:
+        """
+        Read only the metadata block of a KLA file, without its data rows.
+
+        :param file_path: Path to the KLA data file.
+        :return: The parsed header.
+        """
+        try:
+            with open(file_path, 'r', encoding=KLA_ENCODING) as file:
+                metadata_lines, _, _ = self._read_kla_header(file)
+        except FileNotFoundError:
+            logger.error("File not found: %s", file_path)
             raise
+        return parse_kla_header(metadata_lines, KLA_DELIMITER)
+
+    def load_kla_files(self, file_paths: List[Path]) -> Dict[Path, pd.DataFrame]:
+        """
+        Load several KLA files, reading them concurrently (see fetch_files()).
+
+        Each file is parsed as soon as its bytes have arrived. Files that cannot be
+        loaded are logged and left out.
+
+        :param file_paths: Paths to the KLA data files.
+        :return: DataFrames keyed by path, in the order of file_paths.
+        """
+        loaded: Dict[Path, pd.DataFrame] = {}
+        for _, file_path, content in self.fetch_files(list(file_paths)):
+            try:
+                loaded[file_path] = self.load_kla_data(str(file_path), content=content)
+            except Exception as e:
+                logger.error("Could not load KLA file %s: %s", Path(file_path).name, e)
+        return {file_path: loaded[file_path] for file_path in file_paths if file_path in loaded}
+
+    @staticmethod
+    def _read_kla_header(file) -> Tuple[List[str], Optional[str], Optional[str]]:
+        """
+        Advance an open KLA file past its metadata block, header and units line.
+
+        :param file: Open text file positioned at the start of the file.
+        :return: Tuple containing the metadata lines, the header line and the units line
+            (None for both if there is no 'Time' header).
+        """
+        metadata_lines = []
+        for line in file:
+            if line.startswith('Time'):
+                return metadata_lines, line.strip(), next(file, '').strip()
+            metadata_lines.append(line)
+        return metadata_lines, None, None
+
+    @staticmethod
+    def _read_kla_rows(file, columns: List[str],
+                       header: Optional[KlaHeader] = None) -> pd.DataFrame:
+        """
+        Parse the KLA data block into typed column buffers.
+
+        'Time' becomes datetime64 (see kla_header.kla_time_index()) and all other
+        columns are parsed as floats with ',' as decimal separator. Blank rows are
+        skipped and unparsable values become NaN.
+
+        :param file: Open text file positioned after the units line.
+        :param columns: Column names from the header line.
+        :param header: Metadata of the export, used for the time index (optional).
+        :return: DataFrame built from the column buffers.
+        """
+        times: List[str] = []
+        buffers = [array('d') for _ in columns[1:]]
+        width = len(columns)
+        for line in file:
+            fields = line.rstrip('\r\n').split(KLA_DELIMITER, width)
+            if not any(field.strip() for field in fields):
+                continue
+            fields.extend([''] * (width - len(fields)))
+            times.append(fields[0].strip())
+            for buffer, field in zip(buffers, fields[1:width]):
+                buffer.append(_parse_kla_number(field))
+
+        data: Dict[str, Any] = {columns[0]: kla_time_index(times, header)}
+        for column, buffer in zip(columns[1:], buffers):
+            data[column] = np.frombuffer(buffer, dtype=np.float64) if buffer else np.empty(0)
+        return pd.DataFrame(data, copy=False)
 
     def _get_dataset(self, dataset: str) -> Optional[pd.DataFrame]:
         """
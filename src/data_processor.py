@@ -1,14 +1,186 @@
 # data_processor.py
 import logging
-from typing import Optional
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from column_buffer import ColumnBuffer
+from downsampler import minmax_rows
+from kla_estimator import estimate_kla, parse_kla_conditions
+from resampling import interpolate_to_grid, nearest_to_grid
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Online columns kept when online data is reduced from chunks: the time axes and
+# the signals that are plotted or needed for the derived series.
+ONLINE_SUMMARY_COLUMNS = [
+    'time', 'elapsed_hours', 'sCO2', 'sO2', 'spO2', 'sVR', 'spH', 'NStirrer', 'FAirIn', 'FGlucose'
+]
+
+# Default number of rows the streamed online data is reduced to (see consume_online_chunks())
+ONLINE_SUMMARY_ROWS = 100_000
+
+# Columns of preprocessed KLA data needed for the kLa estimation
+KLA_REQUIRED_COLUMNS = ['Time', 'spO2', 'NStirrer', 'FAirIn']
+
+# Offline measurements with their sample time and value attributes, and the online
+# signals attached to them by align_offline()
+OFFLINE_MEASUREMENTS = {
+    'biomass': ('time_biomass', 'biomass'),
+    'glucose': ('time_glucose', 'glucose'),
+    'ethanol': ('time_ethanol', 'ethanol'),
+}
+ALIGNED_ONLINE_SIGNALS = ['sO2', 'sCO2', 'FGlucose', 'sVR']
+
+# Frames the derived DataProcessor attributes are computed from
+SOURCE_FRAMES = ('offline_data', 'online_data')
+
+# Derived attributes of the online data that append_online_data() extends incrementally
+ONLINE_DERIVED_ATTRIBUTES = [
+    'time_feed_glucose', 'feed_start_time', 'time_feed_glucose_numeric', 'glucose_feed',
+    'valid_aeration_mask', 'valid_stirrer_mask', 'valid_feed_glucose_mask'
+]
+
+
+def _frame_signature(frame: pd.DataFrame) -> Tuple[Any, ...]:
+    """
+    Cheap signature of a frame's shape, columns, dtypes and column data.
+
+    Assigning a column (df['Zeit'] = ...) or changing a dtype gives the column new
+    data and changes the signature, because the new data is allocated while the old
+    column still holds its memory; writing single values into the existing data
+    (df.loc[i, 'Zeit'] = ...) does not.
+
+    :param frame: DataFrame.
+    :return: Tuple of the shape and one (name, dtype, data) entry per column.
+    """
+    columns = []
+    for column, series in frame.items():
+        if isinstance(series.dtype, np.dtype):
+            # np.asarray() of a NumPy column is a view of its data, so its address
+            # identifies the data
+            data = np.asarray(series).__array_interface__['data'][0]
+        else:
+            # Extension arrays (categories, nullable integers, ...) are the objects
+            # stored in the frame
+            data = id(series.array)
+        columns.append((column, series.dtype, data))
+    return (frame.shape, tuple(columns))
+
+
+class _Derived:
+    """Lazily computed, cached attribute of a DataProcessor.
+
+    The value is computed on first access and cached together with the version and
+    a signature of the frames it depends on, directly or through other derived
+    attributes (see _frame_signature()). It is recomputed after one of these frames
+    was assigned (which bumps its version), changed its shape, or had a column
+    assigned or retyped, or after
+    DataProcessor.invalidate(). Single values written into an existing column
+    (df.loc[i, column] = ...) are not detected; call invalidate() after those.
+    Assigning a value caches it as if it had been computed and invalidates the
+    attributes derived from it.
+    """
+
+    def __init__(self, function: Callable[[Any], Any], dependencies: Tuple[str, ...]):
+        self.function = function
+        self.dependencies = dependencies
+        self.__doc__ = function.__doc__
+        self._upstream: Optional[FrozenSet[str]] = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def upstream(self, owner: type) -> FrozenSet[str]:
+        """
+        All frames and derived attributes this attribute depends on, directly or indirectly.
+
+        :param owner: Class defining the attribute.
+        :return: Set of attribute names.
+        """
+        if self._upstream is None:
+            names = set(self.dependencies)
+            for dependency in self.dependencies:
+                attribute = getattr(owner, dependency, None)
+                if isinstance(attribute, _Derived):
+                    names |= attribute.upstream(owner)
+            self._upstream = frozenset(names)
+        return self._upstream
+
+    def stamp(self, instance: 'DataProcessor') -> Tuple[Any, ...]:
+        """
+        Versions and signatures of the source frames the cached value was computed from.
+
+        :param instance: DataProcessor instance.
+        :return: One (version, signature) pair per source frame; the signature is None
+            for a missing frame.
+        """
+        upstream = self.upstream(type(instance))
+        stamp = []
+        for name in SOURCE_FRAMES:
+            if name in upstream:
+                frame = getattr(instance, name)
+                signature = None if frame is None else _frame_signature(frame)
+                stamp.append((instance._versions[name], signature))
+        return tuple(stamp)
+
+    def __get__(self, instance: Optional['DataProcessor'], owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        stamp = self.stamp(instance)
+        entry = instance._derived.get(self.name)
+        if entry is not None and entry[1] == stamp:
+            return entry[0]
+        value = self.function(instance)
+        instance._derived[self.name] = (value, stamp)
+        return value
+
+    def __set__(self, instance: 'DataProcessor', value: Any) -> None:
+        instance.invalidate(self.name)
+        instance._derived[self.name] = (value, self.stamp(instance))
+
+
+def _as_numeric(series: pd.Series) -> pd.Series:
+    """
+    Return a column as numbers; columns typed by the loader's schema are returned as they are.
+
+    :param series: Column, numeric or holding strings.
+    :return: The numeric column (NaN where a string is not a number).
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series
+    return pd.to_numeric(series, errors='coerce')
+
+
+def derived(*dependencies: str) -> Callable[[Callable[[Any], Any]], _Derived]:
+    """
+    Declare a lazily computed, cached DataProcessor attribute.
+
+    :param dependencies: Source frames ('offline_data', 'online_data') and derived
+        attributes the value is computed from.
+    :return: Decorator turning the computing method into the attribute.
+    """
+    def decorator(function: Callable[[Any], Any]) -> _Derived:
+        return _Derived(function, dependencies)
+    return decorator
+
+
 class DataProcessor:
-    """Class to process data for plotting and analysis."""
+    """Class to process data for plotting and analysis.
+
+    The offline series, glucose feed times and validity masks are derived
+    attributes: each is computed from the offline or online data when it is first
+    accessed, cached, and recomputed once the frame it depends on is replaced,
+    changes its shape or has a column assigned. Consumers therefore only pay for
+    the series they use. The extract_offline_columns(), calculate_feed_time() and
+    get_valid_masks() methods compute their group of series eagerly.
+
+    The offline and online frames are never modified. Series that need no
+    conversion are views of their columns, so one loaded (or memory-mapped,
+    read-only) run can be shared by several processors and threads.
+    """
 
     def __init__(self, offline_data: Optional[pd.DataFrame], online_data: Optional[pd.DataFrame]):
         """
@@ -17,132 +189,518 @@ class DataProcessor:
         :param offline_data: DataFrame containing offline data.
         :param online_data: DataFrame containing online data.
         """
-        self.offline_data = offline_data
-        self.online_data = online_data
+        # Cached derived values with the signatures of the frames they were computed from
+        self._derived: Dict[str, Tuple[Any, Tuple[Any, ...]]] = {}
+        # Buffers behind the derived online series extended by append_online_data(),
+        # with the series each of them last returned
+        self._online_buffers: Dict[str, Tuple[ColumnBuffer, pd.Series]] = {}
+        # Bumped whenever a source frame is assigned, so cached values computed from it are outdated
+        self._versions: Dict[str, int] = {name: 0 for name in SOURCE_FRAMES}
+        self._offline_data = offline_data
+        self._online_data = online_data
 
-        # Initialize processed attributes
-        self.time_biomass: Optional[pd.Series] = None
-        self.time_glucose: Optional[pd.Series] = None
-        self.time_ethanol: Optional[pd.Series] = None
-        self.biomass: Optional[pd.Series] = None
-        self.ethanol: Optional[pd.Series] = None
-        self.glucose: Optional[pd.Series] = None
+    @property
+    def offline_data(self) -> Optional[pd.DataFrame]:
+        return self._offline_data
 
-        self.time_feed_glucose_numeric: Optional[pd.Series] = None
-        self.glucose_feed: Optional[pd.Series] = None
+    @offline_data.setter
+    def offline_data(self, data: Optional[pd.DataFrame]) -> None:
+        self._offline_data = data
+        self._versions['offline_data'] += 1
+        self.invalidate('offline_data')
 
-        self.valid_aeration_mask: Optional[pd.Series] = None
-        self.valid_stirrer_mask: Optional[pd.Series] = None
-        self.valid_feed_glucose_mask: Optional[pd.Series] = None
+    @property
+    def online_data(self) -> Optional[pd.DataFrame]:
+        return self._online_data
 
-    def extract_offline_columns(self) -> None:
+    @online_data.setter
+    def online_data(self, data: Optional[pd.DataFrame]) -> None:
+        self._online_data = data
+        self._versions['online_data'] += 1
+        self.invalidate('online_data')
+
+    def invalidate(self, *names: str) -> None:
         """
-        Extract and convert relevant columns from offline data.
+        Drop cached derived values so that they are recomputed on the next access.
+
+        Needed after single values were written into an existing column of a frame
+        (df.loc[i, column] = ...), unless the frame is assigned again; assigned frames
+        and columns are detected.
+
+        :param names: Frames ('offline_data', 'online_data') or derived attributes whose
+            cached values, and those of every attribute derived from them, are dropped.
+            Without names the whole cache is cleared.
+        """
+        if not names:
+            self._derived.clear()
+            return
+        for name in list(self._derived):
+            attribute = getattr(type(self), name)
+            if name in names or not attribute.upstream(type(self)).isdisjoint(names):
+                del self._derived[name]
+
+    def _cached(self, name: str) -> Any:
+        """
+        Return the cached value of a derived attribute without computing it.
+
+        :param name: Name of the derived attribute.
+        :return: The cached value, or None if it is not cached or outdated.
+        """
+        entry = self._derived.get(name)
+        if entry is None or entry[1] != getattr(type(self), name).stamp(self):
+            return None
+        return entry[0]
+
+    def _require_columns(self, dataset: str, columns: List[str], purpose: str = '') -> pd.DataFrame:
         """
-        if self.offline_data is None:
-            logger.error("Offline data is not provided.")
-            raise ValueError("Offline data is not provided.")
+        Return the offline or online data after checking that it holds the given columns.
 
-        required_columns = ['Zeit_BTM', 'Zeit_G', 'Zeit_E', 'BTM', 'EtOH', 'Glu']
-        missing_columns = [col for col in required_columns if col not in self.offline_data.columns]
+        :param dataset: 'offline' or 'online'.
+        :param columns: Required columns.
+        :param purpose: Suffix of the error message for missing columns, e.g. ' for masks'.
+        :return: The DataFrame.
+        """
+        data = self.offline_data if dataset == 'offline' else self.online_data
+        if data is None:
+            logger.error("%s data is not provided.", dataset.capitalize())
+            raise ValueError(f"{dataset.capitalize()} data is not provided.")
+        missing_columns = [col for col in columns if col not in data.columns]
         if missing_columns:
-            logger.error(f"Missing columns in offline data: {missing_columns}")
-            raise KeyError(f"Missing columns in offline data: {missing_columns}")
+            logger.error("Missing columns in %s data%s: %s", dataset, purpose, missing_columns)
+            raise KeyError(f"Missing columns in {dataset} data{purpose}: {missing_columns}")
+        return data
+
+    @derived('offline_data')
+    def time_biomass(self) -> pd.Series:
+        """Sample times of the biomass measurements ('Zeit_BTM')."""
+        return self._require_columns('offline', ['Zeit_BTM'])['Zeit_BTM']
+
+    @derived('offline_data')
+    def time_glucose(self) -> pd.Series:
+        """Sample times of the glucose measurements ('Zeit_G')."""
+        return self._require_columns('offline', ['Zeit_G'])['Zeit_G']
+
+    @derived('offline_data')
+    def time_ethanol(self) -> pd.Series:
+        """Sample times of the ethanol measurements ('Zeit_E')."""
+        return self._require_columns('offline', ['Zeit_E'])['Zeit_E']
+
+    @derived('offline_data')
+    def biomass(self) -> pd.Series:
+        """Biomass ('BTM') as numbers."""
+        return _as_numeric(self._require_columns('offline', ['BTM'])['BTM'])
+
+    @derived('offline_data')
+    def ethanol(self) -> pd.Series:
+        """Ethanol ('EtOH') as numbers."""
+        return _as_numeric(self._require_columns('offline', ['EtOH'])['EtOH'])
+
+    @derived('offline_data')
+    def glucose(self) -> pd.Series:
+        """Glucose ('Glu') as numbers."""
+        return _as_numeric(self._require_columns('offline', ['Glu'])['Glu'])
+
+    @derived('online_data')
+    def time_feed_glucose(self) -> pd.Series:
+        """Glucose feed times parsed from 'Zeit_FG', or the parsed 'time_feed_glucose' column."""
+        online_data = self._require_columns('online', [])
+        if 'Zeit_FG' not in online_data.columns and 'time_feed_glucose' in online_data.columns:
+            return online_data['time_feed_glucose']
+        zeit_fg = self._require_columns('online', ['Zeit_FG'])['Zeit_FG']
+        return pd.to_datetime(zeit_fg, format='%H:%M:%S', errors='coerce')
+
+    @derived('time_feed_glucose')
+    def feed_start_time(self) -> pd.Timestamp:
+        """Earliest glucose feed time."""
+        return self.time_feed_glucose.min()
+
+    @derived('time_feed_glucose', 'feed_start_time')
+    def time_feed_glucose_numeric(self) -> pd.Series:
+        """Glucose feed times in hours since the earliest feed time."""
+        # Convert to hours
+        return (self.time_feed_glucose - self.feed_start_time).dt.total_seconds() / 3600
+
+    @derived('online_data')
+    def glucose_feed(self) -> pd.Series:
+        """Glucose feed ('FGlucose') as numbers."""
+        return _as_numeric(self._require_columns('online', ['FGlucose'])['FGlucose'])
+
+    @derived('online_data')
+    def valid_aeration_mask(self) -> pd.Series:
+        """Rows with an air flow ('FAirIn') value."""
+        return ~self._require_columns('online', ['FAirIn'], ' for masks')['FAirIn'].isnull()
+
+    @derived('online_data')
+    def valid_stirrer_mask(self) -> pd.Series:
+        """Rows with a stirrer speed ('NStirrer') value."""
+        return ~self._require_columns('online', ['NStirrer'], ' for masks')['NStirrer'].isnull()
+
+    @derived('time_feed_glucose', 'glucose_feed')
+    def valid_feed_glucose_mask(self) -> pd.Series:
+        """Rows with both a glucose feed time and a glucose feed value."""
+        return ~self.time_feed_glucose.isnull() & ~self.glucose_feed.isnull()
+
+    @derived('offline_data', 'online_data')
+    def aligned_offline(self) -> pd.DataFrame:
+        """Offline samples with the online signals interpolated at their times (align_offline())."""
+        return self.align_offline()
+
+    def align_offline(
+        self,
+        signals: Optional[List[str]] = None,
+        method: str = 'interpolate',
+        tolerance: Optional[float] = None
+    ) -> pd.DataFrame:
+        """
+        Attach online signal values to every offline sample on the elapsed-hours axis.
+
+        The offline sample times ('Zeit_BTM', 'Zeit_G', 'Zeit_E') are hours since the
+        start of the run, like the online 'elapsed_hours'. All sample times are looked
+        up at once with a sorted searchsorted join (see resampling), each signal among
+        its own valid samples.
+
+        :param signals: Online signals to attach (default: ALIGNED_ONLINE_SIGNALS).
+        :param method: 'interpolate' (linear between the neighbouring samples) or
+            'nearest' (value of the nearest sample).
+        :param tolerance: Hours; with 'interpolate' the largest gap between neighbouring
+            samples, with 'nearest' the largest distance to the sample. Beyond it the
+            value is NaN (optional).
+        :return: DataFrame with one row per offline sample and the columns 'measurement'
+            ('biomass', 'glucose' or 'ethanol'), 'elapsed_hours', 'value' and one column
+            per signal.
+        """
+        if method not in ('interpolate', 'nearest'):
+            raise ValueError(
+                f"Unknown alignment method '{method}'. Choose 'interpolate' or 'nearest'."
+            )
+        signals = list(ALIGNED_ONLINE_SIGNALS if signals is None else signals)
+        online_data = self._require_columns('online', ['elapsed_hours'] + signals, ' for alignment')
+
+        logger.info("Aligning offline samples to online signals %s (%s).", signals, method)
+        measurements = []
+        for measurement, (time_attribute, value_attribute) in OFFLINE_MEASUREMENTS.items():
+            times = _as_numeric(getattr(self, time_attribute)).to_numpy(dtype=float)
+            measurements.append(pd.DataFrame({
+                'measurement': measurement,
+                'elapsed_hours': times,
+                'value': getattr(self, value_attribute).to_numpy(dtype=float),
+            }))
+        aligned = pd.concat(measurements, ignore_index=True)
+
+        lookup = interpolate_to_grid if method == 'interpolate' else nearest_to_grid
+        values = lookup(
+            online_data['elapsed_hours'].to_numpy(dtype=float),
+            np.column_stack([online_data[signal].to_numpy(dtype=float) for signal in signals]),
+            aligned['elapsed_hours'].to_numpy(),
+            tolerance
+        )
+        for column, signal in enumerate(signals):
+            aligned[signal] = values[:, column]
+        return aligned
+
+    def extract_offline_columns(self) -> None:
+        """
+        Extract and convert relevant columns from offline data.
+
+        The offline series are otherwise computed on first access; this method
+        computes all of them at once and fails early if a column is missing.
+        """
+        self._require_columns('offline', ['Zeit_BTM', 'Zeit_G', 'Zeit_E', 'BTM', 'EtOH', 'Glu'])
 
         logger.info("Extracting and converting columns from offline data.")
-        self.time_biomass = self.offline_data['Zeit_BTM']
-        self.time_glucose = self.offline_data['Zeit_G']
-        self.time_ethanol = self.offline_data['Zeit_E']
-        self.biomass = pd.to_numeric(self.offline_data['BTM'], errors='coerce')
-        self.ethanol = pd.to_numeric(self.offline_data['EtOH'], errors='coerce')
-        self.glucose = pd.to_numeric(self.offline_data['Glu'], errors='coerce')
+        self.invalidate('offline_data')
+        names = ['time_biomass', 'time_glucose', 'time_ethanol', 'biomass', 'ethanol', 'glucose']
+        for name in names:
+            getattr(self, name)
         logger.info("Offline columns extracted and converted successfully.")
 
     def calculate_feed_time(self) -> None:
         """
         Calculate the numeric feed time for glucose feeds in online data.
         """
-        if self.online_data is None:
-            logger.error("Online data is not provided.")
-            raise ValueError("Online data is not provided.")
-
-        required_columns = ['Zeit_FG', 'FGlucose']
-        missing_columns = [col for col in required_columns if col not in self.online_data.columns]
-        if missing_columns:
-            logger.error(f"Missing columns in online data: {missing_columns}")
-            raise KeyError(f"Missing columns in online data: {missing_columns}")
+        self._require_columns('online', ['Zeit_FG', 'FGlucose'])
 
         logger.info("Calculating feed time for glucose feeds.")
         try:
-            self.online_data['time_feed_glucose'] = pd.to_datetime(
-                self.online_data['Zeit_FG'],
-                format='%H:%M:%S',
-                errors='coerce'
-            )
-            start_time_feed_glucose = self.online_data['time_feed_glucose'].min()
-            self.time_feed_glucose_numeric = (
-                self.online_data['time_feed_glucose'] - start_time_feed_glucose
-            ).dt.total_seconds() / 3600  # Convert to hours
-            self.glucose_feed = pd.to_numeric(self.online_data['FGlucose'], errors='coerce')
+            self.invalidate('time_feed_glucose', 'glucose_feed')
+            self.time_feed_glucose_numeric
+            self.glucose_feed
             logger.info("Feed time calculated successfully.")
         except Exception as e:
-            logger.error(f"Error calculating feed time: {e}")
+            logger.error("Error calculating feed time: %s", e)
             raise
 
+    def consume_online_chunks(self, chunks: Iterable[pd.DataFrame],
+                              max_rows: int = ONLINE_SUMMARY_ROWS) -> None:
+        """
+        Reduce streamed online chunks into the feed times, masks and summary series.
+
+        Only ONLINE_SUMMARY_COLUMNS and the parsed glucose feed time are kept from each
+        chunk. Each chunk is appended to the summary so far, and whenever the summary
+        exceeds max_rows it is reduced to the rows holding the minimum and maximum of
+        every column in equally wide elapsed-time buckets (see
+        downsampler.minmax_rows()). Memory is thus bounded by max_rows plus one chunk,
+        not by the size of the online file. The earliest glucose feed time is one of
+        these minima, so the feed start is exact. Afterwards online_data holds the
+        reduced frame, from which the feed times and masks are derived.
+
+        :param chunks: Typed online chunks, e.g. from DataLoader.iter_online_chunks().
+        :param max_rows: Most rows kept in the reduced online data.
+        """
+        logger.info("Reducing online data chunks to at most %s rows.", max_rows)
+        summary: Optional[pd.DataFrame] = None
+        rows = 0
+        for chunk in chunks:
+            missing_columns = [col for col in ['Zeit_FG', 'FGlucose'] if col not in chunk.columns]
+            if missing_columns:
+                logger.error("Missing columns in online data: %s", missing_columns)
+                raise KeyError(f"Missing columns in online data: {missing_columns}")
+
+            reduced = {
+                column: chunk[column].to_numpy()
+                for column in ONLINE_SUMMARY_COLUMNS if column in chunk.columns
+            }
+            reduced['FGlucose'] = _as_numeric(chunk['FGlucose']).to_numpy()
+            reduced['time_feed_glucose'] = pd.to_datetime(
+                chunk['Zeit_FG'],
+                format='%H:%M:%S',
+                errors='coerce'
+            ).to_numpy()
+            piece = pd.DataFrame(reduced, copy=False)
+            summary = piece if summary is None else pd.concat([summary, piece], ignore_index=True)
+            rows += len(chunk)
+            if len(summary) > max_rows:
+                summary = summary.take(self._summary_rows(summary, max_rows)).reset_index(drop=True)
+
+        self.online_data = summary if summary is not None else pd.DataFrame()
+        logger.info("Reduced %s online rows to %s rows and %s columns.",
+                    rows, len(self.online_data), len(self.online_data.columns))
+
+    @staticmethod
+    def _summary_rows(summary: pd.DataFrame, max_rows: int) -> np.ndarray:
+        """
+        Select the rows of the reduced online data that are kept, at most half of max_rows.
+
+        :param summary: Reduced online data.
+        :param max_rows: Most rows of the reduced online data.
+        :return: Increasing row indices.
+        """
+        if 'elapsed_hours' in summary.columns:
+            x = summary['elapsed_hours'].to_numpy(dtype=float)
+        else:
+            x = np.arange(len(summary), dtype=float)
+        columns = [
+            summary[column].to_numpy(dtype=float) for column in summary.columns
+            if column != 'elapsed_hours' and pd.api.types.is_float_dtype(summary[column].dtype)
+        ]
+        feed_time = summary['time_feed_glucose'].to_numpy()
+        feed_ns = feed_time.view(np.int64).astype(float)
+        columns.append(np.where(np.isnat(feed_time), np.nan, feed_ns))
+        buckets = max(1, max_rows // (4 * len(columns)))
+        return minmax_rows(x, np.column_stack(columns), buckets)
+
+    def append_online_data(self, online_data: pd.DataFrame, new_rows: int) -> None:
+        """
+        Update the derived online series after rows were appended to the online data.
+
+        Only the last new_rows rows are parsed and masked, and the derived series are
+        extended through growable buffers, so an update costs O(new_rows) rather than
+        O(all rows). The feed time offsets of earlier rows are only shifted if an
+        appended row moves the feed start. Falls back to calculate_feed_time() and
+        get_valid_masks() when the derived series of the previous frame are not
+        cached or do not match it.
+
+        :param online_data: The online DataFrame including the appended rows,
+            e.g. DataLoader.online_data after DataLoader.poll_online_data().
+        :param new_rows: Number of rows appended at the end of online_data.
+        """
+        previous_rows = len(online_data) - new_rows
+        previous = {name: self._cached(name) for name in ONLINE_DERIVED_ATTRIBUTES}
+        self.online_data = online_data
+        if (
+            previous_rows == 0
+            or any(value is None for value in previous.values())
+            or len(previous['time_feed_glucose_numeric']) != previous_rows
+        ):
+            self.calculate_feed_time()
+            self.get_valid_masks()
+            return
+
+        logger.info("Updating derived online series with %s new rows.", new_rows)
+        tail = online_data.iloc[previous_rows:]
+        tail_feed_time = pd.to_datetime(tail['Zeit_FG'], format='%H:%M:%S', errors='coerce')
+
+        previous_start = previous['feed_start_time']
+        tail_start = tail_feed_time.min()
+        start_time_feed_glucose = previous_start
+        if pd.isna(previous_start) or (not pd.isna(tail_start) and tail_start < previous_start):
+            start_time_feed_glucose = tail_start
+        tail_numeric = (tail_feed_time - start_time_feed_glucose).dt.total_seconds() / 3600
+        head_numeric = previous['time_feed_glucose_numeric']
+        if not pd.isna(previous_start) and start_time_feed_glucose != previous_start:
+            shift = (previous_start - start_time_feed_glucose).total_seconds() / 3600
+            head_numeric = head_numeric + shift
+
+        # Assign upstream series first: assigning a series invalidates the ones derived from it
+        tail_glucose_feed = _as_numeric(tail['FGlucose'])
+        extend = self._extend_series
+        self.time_feed_glucose = extend('time_feed_glucose', previous['time_feed_glucose'],
+                                        tail_feed_time)
+        self.feed_start_time = start_time_feed_glucose
+        self.time_feed_glucose_numeric = extend('time_feed_glucose_numeric', head_numeric,
+                                                tail_numeric)
+        self.glucose_feed = extend('glucose_feed', previous['glucose_feed'], tail_glucose_feed)
+        self.valid_aeration_mask = extend('valid_aeration_mask', previous['valid_aeration_mask'],
+                                          ~tail['FAirIn'].isnull())
+        self.valid_stirrer_mask = extend('valid_stirrer_mask', previous['valid_stirrer_mask'],
+                                         ~tail['NStirrer'].isnull())
+        self.valid_feed_glucose_mask = extend(
+            'valid_feed_glucose_mask', previous['valid_feed_glucose_mask'],
+            ~tail_feed_time.isnull() & ~tail_glucose_feed.isnull()
+        )
+
+    def _extend_series(self, name: str, head: pd.Series, tail: pd.Series) -> pd.Series:
+        """
+        Append the values of the new rows to a derived online series.
+
+        The buffer of the series is reused while head is the series it last returned,
+        so only the tail is copied; otherwise head is copied into a new buffer once.
+
+        :param name: Name of the derived attribute.
+        :param head: Series of the previous rows.
+        :param tail: Series of the new rows.
+        :return: Series over the index of online_data, backed by the buffer.
+        """
+        buffer, series = self._online_buffers.get(name, (None, None))
+        if series is not head:
+            buffer = ColumnBuffer(head.to_numpy())
+        buffer.append(tail.to_numpy())
+        series = pd.Series(buffer.view(), index=self.online_data.index, name=head.name, copy=False)
+        self._online_buffers[name] = (buffer, series)
+        return series
+
     def get_valid_masks(self) -> None:
         """
         Create masks for valid values in key columns.
         """
-        if self.online_data is None:
-            logger.error("Online data is not provided.")
-            raise ValueError("Online data is not provided.")
-
-        required_columns = ['FAirIn', 'NStirrer', 'time_feed_glucose', 'FGlucose']
-        missing_columns = [col for col in required_columns if col not in self.online_data.columns]
-        if missing_columns:
-            logger.error(f"Missing columns in online data for masks: {missing_columns}")
-            raise KeyError(f"Missing columns in online data for masks: {missing_columns}")
+        online_data = self._require_columns(
+            'online', ['FAirIn', 'NStirrer', 'FGlucose'], ' for masks'
+        )
+        if 'Zeit_FG' not in online_data.columns and 'time_feed_glucose' not in online_data.columns:
+            logger.error("Missing columns in online data for masks: ['time_feed_glucose']")
+            raise KeyError("Missing columns in online data for masks: ['time_feed_glucose']")
 
         logger.info("Creating valid masks for online data.")
-        self.valid_aeration_mask = ~self.online_data['FAirIn'].isnull()
-        self.valid_stirrer_mask = ~self.online_data['NStirrer'].isnull()
-        self.valid_feed_glucose_mask = (
-            ~self.online_data['time_feed_glucose'].isnull() &
-            ~self.online_data['FGlucose'].isnull()
-        )
+        self.invalidate('valid_aeration_mask', 'valid_stirrer_mask', 'valid_feed_glucose_mask')
+        self.valid_aeration_mask
+        self.valid_stirrer_mask
+        self.valid_feed_glucose_mask
         logger.info("Valid masks created successfully.")
 
     def preprocess_kla_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Perform additional data cleaning for KLA dataset.
 
+        The given frame is left untouched. The cleaned frame is built from its
+        columns, so columns that need no conversion are shared rather than copied;
+        rows are only copied when rows with invalid timestamps have to be dropped.
+        A 'Time' column that is already datetime64, as built by
+        DataLoader.load_kla_data(), is not parsed again.
+
         :param df: DataFrame containing KLA data.
         :return: Cleaned DataFrame.
         """
         logger.info("Preprocessing KLA data.")
         try:
-            df.columns = df.columns.str.strip()
-            df['Time'] = df['Time'].astype(str).str.strip()
-            df['Time'] = pd.to_datetime(
-                df['Time'],
-                format='%d.%m.%Y %H:%M:%S',
-                errors='coerce',
-                dayfirst=True
-            )
+            columns = {str(column).strip(): df[column] for column in df.columns}
+            time = columns['Time']
+            if not pd.api.types.is_datetime64_any_dtype(time):
+                time = pd.to_datetime(
+                    time.astype(str).str.strip(),
+                    format='%d.%m.%Y %H:%M:%S',
+                    errors='coerce',
+                    dayfirst=True
+                )
+                columns['Time'] = time
+            for col, values in columns.items():
+                if col != 'Time' and values.dtype == object:
+                    columns[col] = pd.to_numeric(values.str.replace(',', '.'), errors='coerce')
+            cleaned = pd.DataFrame(columns, copy=False)
 
-            num_invalid_times = df['Time'].isna().sum()
+            num_invalid_times = time.isna().sum()
             if num_invalid_times > 0:
-                logger.warning(f"{num_invalid_times} rows have invalid timestamps.")
-
-            df = df.dropna(subset=['Time']).reset_index(drop=True)
-
-            numeric_columns = df.columns.drop('Time')
-            for col in numeric_columns:
-                if df[col].dtype == object:
-                    df[col] = pd.to_numeric(df[col].str.replace(',', '.'), errors='coerce')
+                logger.warning("%s rows have invalid timestamps.", num_invalid_times)
+                cleaned = cleaned[time.notna().to_numpy()]
+            # Renumber the rows of the new frame without copying its columns
+            cleaned.index = pd.RangeIndex(len(cleaned))
 
             logger.info("KLA data preprocessed successfully.")
-            return df
+            return cleaned
         except Exception as e:
-            logger.error(f"Error preprocessing KLA data: {e}")
+            logger.error("Error preprocessing KLA data: %s", e)
             raise
+
+    def estimate_kla(
+        self,
+        kla_data: Dict[str, pd.DataFrame],
+        lower_fraction: float = 0.1,
+        upper_fraction: float = 0.8,
+        saturation_points: int = 5
+    ) -> pd.DataFrame:
+        """
+        Estimate kLa for several preprocessed KLA runs with the dynamic gassing-in method.
+
+        The re-aeration step is detected from 'FAirIn' and 'NStirrer', and ln(C* - C)
+        of 'spO2' is fitted against time for all runs in one batched least-squares
+        solve (see kla_estimator.estimate_kla()). Stirrer speed and volume are read
+        from the file names; the stirrer speed falls back to the measured median.
+
+        :param kla_data: Preprocessed KLA DataFrames keyed by file name or stem.
+        :param lower_fraction: Lower bound of the fitted range as a fraction of C*.
+        :param upper_fraction: Upper bound of the fitted range as a fraction of C*.
+        :param saturation_points: Number of final aeration samples averaged into C*.
+        :return: DataFrame with one row per run, sorted by 'rpm' and 'volume', with the
+            columns 'file', 'rpm', 'volume', 'kla' (1/h), 'saturation', 'points' and 'r_squared'.
+        """
+        logger.info("Estimating kLa for %s KLA runs.", len(kla_data))
+        for name, df in kla_data.items():
+            missing_columns = [col for col in KLA_REQUIRED_COLUMNS if col not in df.columns]
+            if missing_columns:
+                logger.error("Missing columns in KLA data %s: %s", name, missing_columns)
+                raise KeyError(f"Missing columns in KLA data {name}: {missing_columns}")
+
+        names = list(kla_data)
+        frames = [kla_data[name] for name in names]
+        times = [
+            (df['Time'] - df['Time'].iloc[0]).dt.total_seconds().to_numpy()
+            if len(df) else np.empty(0)
+            for df in frames
+        ]
+        results = estimate_kla(
+            times,
+            [df['spO2'].to_numpy(dtype=float) for df in frames],
+            [df['NStirrer'].to_numpy(dtype=float) for df in frames],
+            [df['FAirIn'].to_numpy(dtype=float) for df in frames],
+            lower_fraction=lower_fraction,
+            upper_fraction=upper_fraction,
+            saturation_points=saturation_points
+        )
+
+        conditions = [parse_kla_conditions(name) for name in names]
+        table = pd.DataFrame({
+            'file': names,
+            'rpm': [rpm for rpm, _ in conditions],
+            'volume': [volume for _, volume in conditions],
+            'kla': results['kla'],
+            'saturation': results['saturation'],
+            'points': results['points'],
+            'r_squared': results['r_squared'],
+        })
+        table['rpm'] = table['rpm'].astype(float).fillna(pd.Series(results['stirrer_speed']))
+        table['volume'] = table['volume'].astype(float)
+
+        failed = table.loc[table['kla'].isna(), 'file'].tolist()
+        if failed:
+            logger.warning("No kLa could be estimated for: %s", failed)
+        logger.info("kLa estimated successfully.")
+        return table.sort_values(['rpm', 'volume'], ignore_index=True)
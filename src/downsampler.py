@@ -0,0 +1,90 @@
+# downsampler.py
+from typing import Any, Tuple
+
+import numpy as np
+
+
+def downsample_minmax(x: Any, y: Any, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a line series to at most max_points points while keeping its visual envelope.
+
+    The samples are split into max_points // 2 consecutive buckets and, for every
+    bucket, the samples holding the minimum and maximum are kept in their original
+    order. Drawn at one bucket per pixel column this is indistinguishable from the
+    full series. Buckets that contain only NaN keep a single NaN so gaps in the
+    line survive.
+
+    :param x: X values (numeric or datetime64), assumed to be sorted.
+    :param y: Y values.
+    :param max_points: Maximum number of points to return; 0 or a series that is
+        already short enough returns the data unchanged.
+    :return: Tuple of the reduced x and y arrays.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    count = len(y)
+    buckets = max_points // 2
+    if max_points <= 0 or count <= max_points or buckets == 0:
+        return x, y
+
+    bucket_size = -(-count // buckets)  # Ceiling division
+    buckets = -(-count // bucket_size)
+    padded = np.full(buckets * bucket_size, np.nan)
+    padded[:count] = y
+    padded = padded.reshape(buckets, bucket_size)
+
+    empty = np.isnan(padded).all(axis=1)
+    offsets = np.arange(buckets) * bucket_size
+    min_index = offsets + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    max_index = offsets + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+
+    # All-NaN buckets keep their first sample (a NaN) once to preserve the gap
+    min_index[empty] = offsets[empty]
+    max_index[empty] = offsets[empty]
+
+    indices = np.sort(np.stack([min_index, max_index], axis=1), axis=1).ravel()
+    keep = np.ones(len(indices), dtype=bool)
+    keep[1:] = indices[1:] != indices[:-1]
+    indices = indices[keep]
+    return x[indices], y[indices]
+
+
+def minmax_rows(x: Any, values: Any, buckets: int) -> np.ndarray:
+    """
+    Select the rows holding the minimum and maximum of every column in equally wide x buckets.
+
+    Like downsample_minmax(), but for several columns sharing one x axis and with
+    buckets of equal x width instead of equal sample counts, so that samples that
+    were already reduced and samples at full resolution count by the x range they
+    span. Rows with a missing x fall into the bucket of the previous row. A bucket
+    in which a column is all missing keeps its first row, so gaps survive.
+
+    :param x: X values (numeric, e.g. elapsed hours), assumed to be sorted; NaN is allowed.
+    :param values: Column values (n, columns), NaN for missing values.
+    :param buckets: Number of x buckets; at most 2 * buckets * columns rows are selected.
+    :return: Increasing row indices.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    count = len(x)
+    values = np.asarray(values, dtype=np.float64).reshape(count, -1)
+    valid = ~np.isnan(x)
+    if count == 0 or buckets <= 0 or not valid.any():
+        return np.arange(count)
+
+    low, high = x[valid].min(), x[valid].max()
+    width = (high - low) / buckets or 1.0
+    ids = np.full(count, -1, dtype=np.int64)
+    ids[valid] = np.minimum(((x[valid] - low) / width).astype(np.int64), buckets - 1)
+    ids = np.maximum.accumulate(ids)  # Missing x: bucket of the previous row
+
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, count]))
+    missing = np.isnan(values)
+    keep = np.zeros(count, dtype=bool)
+    for filled in (np.where(missing, np.inf, values), np.where(missing, np.inf, -values)):
+        extreme = np.minimum.reduceat(filled, starts, axis=0)
+        rows, columns = np.nonzero(filled == extreme[group])
+        # np.nonzero lists the hits by row, so the first hit of a bucket and column is its earliest row
+        _, first = np.unique(group[rows] * values.shape[1] + columns, return_index=True)
+        keep[rows[first]] = True
+    return np.flatnonzero(keep)
@@ -0,0 +1,245 @@
+# instrumentation.py
+import json
+import logging
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# tracemalloc.reset_peak() is only available from Python 3.9 on. Without it, the
+# memory of a stage is measured from the traced memory at its start and end only.
+_RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+
+class _DisabledStage:
+    """Stage handle returned while instrumentation is off; it records nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_DisabledStage':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass  # Ignore 'stage.rows = ...' and similar updates
+
+
+_DISABLED_STAGE = _DisabledStage()
+
+
+class _Stage:
+    """Stage handle that measures one pipeline step."""
+
+    def __init__(self, recorder: 'StageRecorder', name: str, rows: Optional[int],
+                 input_bytes: Optional[int], labels: Dict[str, Any]):
+        self.recorder = recorder
+        self.name = name
+        self.rows = rows
+        self.input_bytes = input_bytes
+        self.labels = labels
+        self.details: Dict[str, Any] = {}
+        self._peak = 0
+        self._start_memory = 0
+
+    def __enter__(self) -> '_Stage':
+        self.recorder._enter_stage(self)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        peak = self.recorder._exit_stage(self)
+        record = {
+            'name': self.name,
+            **self.labels,
+            'seconds': wall,
+            'cpu_seconds': cpu,
+            'rows': self.rows,
+            'rows_per_second': self.rows / wall if self.rows is not None and wall > 0 else None,
+            'peak_memory_mb': peak / 1e6 if peak is not None else None,
+            'status': 'failed' if exc_type is not None else 'success',
+        }
+        if self.input_bytes is not None:
+            record['mb_per_second'] = self.input_bytes / 1e6 / wall if wall > 0 else None
+        if self.details:
+            record['details'] = self.details
+        self.recorder.records.append(record)
+
+
+class StageRecorder:
+    """Records wall time, CPU time, rows and peak memory of pipeline stages.
+
+    Stages are measured with the stage() context manager. While the recorder is
+    disabled it returns a shared no-op object, so instrumented code runs at
+    practically full speed.
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = True):
+        """
+        Initialize the StageRecorder.
+
+        :param enabled: Whether stages are recorded.
+        :param trace_memory: Whether to trace the peak memory of each stage with tracemalloc
+            (Python and NumPy allocations; slows down allocation-heavy stages).
+        """
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.records: List[Dict[str, Any]] = []
+        # Stages entered and not yet left, innermost last
+        self._stage_stack: List[_Stage] = []
+        self._started_tracing = False
+        # Start of the run, for the wall time of the whole run in the report
+        self._wall_start = time.perf_counter()
+
+    @classmethod
+    def from_config(cls, instrumentation_config: Optional[Dict[str, Any]]) -> 'StageRecorder':
+        """
+        Create a recorder from the 'instrumentation' configuration section.
+
+        :param instrumentation_config: Dictionary with 'enabled' and 'trace_memory' (optional).
+        :return: The recorder.
+        """
+        instrumentation_config = instrumentation_config or {}
+        return cls(
+            enabled=instrumentation_config.get('enabled', False),
+            trace_memory=instrumentation_config.get('trace_memory', True)
+        )
+
+    def stage(self, name: str, rows: Optional[int] = None, input_bytes: Optional[int] = None,
+              **labels: Any) -> Any:
+        """
+        Measure a pipeline stage as a context manager.
+
+        The handle's 'rows' attribute may be set inside the block once the number of
+        processed rows is known, and 'details' may hold additional measurements.
+
+        :param name: Stage name.
+        :param rows: Rows processed by the stage (optional).
+        :param input_bytes: Bytes read by the stage, for the MB/s throughput (optional).
+        :param labels: Further fields of the record, e.g. the file name.
+        :return: Context manager yielding the stage handle.
+        """
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return _Stage(self, name, rows, input_bytes, labels)
+
+    def extend(self, records: List[Dict[str, Any]], worker: bool = False) -> None:
+        """
+        Add records measured elsewhere, e.g. in a worker process.
+
+        :param records: Records from another recorder.
+        :param worker: Whether the records were measured in a worker process. They are
+            tagged with 'worker' and counted in 'worker_seconds' instead of the run's time,
+            since workers run concurrently with the main process and with each other.
+        """
+        if not self.enabled:
+            return
+        if worker:
+            records = [{**record, 'worker': True} for record in records]
+        self.records.extend(records)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build the structured run report.
+
+        :return: Dictionary with the creation time, the wall time of the run so far
+            ('total_seconds'), the time of the top-level stages of the main process
+            ('stage_seconds') and of worker processes ('worker_seconds'), and the list
+            of stage records.
+        """
+        top_level = [record for record in self.records if not record.get('nested')]
+        return {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'trace_memory': self.trace_memory,
+            'total_seconds': time.perf_counter() - self._wall_start,
+            'stage_seconds': sum(record['seconds'] for record in top_level if not record.get('worker')),
+            'worker_seconds': sum(record['seconds'] for record in top_level if record.get('worker')),
+            'stages': self.records,
+        }
+
+    def write_report(self, file_path: Path) -> Path:
+        """
+        Write the run report as JSON.
+
+        :param file_path: Path of the JSON file.
+        :return: The file path.
+        """
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, 'w') as file:
+            json.dump(self.report(), file, indent=2, default=str)
+        logger.info("Run report saved to %s", file_path)
+        return file_path
+
+    def summary(self) -> str:
+        """
+        Summarize the stage times in one line, adding up stages with the same name.
+
+        Stages measured in worker processes are listed separately with ' [workers]'.
+
+        :return: Summary such as 'parse 0.21 s, plot 1.30 s, kla_plot [workers] 4.02 s
+            (total 1.60 s, workers 4.02 s)'.
+        """
+        totals: Dict[str, float] = {}
+        for record in self.records:
+            name = f"{record['name']} [workers]" if record.get('worker') else record['name']
+            totals[name] = totals.get(name, 0.0) + record['seconds']
+        parts = ', '.join(f"{name} {seconds:.2f} s" for name, seconds in totals.items())
+        report = self.report()
+        if report['worker_seconds']:
+            return f"{parts} (total {report['total_seconds']:.2f} s, workers {report['worker_seconds']:.2f} s)"
+        return f"{parts} (total {report['total_seconds']:.2f} s)"
+
+    def _enter_stage(self, stage: _Stage) -> None:
+        """
+        Enter a stage: mark it as nested inside an enclosing stage, so that its time is
+        not counted twice in the total, and start tracing its memory.
+
+        An enclosing stage keeps its own memory peak.
+
+        :param stage: Stage being entered.
+        """
+        parent = self._stage_stack[-1] if self._stage_stack else None
+        if parent is not None:
+            stage.labels['nested'] = True
+        self._stage_stack.append(stage)
+        if not self.trace_memory:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if parent is not None:
+            parent._peak = max(parent._peak, peak if _RESET_PEAK else current)
+        if _RESET_PEAK:
+            tracemalloc.reset_peak()
+        stage._start_memory = current
+        stage._peak = current
+
+    def _exit_stage(self, stage: _Stage) -> Optional[int]:
+        """
+        Leave a stage and finish tracing its memory.
+
+        :param stage: Stage being left.
+        :return: Peak traced memory during the stage in bytes, above the memory at its start,
+            or None if memory is not traced.
+        """
+        self._stage_stack.pop()
+        if not self.trace_memory:
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(stage._peak, peak if _RESET_PEAK else current)
+        if self._stage_stack:
+            parent = self._stage_stack[-1]
+            parent._peak = max(parent._peak, peak)
+        elif self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return peak - stage._start_memory
@@ -0,0 +1,137 @@
+# kla_estimator.py
+import re
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Operating conditions in KLA file names, e.g. 'Daten(klA)400rpm 3L'
+_CONDITIONS_PATTERN = re.compile(r'(\d+(?:[.,]\d+)?)[\s_]*rpm[\s_]*(\d+(?:[.,]\d+)?)[\s_]*L', re.IGNORECASE)
+
+
+def parse_kla_conditions(name: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Read the stirrer speed and the volume from a KLA file name.
+
+    :param name: File name or stem, e.g. 'Daten(klA)400rpm 3L.txt'.
+    :return: Tuple of the stirrer speed in rpm and the volume in L; None where not found.
+    """
+    match = _CONDITIONS_PATTERN.search(name)
+    if match is None:
+        return None, None
+    rpm, volume = (float(value.replace(',', '.')) for value in match.groups())
+    return rpm, volume
+
+
+def stack_series(series: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Stack series of different lengths into one NaN-padded 2-D array.
+
+    :param series: One 1-D array per run.
+    :return: Float array of shape (runs, longest run).
+    """
+    width = max((len(values) for values in series), default=0)
+    stacked = np.full((len(series), width), np.nan)
+    for row, values in enumerate(series):
+        stacked[row, :len(values)] = values
+    return stacked
+
+
+def estimate_kla(
+    times: Sequence[np.ndarray],
+    dissolved_oxygen: Sequence[np.ndarray],
+    stirrer_speed: Sequence[np.ndarray],
+    air_flow: Sequence[np.ndarray],
+    lower_fraction: float = 0.1,
+    upper_fraction: float = 0.8,
+    saturation_points: int = 5
+) -> Dict[str, np.ndarray]:
+    """
+    Estimate kLa of several runs with the dynamic gassing-in method in one batched solve.
+
+    For every run the re-aeration step is the last sample at which aeration (air flow
+    and stirrer on) starts; the aeration phase lasts from there until aeration stops
+    or the run ends. The saturation concentration C* is the mean of the last
+    saturation_points samples of that phase. ln(C* - C) is fitted against time by
+    least squares over the samples between lower_fraction and upper_fraction of C*,
+    which skips the probe lag right after the step and the noise near saturation.
+    The slope is -kLa. All runs are padded into 2-D arrays and fitted together with
+    the closed-form least-squares solution.
+
+    :param times: Sample times in seconds, one array per run.
+    :param dissolved_oxygen: Dissolved oxygen (spO2) in %, one array per run.
+    :param stirrer_speed: Stirrer speed, one array per run.
+    :param air_flow: Air flow, one array per run.
+    :param lower_fraction: Lower bound of the fitted range as a fraction of C*.
+    :param upper_fraction: Upper bound of the fitted range as a fraction of C*.
+    :param saturation_points: Number of final aeration samples averaged into C*.
+    :return: Dictionary of per-run arrays: 'kla' (1/h), 'saturation' (C* in %), 'points'
+        (samples in the fit), 'r_squared', 'step_time' (s) and 'stirrer_speed' (median
+        during the fit). Runs without a re-aeration step or with fewer than three fitted
+        samples get NaN.
+    """
+    if not 0 <= lower_fraction < upper_fraction < 1:
+        raise ValueError("The fit range must satisfy 0 <= lower_fraction < upper_fraction < 1.")
+
+    t = stack_series(times)
+    c = stack_series(dissolved_oxygen)
+    n = stack_series(stirrer_speed)
+    a = stack_series(air_flow)
+    runs, width = c.shape
+    nan = np.full(runs, np.nan)
+    if width == 0:
+        return {
+            'kla': nan, 'saturation': nan, 'points': np.zeros(runs, dtype=int),
+            'r_squared': nan, 'step_time': nan, 'stirrer_speed': nan,
+        }
+    columns = np.arange(width)
+    rows = np.arange(runs)
+
+    valid = ~np.isnan(t) & ~np.isnan(c)
+    aerating = valid & (np.nan_to_num(a) > 0) & (np.nan_to_num(n) > 0)
+
+    # Last rising edge of the aeration flag
+    edge = aerating.copy()
+    edge[:, 1:] &= ~aerating[:, :-1]
+    has_step = edge.any(axis=1)
+    step = width - 1 - np.argmax(edge[:, ::-1], axis=1)
+
+    # The phase ends at the first sample after the step without aeration
+    stopped = ~aerating & (columns >= step[:, None])
+    end = np.where(stopped.any(axis=1), np.argmax(stopped, axis=1), width)
+    phase = has_step[:, None] & (columns >= step[:, None]) & (columns < end[:, None])
+
+    plateau = phase & (columns >= (end - saturation_points)[:, None])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        saturation = np.where(plateau, c, 0.0).sum(axis=1) / plateau.sum(axis=1)
+
+        fit = phase & (c >= lower_fraction * saturation[:, None]) & (c <= upper_fraction * saturation[:, None])
+        step_time = t[rows, step]
+        x = np.where(fit, t - step_time[:, None], 0.0)
+        y = np.where(fit, np.log(np.where(fit, saturation[:, None] - c, 1.0)), 0.0)
+
+        # Closed-form least squares for all runs at once
+        points = fit.sum(axis=1)
+        sum_x, sum_y = x.sum(axis=1), y.sum(axis=1)
+        sum_xx, sum_xy = (x * x).sum(axis=1), (x * y).sum(axis=1)
+        denominator = points * sum_xx - sum_x ** 2
+        slope = (points * sum_xy - sum_x * sum_y) / denominator
+        intercept = (sum_y - slope * sum_x) / points
+
+        residuals = np.where(fit, y - (intercept[:, None] + slope[:, None] * x), 0.0)
+        deviations = np.where(fit, y - (sum_y / points)[:, None], 0.0)
+        r_squared = 1 - (residuals ** 2).sum(axis=1) / (deviations ** 2).sum(axis=1)
+
+    usable = has_step & (points >= 3) & (denominator > 0)
+    fitted_speed = np.where(fit, n, np.nan)
+    stirrer = np.full(runs, np.nan)
+    if usable.any():
+        stirrer[usable] = np.nanmedian(fitted_speed[usable], axis=1)
+
+    return {
+        'kla': np.where(usable, -slope * 3600, nan),
+        'saturation': np.where(has_step, saturation, nan),
+        'points': points,
+        'r_squared': np.where(usable, r_squared, nan),
+        'step_time': np.where(has_step, step_time, nan),
+        'stirrer_speed': stirrer,
+    }
@@ -0,0 +1,161 @@
+# kla_header.py
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Layout of the timestamps in the 'Time' column and in the metadata block of a KLA export
+KLA_TIME_FORMAT = '%d.%m.%Y %H:%M:%S'
+
+# Resolution of the exported timestamps; the arithmetic index is truncated to it
+KLA_TIME_RESOLUTION = 'datetime64[s]'
+
+# Positions of the 'DD.MM.YYYY HH:MM:SS' characters in numpy's 'YYYY-MM-DDTHH:MM:SS'
+_ISO_TO_KLA = [8, 9, 7, 5, 6, 7, 0, 1, 2, 3, 10, 11, 12, 13, 14, 15, 16, 17, 18]
+
+
+def _format_kla_times(index: np.ndarray) -> np.ndarray:
+    """
+    Format timestamps like the 'Time' column of a KLA export ('13.10.2024 14:15:50').
+
+    :param index: datetime64 array.
+    :return: Array of strings.
+    """
+    iso = np.datetime_as_string(index, unit='s').astype('S19')
+    chars = iso.view(np.uint8).reshape(len(iso), 19)[:, _ISO_TO_KLA]
+    chars[:, [2, 5]] = ord('.')
+    chars[:, 10] = ord(' ')
+    return np.ascontiguousarray(chars).view('S19').ravel().astype('U19')
+
+
+def _parse_kla_times(values: Sequence[str]) -> np.ndarray:
+    """
+    Parse KLA timestamps such as '13.10.2024 14:15:50'.
+
+    :param values: Timestamp strings; runs of spaces are allowed between date and time.
+    :return: datetime64[ns] array, NaT for unparsable entries.
+    """
+    strings = pd.Series(values, dtype=object).str.split().str.join(' ')
+    return pd.to_datetime(strings, format=KLA_TIME_FORMAT, errors='coerce').to_numpy(dtype='datetime64[ns]')
+
+
+class KlaHeader:
+    """Metadata block at the top of a KLA export."""
+
+    def __init__(self, metadata: Dict[str, List[str]]):
+        """
+        Initialize the KlaHeader.
+
+        :param metadata: Values of every metadata entry, keyed by entry name
+            (e.g. {'Measurement start': ['13.10.2024  14:15:50'], 'Mean time': ['5.000']}).
+        """
+        self.metadata = metadata
+        self.start = self._timestamp('Measurement start')
+        self.finish = self._timestamp('Measurement finish')
+        self.interval = self._seconds('Mean time')
+
+    def _timestamp(self, name: str) -> Optional[np.datetime64]:
+        """
+        Parse the first value of a metadata entry as a timestamp.
+
+        :param name: Entry name.
+        :return: The timestamp, or None if the entry is missing or unparsable.
+        """
+        values = self.metadata.get(name)
+        if not values:
+            return None
+        timestamp = _parse_kla_times(values[:1])[0]
+        return None if np.isnat(timestamp) else timestamp
+
+    def _seconds(self, name: str) -> Optional[float]:
+        """
+        Parse the first value of a metadata entry as a positive number of seconds.
+
+        :param name: Entry name.
+        :return: The seconds, or None if the entry is missing, unparsable or not positive.
+        """
+        values = self.metadata.get(name)
+        try:
+            seconds = float(values[0].replace(',', '.')) if values else np.nan
+        except ValueError:
+            return None
+        return seconds if np.isfinite(seconds) and seconds > 0 else None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds between measurement start and finish, or None if either is missing."""
+        if self.start is None or self.finish is None:
+            return None
+        return (self.finish - self.start) / np.timedelta64(1, 's')
+
+    def time_index(self, rows: int) -> Optional[np.ndarray]:
+        """
+        Timestamps of regularly sampled rows, computed from the start and the mean sampling interval.
+
+        The timestamps are truncated to whole seconds like the exported ones, so an
+        interval of 2.5 s gives steps of 2 and 3 seconds.
+
+        :param rows: Number of data rows.
+        :return: datetime64[ns] array, or None if the start or the interval is missing.
+        """
+        if self.start is None or self.interval is None:
+            return None
+        offsets = np.round(np.arange(rows) * self.interval * 1e9).astype(np.int64).astype('timedelta64[ns]')
+        return (self.start + offsets).astype(KLA_TIME_RESOLUTION).astype('datetime64[ns]')
+
+    def __repr__(self) -> str:
+        return f"KlaHeader(start={self.start}, finish={self.finish}, interval={self.interval})"
+
+
+def parse_kla_header(lines: Iterable[str], delimiter: str = ';') -> KlaHeader:
+    """
+    Parse the metadata block of a KLA export, i.e. the lines before the 'Time' header.
+
+    A field ending in ':' names an entry whose values are the following fields
+    (';Measurement start:;13.10.2024  14:15:50;'); a field 'Name: value' is an entry
+    by itself ('Project: 240930_BioRefineryTrainer'). Other fields are ignored.
+
+    :param lines: Lines of the metadata block.
+    :param delimiter: Field delimiter.
+    :return: The parsed header.
+    """
+    metadata: Dict[str, List[str]] = {}
+    for line in lines:
+        fields = [field.strip() for field in line.lstrip('\ufeff').split(delimiter)]
+        for position, field in enumerate(fields):
+            if field.endswith(':'):
+                metadata[field[:-1].strip()] = [value for value in fields[position + 1:] if value]
+                break
+            name, separator, value = field.partition(': ')
+            if separator and name:
+                metadata[name.strip()] = [value.strip()]
+    return KlaHeader(metadata)
+
+
+def kla_time_index(times: Sequence[str], header: Optional[KlaHeader]) -> np.ndarray:
+    """
+    Build the time index of the rows of a KLA export.
+
+    If the header gives the start and the sampling interval, the index is computed
+    from them and formatted back into strings, and every row is compared with its
+    string in one vectorized pass. Only rows that differ (a gap, a malformed or
+    reordered row, extra spaces) are parsed, so the result always equals parsing
+    every row. Without the metadata every row is parsed.
+
+    :param times: Strings of the 'Time' column.
+    :param header: Metadata of the export (optional).
+    :return: datetime64[ns] array, NaT for unparsable entries.
+    """
+    index = header.time_index(len(times)) if header is not None else None
+    if index is None or not len(times):
+        return _parse_kla_times(times)
+    strings = np.asarray(times, dtype=str)
+    mismatched = np.flatnonzero(strings != _format_kla_times(index))
+    if len(mismatched):
+        logger.info("%s of %s KLA timestamps differ from the regular time index; parsing them.",
+                    len(mismatched), len(times))
+        index[mismatched] = _parse_kla_times(strings[mismatched])
+    return index
@@ -0,0 +1,191 @@
+# logging_setup.py
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Queue between the QueueHandler of every process and the listener of the main process
+_log_queue: Optional[Any] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+# Handlers added to the root logger by setup_logging(), and the rate limit of the debug records
+_root_handlers: List[logging.Handler] = []
+_rate_limit: Tuple[float, int] = (1.0, 10)
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets through at most 'burst' records per message and 'interval' seconds at or below a level.
+
+    Records are grouped by logger and unformatted message, so a debug message logged
+    for every chunk or file counts as one message. The first record let through after
+    a suppressed period reports how many records were dropped.
+    """
+
+    def __init__(self, interval: float = 1.0, burst: int = 10, level: int = logging.DEBUG):
+        """
+        Initialize the RateLimitFilter.
+
+        :param interval: Length of a rate-limit window in seconds.
+        :param burst: Records of one message let through per window.
+        :param level: Highest level that is rate-limited.
+        """
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.level = level
+        # (logger name, message) -> [window start, records in the window, records suppressed]
+        self._windows: Dict[Tuple[str, Any], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault((record.name, record.msg), [now, 0, 0])
+            if now - window[0] >= self.interval:
+                window[0], window[1] = now, 0
+            if window[1] >= self.burst:
+                window[2] += 1
+                return False
+            window[1] += 1
+            suppressed, window[2] = window[2], 0
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+            record.args = None
+        return True
+
+
+def _build_handlers(logging_config: Dict[str, Any], formatter: logging.Formatter) -> List[logging.Handler]:
+    """
+    Create the handlers listed in the logging configuration.
+
+    :param logging_config: Dictionary containing logging configuration.
+    :param formatter: Formatter of every handler.
+    :return: The handlers.
+    """
+    handlers = []
+    for handler in logging_config.get('handlers', []):
+        if handler.get('type') == 'stream':
+            handlers.append(logging.StreamHandler())
+        elif handler.get('type') == 'file':
+            filename = handler.get('filename', 'application.log')
+
+            # Ensure the directory for the log file exists
+            log_dir = os.path.dirname(filename)
+            if log_dir and not os.path.exists(log_dir):
+                os.makedirs(log_dir)
+
+            handlers.append(logging.FileHandler(filename))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging(logging_config: Dict[str, Any]) -> None:
+    """
+    Configure logging based on the provided configuration.
+
+    Records are put on a queue by a QueueHandler on the root logger and written by
+    the configured handlers in a background QueueListener thread, so logging calls do
+    not wait for the console or the disk. Debug records are rate-limited per message
+    ('debug_rate_limit'). The queue is a multiprocessing queue: worker processes send
+    their records to the same listener (see configure_worker_logging()). With
+    'queue: false' the handlers are attached directly to the root logger instead.
+
+    :param logging_config: Dictionary containing logging configuration.
+    """
+    global _log_queue, _listener, _rate_limit
+    logging_config = logging_config or {}
+    level_str = logging_config.get('level', 'INFO').upper()
+    level = getattr(logging, level_str, logging.INFO)
+    format_str = logging_config.get('format', '%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+    rate_limit = logging_config.get('debug_rate_limit') or {}
+
+    stop_logging()
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    handlers = _build_handlers(logging_config, logging.Formatter(format_str))
+    _rate_limit = (rate_limit.get('interval', 1.0), rate_limit.get('burst', 10))
+    if not logging_config.get('queue', True):
+        for handler in handlers:
+            handler.addFilter(RateLimitFilter(*_rate_limit))
+            _add_root_handler(handler)
+        return
+
+    _log_queue = multiprocessing.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(_log_queue)
+    queue_handler.addFilter(RateLimitFilter(*_rate_limit))
+    _add_root_handler(queue_handler)
+    _listener = logging.handlers.QueueListener(_log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _add_root_handler(handler: logging.Handler) -> None:
+    """
+    Add a handler to the root logger and remember it for stop_logging().
+
+    :param handler: Handler to add.
+    """
+    logging.getLogger().addHandler(handler)
+    _root_handlers.append(handler)
+
+
+def stop_logging() -> None:
+    """
+    Remove the handlers of setup_logging() and stop the listener after writing every queued record.
+    """
+    global _log_queue, _listener
+    root = logging.getLogger()
+    for handler in _root_handlers:
+        root.removeHandler(handler)
+        handler.close()
+    _root_handlers.clear()
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _log_queue.close()
+    _log_queue.join_thread()
+    _listener = None
+    _log_queue = None
+
+
+def worker_logging_args() -> Tuple[Optional[Any], int, float, int]:
+    """
+    Arguments for configure_worker_logging() in a worker process.
+
+    :return: Tuple of the log queue (None if logging is not queued), the root level and the debug rate limit.
+    """
+    return (_log_queue, logging.getLogger().level) + _rate_limit
+
+
+def configure_worker_logging(log_queue: Optional[Any], level: int, interval: float = 1.0, burst: int = 10) -> None:
+    """
+    Send the records of a worker process to the listener of the main process.
+
+    The handlers inherited from the main process are removed, so a forked worker does
+    not write to the log file itself.
+
+    :param log_queue: Queue returned by worker_logging_args() in the main process (None leaves logging as it is).
+    :param level: Root logger level.
+    :param interval: Rate-limit window of the debug records in seconds.
+    :param burst: Debug records of one message let through per window.
+    """
+    if log_queue is None:
+        return
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(interval, burst))
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+
+atexit.register(stop_logging)
@@ -1,129 +1,550 @@
 # main.py
+import argparse
+import importlib
 import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Any, Dict
+from typing import TYPE_CHECKING, Optional, Any, Dict, List
 import os
+import time
 
+# Only lightweight modules are imported here; pandas, the data modules and matplotlib
+# are imported by the commands that need them (see COMMAND_MODULES).
 from config_loader import ConfigLoader
-from data_loader import DataLoader
-from data_processor import DataProcessor
-from plotter import Plotter
+from instrumentation import StageRecorder
+from logging_setup import configure_worker_logging, setup_logging, worker_logging_args
 
+if TYPE_CHECKING:
+    import pandas as pd
+    from data_processor import DataProcessor
+    from plotter import Plotter
 
-def setup_logging(logging_config: Dict[str, Any]) -> None:
+# Modules each command imports, in import order
+COMMAND_MODULES = {
+    'load': ['data_loader'],
+    'process': ['data_loader', 'data_processor'],
+    'plot': ['data_loader', 'data_processor', 'plotter'],
+    'kla': ['data_loader', 'data_processor', 'plotter'],
+    'all': ['data_loader', 'data_processor', 'plotter'],
+}
+
+
+logger = logging.getLogger(__name__)
+
+
+def import_modules(modules: List[str]) -> Dict[str, float]:
     """
-    Configure logging based on the provided configuration.
+    Import modules and measure how long each import takes.
+
+    Modules that are already imported, e.g. as a dependency of an earlier one, take
+    practically no time.
 
-    :param logging_config: Dictionary containing logging configuration.
+    :param modules: Module names.
+    :return: Seconds per module.
     """
-    level_str = logging_config.get('level', 'INFO').upper()
-    level = getattr(logging, level_str, logging.INFO)
-    format_str = logging_config.get('format', '%(asctime)s [%(levelname)s] %(name)s: %(message)s')
-
-    handlers = []
-    for handler in logging_config.get('handlers', []):
-        if handler.get('type') == 'stream':
-            handlers.append(logging.StreamHandler())
-        elif handler.get('type') == 'file':
-            filename = handler.get('filename', 'application.log')
-
-            # Ensure the directory for the log file exists
-            log_dir = os.path.dirname(filename)
-            if log_dir and not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-
-            handlers.append(logging.FileHandler(filename))
-
-    logging.basicConfig(
-        level=level,
-        format=format_str,
-        handlers=handlers
-    )
+    timings = {}
+    for module in modules:
+        start = time.perf_counter()
+        importlib.import_module(module)
+        timings[module] = time.perf_counter() - start
+    return timings
 
 
-logger = logging.getLogger(__name__)
+def _row_count(data: Optional['pd.DataFrame']) -> Optional[int]:
+    """
+    Number of rows of a DataFrame for the stage records.
+
+    :param data: DataFrame or None.
+    :return: Row count, or None if there is no data.
+    """
+    return len(data) if data is not None else None
 
 
 class MainApp:
     """Main application class to orchestrate data loading, processing, and plotting."""
 
-    def __init__(self, config: ConfigLoader, project_root: Path):
+    def __init__(self, config: ConfigLoader, project_root: Path, use_cache: bool = True,
+                 recorder: Optional[StageRecorder] = None):
         """
         Initialize the MainApp with configuration settings and project root.
 
         :param config: Instance of ConfigLoader containing configuration parameters.
         :param project_root: Path object representing the project root directory.
+        :param use_cache: Whether the parsed-data cache may be used (if enabled in the configuration).
+        :param recorder: StageRecorder measuring the pipeline stages (optional; created from the
+            'instrumentation' configuration by default).
         """
-        self.config = config
-        self.data_loader = DataLoader(config, project_root)
-        self.data_processor: Optional[DataProcessor] = None
-        self.plotter: Optional[Plotter] = None
+        from data_loader import DataLoader
 
-    def run(self) -> None:
+        self.config = config
+        self.project_root = project_root
+        self.recorder = recorder if recorder is not None else StageRecorder.from_config(config.get('instrumentation'))
+        self.data_loader = DataLoader(config, project_root, use_cache=use_cache, recorder=self.recorder)
+        self.data_processor: Optional['DataProcessor'] = None
+        self.plotter: Optional['Plotter'] = None
+        # Shared by all KLA files, so that the KLA plot template is built only once
+        self.kla_plotter: Optional['Plotter'] = None
+        # Preprocessed KLA data of the files handled by run_kla_workflow(), reused by run_kla_estimation()
+        self.kla_frames: Dict[Path, 'pd.DataFrame'] = {}
+
+    def load(self) -> None:
         """
-        Execute the main workflow: load data, process it, and generate plots.
+        Load the offline and online data and set up the data processor.
+
+        In chunked mode the online file is streamed in bounded-memory chunks into the
+        data processor; otherwise both files are loaded and converted (from the cache
+        if enabled and up to date). Errors are logged by the loader and raised.
         """
-        logger.info("Starting main workflow.")
-        try:
-            # Step 1: Load and process data
-            self.data_loader.load_data()
-            self.data_loader.process_online_time_column()
-            online_numeric_columns = self.config.get('data_processor', 'online_numeric_columns', [])
-            self.data_loader.convert_columns_to_numeric(
-                online_numeric_columns,
-                dataset='online'
+        from data_processor import DataProcessor, ONLINE_SUMMARY_ROWS
+
+        online_numeric_columns = self.config.get('data_processor', 'online_numeric_columns', [])
+        loader_config = self.config.get('data_loader') or {}
+        chunk_size = loader_config.get('chunk_size')
+        recorder = self.recorder
+        if chunk_size:
+            # Stream the online file in bounded-memory chunks and reduce them
+            with recorder.stage('load_offline'):
+                self.data_loader.load_offline_data()
+            self.data_processor = DataProcessor(
+                offline_data=self.data_loader.offline_data,
+                online_data=None
             )
-
-            # Step 2: Initialize data processor and extract data
+            with recorder.stage('stream_online') as stage:
+                self.data_processor.consume_online_chunks(
+                    self.data_loader.iter_online_chunks(chunk_size, online_numeric_columns),
+                    max_rows=loader_config.get('summary_rows') or ONLINE_SUMMARY_ROWS
+                )
+                stage.rows = _row_count(self.data_processor.online_data)
+        else:
+            self.data_loader.load_processed_data(online_numeric_columns)
+            # The derived series are computed when they are first used
             self.data_processor = DataProcessor(
                 offline_data=self.data_loader.offline_data,
                 online_data=self.data_loader.online_data
             )
+
+    def validate(self) -> List[str]:
+        """
+        Load the data and check it against the configuration, without processing or plotting.
+
+        :return: Problems found, e.g. missing or empty online columns; empty if the data is usable.
+        """
+        self.load()
+        online_data = self.data_processor.online_data
+        offline_data = self.data_processor.offline_data
+        problems = []
+        for name, data in [('offline', offline_data), ('online', online_data)]:
+            if data is None or data.empty:
+                problems.append(f"The {name} data is empty.")
+            else:
+                logger.info("%s data: %s rows, %s columns.", name.capitalize(), len(data), len(data.columns))
+        if online_data is not None and not online_data.empty:
+            for column in self.config.get('data_processor', 'online_numeric_columns', []):
+                if column not in online_data.columns:
+                    problems.append(f"Online column '{column}' is missing.")
+                elif online_data[column].isna().all():
+                    problems.append(f"Online column '{column}' has no valid values.")
+            if 'elapsed_hours' in online_data.columns:
+                hours = online_data['elapsed_hours']
+                logger.info("Online data covers %.2f to %.2f h.", hours.min(), hours.max())
+        for problem in problems:
+            logger.warning(problem)
+        return problems
+
+    def process(self) -> None:
+        """
+        Load the data and compute all derived series of the data processor, without plotting.
+        """
+        self.load()
+        with self.recorder.stage('process', rows=_row_count(self.data_processor.online_data)):
             self.data_processor.extract_offline_columns()
             self.data_processor.calculate_feed_time()
             self.data_processor.get_valid_masks()
+        logger.info("All derived series computed successfully.")
+
+    def run(self) -> bool:
+        """
+        Execute the main workflow: load data, process it, and generate plots.
+
+        Errors are logged rather than raised, so that a following KLA batch still runs.
+
+        :return: True if the workflow completed, False if it failed.
+        """
+        from plotter import Plotter
+
+        logger.info("Starting main workflow.")
+        try:
+            # Step 1/2: Load the data and set up the data processor
+            self.load()
 
             # Step 3: Initialize plotter with plot_dir and generate plots
+            recorder = self.recorder
             plotter_config = self.config.get('plotter')
             self.plotter = Plotter(
                 processor=self.data_processor,
                 config=plotter_config
             )
-            self.plotter.plot_data()
+            with recorder.stage('plot', rows=_row_count(self.data_processor.online_data)) as stage:
+                self.plotter.plot_data()
+                stage.details = dict(self.plotter.render_timings)
 
             logger.info("Main workflow completed successfully.")
+            return True
         except Exception as e:
-            logger.error(f"An error occurred during the main workflow: {e}")
+            logger.error("An error occurred during the main workflow: %s", e)
+            return False
+
+    def follow(self, poll_interval: float, max_polls: Optional[int] = None) -> None:
+        """
+        Follow the online file while it is being written and refresh the plot after each poll.
+
+        Every poll parses only the rows appended since the previous poll and updates the
+        derived series incrementally. The plot is rewritten to a fixed file name.
 
-    def run_kla_workflow(self, kla_file: Path) -> None:
+        :param poll_interval: Seconds to wait between polls.
+        :param max_polls: Stop after this many polls (optional; default is to run until interrupted).
+        """
+        from data_processor import DataProcessor
+        from plotter import Plotter
+
+        logger.info("Following %s every %s s.", self.data_loader.online_file, poll_interval)
+        online_numeric_columns = self.config.get('data_processor', 'online_numeric_columns', [])
+        self.data_loader.load_offline_data()
+        self.data_processor = DataProcessor(
+            offline_data=self.data_loader.offline_data,
+            online_data=None
+        )
+        self.plotter = Plotter(
+            processor=self.data_processor,
+            config=self.config.get('plotter')
+        )
+
+        polls = 0
+        try:
+            while True:
+                new_rows = self.data_loader.poll_online_data(online_numeric_columns)
+                if len(new_rows):
+                    self.data_processor.append_online_data(self.data_loader.online_data, len(new_rows))
+                    self.plotter.plot_data(filename='main_culture_simulation_live.png', show=False)
+                polls += 1
+                if max_polls is not None and polls >= max_polls:
+                    break
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            logger.info("Stopped following the online file.")
+
+    def run_kla_workflow(self, kla_file: Path, content: Optional[bytes] = None, show: bool = True) -> Dict[str, Any]:
         """
         Execute the KLA workflow: load KLA data, preprocess it, and generate plots.
 
+        The preprocessed data is kept in kla_frames for run_kla_estimation().
+
         :param kla_file: Path to the KLA data file.
+        :param content: Content of the file, already read by DataLoader.fetch_files() (optional).
+        :param show: Whether to display the plot after saving it.
+        :return: Summary of the run with the file name, status, row count, plot path and error.
         """
-        logger.info(f"Starting KLA workflow for file: {kla_file.name}")
+        from data_processor import DataProcessor
+        from plotter import Plotter
+
+        logger.info("Starting KLA workflow for file: %s", kla_file.name)
+        summary: Dict[str, Any] = {'file': kla_file.name, 'status': 'failed', 'rows': 0, 'plot': None, 'error': None}
         try:
+            recorder = self.recorder
             # Step 1: Load KLA data
-            kla_data = self.data_loader.load_kla_data(str(kla_file))
+            if content is not None:
+                input_bytes = len(content)
+            else:
+                input_bytes = kla_file.stat().st_size if recorder.enabled and kla_file.exists() else None
+            with recorder.stage('kla_load', input_bytes=input_bytes, file=kla_file.name) as stage:
+                if content is not None:
+                    kla_data = self.data_loader.load_kla_data(str(kla_file), content=content)
+                else:
+                    kla_data = self.data_loader.load_kla_data(str(kla_file))
+                stage.rows = _row_count(kla_data)
 
             # Step 2: Preprocess the KLA data
             # For KLA data, we don't need offline/online data
             kla_processor = DataProcessor(offline_data=None, online_data=None)
-            kla_data = kla_processor.preprocess_kla_data(kla_data)
+            with recorder.stage('kla_preprocess', rows=_row_count(kla_data), file=kla_file.name):
+                kla_data = kla_processor.preprocess_kla_data(kla_data)
+            summary['rows'] = len(kla_data)
+            self.kla_frames[kla_file] = kla_data
+
+            # Step 3: Initialize plotter with plot_dir (once) and plot KLA data
+            if self.kla_plotter is None:
+                plotter_config = self.config.get('plotter')
+                self.kla_plotter = Plotter(
+                    config=plotter_config
+                )
+            with recorder.stage('kla_plot', rows=_row_count(kla_data), file=kla_file.name) as stage:
+                plot_filename = self.kla_plotter.plot_kla_data(kla_data, kla_filename=kla_file.stem, show=show)
+                stage.details = dict(self.kla_plotter.render_timings)
+            summary['plot'] = str(plot_filename) if plot_filename is not None else None
+            summary['status'] = 'success'
+
+            logger.info("KLA workflow completed successfully for file: %s", kla_file.name)
+        except Exception as e:
+            summary['error'] = str(e)
+            logger.error("An error occurred during the KLA workflow for file %s: %s", kla_file.name, e)
+        return summary
 
-            # Step 3: Initialize plotter with plot_dir and plot KLA data
-            plotter_config = self.config.get('plotter')
-            kla_plotter = Plotter(
-                config=plotter_config
+    def run_kla_batch(self, kla_files: List[Path], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run the KLA workflow for several files, spread across a pool of worker processes.
+
+        Each file is loaded, preprocessed and plotted in its own task, so an error in
+        one file does not affect the others. The plots are saved but not shown, so
+        the KLA plot template is built once and reused for every file.
+
+        :param kla_files: Paths to the KLA data files.
+        :param workers: Number of worker processes. None or 0 uses every CPU core; 1 runs sequentially.
+        :return: One summary per file, in the order of kla_files.
+        """
+        workers = min(workers or os.cpu_count() or 1, len(kla_files)) if kla_files else 1
+        logger.info("Processing %s KLA files with %s worker(s).", len(kla_files), workers)
+
+        if workers <= 1:
+            # Read ahead: later files are read while the current one is processed
+            summaries = [
+                self.run_kla_workflow(kla_file, content=content, show=False) if content is not None
+                else self.run_kla_workflow(kla_file, show=False)
+                for _, kla_file, content in self.data_loader.fetch_files(kla_files, ordered=True)
+            ]
+            if self.kla_plotter is not None:
+                self.kla_plotter.close()
+        else:
+            results: Dict[Path, Dict[str, Any]] = {}
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_kla_worker, initargs=worker_logging_args()
+            ) as executor:
+                instrumentation = {'enabled': self.recorder.enabled, 'trace_memory': self.recorder.trace_memory}
+                futures = {
+                    executor.submit(_run_kla_file, self.config, self.project_root, kla_file, instrumentation): kla_file
+                    for kla_file in kla_files
+                }
+                for future in as_completed(futures):
+                    kla_file = futures[future]
+                    try:
+                        results[kla_file] = future.result()
+                        # Stage records and preprocessed data from the worker process
+                        self.recorder.extend(results[kla_file].pop('stages', []), worker=True)
+                        kla_data = results[kla_file].pop('data', None)
+                        if kla_data is not None:
+                            self.kla_frames[kla_file] = kla_data
+                    except Exception as e:
+                        logger.error("KLA worker failed for file %s: %s", kla_file.name, e)
+                        results[kla_file] = {
+                            'file': kla_file.name, 'status': 'failed', 'rows': 0, 'plot': None, 'error': str(e)
+                        }
+            summaries = [results[kla_file] for kla_file in kla_files]
+
+        failed = [summary['file'] for summary in summaries if summary['status'] != 'success']
+        logger.info("KLA batch finished: %s succeeded, %s failed.", len(summaries) - len(failed), len(failed))
+        for summary in summaries:
+            logger.info(
+                "  %s: %s, %s rows%s", summary['file'], summary['status'], summary['rows'],
+                ", error: " + summary['error'] if summary['error'] else ''
             )
-            kla_plotter.plot_kla_data(kla_data, kla_filename=kla_file.stem)
+        return summaries
+
+    def run_kla_estimation(self, kla_files: List[Path]) -> Optional['pd.DataFrame']:
+        """
+        Estimate kLa for all KLA files in one batched fit and save the result table.
+
+        Files already preprocessed by run_kla_batch() are taken from kla_frames; only
+        the others are loaded. Files that cannot be loaded are skipped. The table is
+        written as 'kla_results.csv' to the plot directory.
+
+        :param kla_files: Paths to the KLA data files.
+        :return: DataFrame with kLa by rpm and volume, or None if no file could be loaded.
+        """
+        from data_processor import DataProcessor
+
+        logger.info("Starting kLa estimation for %s KLA files.", len(kla_files))
+        kla_processor = DataProcessor(offline_data=None, online_data=None)
+        frames = {kla_file: self.kla_frames[kla_file] for kla_file in kla_files if kla_file in self.kla_frames}
+        missing_files = [kla_file for kla_file in kla_files if kla_file not in frames]
+        for kla_file, raw_data in self.data_loader.load_kla_files(missing_files).items():
+            try:
+                frames[kla_file] = kla_processor.preprocess_kla_data(raw_data)
+            except Exception as e:
+                logger.error("Skipping %s in the kLa estimation: %s", kla_file.name, e)
+        kla_data = {}
+        for kla_file in kla_files:
+            if kla_file in frames:
+                kla_data[kla_file.stem] = frames[kla_file]
+            else:
+                logger.warning("%s is not part of the kLa estimation.", kla_file.name)
+        if not kla_data:
+            logger.warning("No KLA data available for the kLa estimation.")
+            return None
 
-            logger.info(f"KLA workflow completed successfully for file: {kla_file.name}")
+        try:
+            kla_config = self.config.get('data_processor', 'kla', {}) or {}
+            with self.recorder.stage('kla_estimate', rows=sum(len(df) for df in kla_data.values())):
+                results = kla_processor.estimate_kla(
+                    kla_data,
+                    lower_fraction=kla_config.get('lower_fraction', 0.1),
+                    upper_fraction=kla_config.get('upper_fraction', 0.8),
+                    saturation_points=kla_config.get('saturation_points', 5)
+                )
+
+            plot_dir = Path(self.config.get('plotter', 'plot_dir', 'plot'))
+            plot_dir.mkdir(parents=True, exist_ok=True)
+            results_file = plot_dir / 'kla_results.csv'
+            results.to_csv(results_file, index=False)
+            logger.info("kLa results saved to %s", results_file)
+            for row in results.itertuples():
+                logger.info("  %g rpm, %g L: kLa = %.1f 1/h (R^2 = %.3f)", row.rpm, row.volume, row.kla, row.r_squared)
+            return results
         except Exception as e:
-            logger.error(f"An error occurred during the KLA workflow for file {kla_file.name}: {e}")
+            logger.error("An error occurred during the kLa estimation: %s", e)
+            return None
+
+    def write_run_report(self) -> Optional[Path]:
+        """
+        Write the stage measurements of this run as a JSON report and log a one-line summary.
+
+        The report goes to 'report_file' of the 'instrumentation' configuration; the
+        summary line is logged unless 'log_summary' is false. Nothing is written when
+        instrumentation is off.
+
+        :return: Path of the report, or None if instrumentation is off or writing failed.
+        """
+        if not self.recorder.enabled:
+            return None
+        instrumentation_config = self.config.get('instrumentation') or {}
+        if instrumentation_config.get('log_summary', True):
+            logger.info("Run stages: %s", self.recorder.summary())
+        try:
+            return self.recorder.write_report(
+                Path(instrumentation_config.get('report_file', 'run_report.json'))
+            )
+        except OSError as e:
+            logger.error("Could not write the run report: %s", e)
+            return None
+
+
+# MainApp of a KLA worker process, reused for all files the worker handles
+_worker_app: Optional[MainApp] = None
+
+
+def _init_kla_worker(*logging_args: Any) -> None:
+    """
+    Prepare a KLA worker process: log through the main process and render with the
+    non-interactive Agg backend.
+
+    :param logging_args: Result of logging_setup.worker_logging_args() in the main process.
+    """
+    configure_worker_logging(*logging_args)
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def _run_kla_file(config: ConfigLoader, project_root: Path, kla_file: Path,
+                  instrumentation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run the KLA workflow for a single file inside a worker process.
+
+    :param config: Instance of ConfigLoader containing configuration parameters.
+    :param project_root: Path object representing the project root directory.
+    :param kla_file: Path to the KLA data file.
+    :param instrumentation: 'enabled' and 'trace_memory' settings of the parent's StageRecorder (optional).
+    :return: Summary of the run; 'data' holds the preprocessed data (if successful) and, with
+        instrumentation, 'stages' the stage records of this file.
+    """
+    global _worker_app
+    if _worker_app is None:
+        _worker_app = MainApp(config, project_root, recorder=StageRecorder.from_config(instrumentation))
+    recorder = _worker_app.recorder
+    first_record = len(recorder.records)
+    summary = _worker_app.run_kla_workflow(kla_file, show=False)
+    summary['data'] = _worker_app.kla_frames.pop(kla_file, None)
+    if recorder.enabled:
+        summary['stages'] = recorder.records[first_record:]
+        del recorder.records[first_record:]
+    return summary
+
+
+def _add_options(parser: argparse.ArgumentParser, default: Any = None) -> None:
+    """
+    Add the options shared by the main parser and every command.
+
+    :param parser: Parser to add the options to.
+    :param default: Default of the options; argparse.SUPPRESS on the command parsers keeps
+        values given before the command.
+    """
+    def flag_default(value: bool) -> Any:
+        return value if default is None else default
+
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=default,
+        help="Number of worker processes for the KLA files (0 = all cores; overrides 'kla_workers')."
+    )
+    parser.add_argument(
+        '--follow',
+        type=float,
+        metavar='SECONDS',
+        default=default,
+        help='Follow the online file while it is being written, polling every SECONDS, and refresh the plot.'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        default=flag_default(False),
+        help='Parse the data files from text even if the parsed-data cache is enabled.'
+    )
+    parser.add_argument(
+        '--instrument',
+        action='store_true',
+        default=flag_default(False),
+        help="Record the time and memory of every pipeline stage and write the run report "
+             "(overrides 'instrumentation: enabled')."
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command-line arguments.
 
+    Without a command, 'all' is run.
+
+    :param argv: Argument list (defaults to sys.argv[1:]).
+    :return: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description='Load, process and plot offline, online and KLA data.')
+    _add_options(parser)
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    command_help = {
+        'load': 'Load the offline and online data and check them against the configuration.',
+        'process': 'Load the data and compute all derived series, without plotting.',
+        'plot': 'Load, process and plot the offline and online data.',
+        'kla': 'Plot every KLA file and estimate kLa.',
+        'all': "Run 'plot' and then 'kla' (the default).",
+    }
+    for command, help_text in command_help.items():
+        _add_options(
+            commands.add_parser(command, aliases=['validate'] if command == 'load' else [], help=help_text),
+            default=argparse.SUPPRESS
+        )
+    args = parser.parse_args(argv)
+    args.command = 'load' if args.command == 'validate' else args.command or 'all'
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run a command of the command-line interface.
+
+    :param argv: Argument list (defaults to sys.argv[1:]).
+    :return: Exit status: 0 on success, 1 if files are missing, the data is not usable or the main workflow failed.
+    """
+    args = parse_args(argv)
 
-def main():
     # Determine the absolute path to the project root
     script_path = Path(__file__).resolve()
     project_root = script_path.parent.parent  # Adjust based on your project structure
@@ -144,33 +565,69 @@ def main():
     online_file_path = project_root / data_loader_config.get('online_file', '')
     kla_dir_path = project_root / data_loader_config.get('kla_dir', 'data/data(kla)/')
 
-    # Define the plot directory relative to the project root
-    plot_dir_path = project_root / config.get('plotter', 'plot_dir', 'plots')
+    # Check if the required data files exist before proceeding
+    if args.command != 'kla':
+        for file_path in [offline_file_path, online_file_path]:
+            if not file_path.exists():
+                logger.error("Required file not found: %s", file_path.resolve())
+                return 1
+    if args.command in ('kla', 'all') and args.follow is None and not kla_dir_path.is_dir():
+        logger.error("KLA data directory not found: %s", kla_dir_path.resolve())
+        return 1
+
+    recorder = StageRecorder.from_config(config.get('instrumentation'))
+    if args.instrument and not recorder.enabled:
+        recorder = StageRecorder(
+            enabled=True,
+            trace_memory=(config.get('instrumentation') or {}).get('trace_memory', True)
+        )
+
+    # Import what the command needs. The import times go into the run report; they are
+    # measured outside a stage because tracing memory would slow the imports down.
+    modules = COMMAND_MODULES['plot'] if args.follow is not None else COMMAND_MODULES[args.command]
+    timings = import_modules(modules)
+    recorder.extend([{
+        'name': 'import', 'command': args.command, 'seconds': sum(timings.values()), 'status': 'success',
+        'details': timings
+    }])
+    logger.debug("Imported %s", ', '.join(f'{module} ({seconds:.3f} s)' for module, seconds in timings.items()))
 
-    # Check if the main data files exist before proceeding
-    for file_path in [offline_file_path, online_file_path]:
-        if not file_path.is_file():
-            logger.error(f"Required file not found: {file_path.resolve()}")
-            return  # Exit the program if any file is missing
+    # Initialize and run the main application
+    app = MainApp(config, project_root, use_cache=not args.no_cache, recorder=recorder)
+    status = 0
+    if args.follow is not None:
+        app.follow(poll_interval=args.follow)
+        return status
 
-    # Check if the KLA directory exists
-    if not kla_dir_path.is_dir():
-        logger.error(f"KLA data directory not found: {kla_dir_path.resolve()}")
-        return  # Exit the program if KLA directory is missing
+    if args.command == 'load':
+        try:
+            status = 1 if app.validate() else 0
+        except Exception as e:
+            logger.error("Could not load the data: %s", e)
+            status = 1
+    elif args.command == 'process':
+        try:
+            app.process()
+        except Exception as e:
+            logger.error("An error occurred while processing the data: %s", e)
+            status = 1
+    if args.command in ('plot', 'all') and not app.run():
+        status = 1
 
-    # Initialize and run the main application
-    app = MainApp(config, project_root)
-    app.run()
+    if args.command in ('kla', 'all'):
+        # Iterate over all KLA data files and process them
+        kla_files = sorted(kla_dir_path.glob('*.txt'))  # Adjust the pattern if needed
 
-    # Iterate over all KLA data files and process them
-    kla_files = sorted(kla_dir_path.glob('*.txt'))  # Adjust the pattern if needed
+        if not kla_files:
+            logger.warning("No KLA data files found in directory: %s", kla_dir_path.resolve())
+        else:
+            workers = args.jobs if args.jobs is not None else data_loader_config.get('kla_workers', 0)
+            app.run_kla_batch(kla_files, workers=workers)
+            app.run_kla_estimation(kla_files)
 
-    if not kla_files:
-        logger.warning(f"No KLA data files found in directory: {kla_dir_path.resolve()}")
-    else:
-        for kla_file in kla_files:
-            app.run_kla_workflow(kla_file=kla_file)
+    app.write_run_report()
+    return status
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
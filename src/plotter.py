@@ -1,18 +1,54 @@
 # plotter.py
 import logging
+import threading
+import time
 from datetime import datetime, date
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Tuple
 from pathlib import Path
 
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
 import seaborn as sns
 import pandas as pd
 
+from downsampler import downsample_minmax
+
 logger = logging.getLogger(__name__)
 
+# Figures are built concurrently, but matplotlib's text layout (mathtext parsing) is not
+# thread-safe, so laying out and saving figures is serialized.
+_RENDER_LOCK = threading.Lock()
+
+# Columns drawn in the KLA plot and their colors
+KLA_PLOT_COLUMNS = ['spO2', 'sO2', 'sCO2', 'NStirrer', 'FAirIn', 'FO2In']
+KLA_PLOT_COLORS = ['blue', 'green', 'red', 'orange', 'purple', 'brown']
+
+
+def _interactive_backend() -> bool:
+    """
+    Whether the current matplotlib backend opens windows.
+
+    :return: False for non-interactive backends such as Agg, True otherwise.
+    """
+    backend = matplotlib.get_backend().lower()
+    try:
+        from matplotlib.backends import BackendFilter, backend_registry
+        non_interactive = backend_registry.list_builtin(BackendFilter.NON_INTERACTIVE)
+    except ImportError:  # matplotlib < 3.9
+        from matplotlib.rcsetup import non_interactive_bk as non_interactive
+    return backend not in {name.lower() for name in non_interactive}
+
+
 class Plotter:
-    """Class to handle plotting of data."""
+    """Class to handle plotting of data.
+
+    The main-culture and KLA layouts are built once per thread as templates
+    (figure, axes, labels, legends and empty lines). Later renders only swap the
+    line data, rescale the axes and save the figure.
+    """
 
     def __init__(self, processor: Optional['DataProcessor'] = None, config: Optional[Dict[str, Any]] = None):
         """
@@ -28,10 +64,117 @@ class Plotter:
         self.style = plotter_config.get('style', 'darkgrid')
         self.plot_dir = Path(plotter_config.get('plot_dir', 'plot'))
         self.dpi = plotter_config.get('dpi', 300)
+        # Points per line series: None derives it from the figure width, 0 disables downsampling
+        self.max_points = plotter_config.get('max_points')
+        # Headless rendering builds figures on an Agg canvas without pyplot and never shows them
+        self.headless = plotter_config.get('headless', False)
+        # Templates are per thread, so concurrent renders never share a figure
+        self._local = threading.local()
 
         # Ensure the plot directory exists
         self.plot_dir.mkdir(parents=True, exist_ok=True)
 
+        if self.headless:
+            # Apply the style once, so that concurrent renders only read the global rcParams
+            sns.set(style=self.style)
+
+    def _new_figure(self, figsize: Any, nrows: int = 1, **subplot_kwargs: Any) -> Tuple[Any, Any]:
+        """
+        Create a figure and its axes, headless on an Agg canvas or through pyplot.
+
+        :param figsize: Figure size in inches.
+        :param nrows: Number of subplot rows.
+        :param subplot_kwargs: Further arguments for the subplots call.
+        :return: Tuple of the figure and its axes.
+        """
+        if self.headless:
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+            return fig, fig.subplots(nrows, **subplot_kwargs)
+        sns.set(style=self.style)
+        return plt.subplots(nrows, figsize=figsize, **subplot_kwargs)
+
+    @property
+    def render_timings(self) -> Dict[str, float]:
+        """
+        Seconds spent in the build, update and save stages of the last render in the current thread.
+
+        :return: Dictionary mapping stage names to seconds.
+        """
+        if not hasattr(self._local, 'timings'):
+            self._local.timings = {}
+        return self._local.timings
+
+    def _templates(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the templates of the current thread.
+
+        :return: Dictionary mapping layout names to templates.
+        """
+        if not hasattr(self._local, 'templates'):
+            self._local.templates = {}
+        return self._local.templates
+
+    def _get_template(self, name: str) -> Dict[str, Any]:
+        """
+        Return the template for a layout, building it on first use.
+
+        :param name: Layout name, 'main' or 'kla'.
+        :return: Template with the figure, the axes to rescale and the lines by label.
+        """
+        templates = self._templates()
+        template = templates.get(name)
+        if template is None:
+            start = time.perf_counter()
+            template = self._build_main_template() if name == 'main' else self._build_kla_template()
+            subplotpars = template['figure'].subplotpars
+            template['subplotpars'] = {
+                key: getattr(subplotpars, key) for key in ('left', 'bottom', 'right', 'top', 'wspace', 'hspace')
+            }
+            self.render_timings['build'] = time.perf_counter() - start
+            logger.debug("Built the %s plot template in %.3f s.", name, self.render_timings['build'])
+            templates[name] = template
+        else:
+            self.render_timings['build'] = 0.0
+        return template
+
+    def _finish_render(self, name: str, show: bool) -> None:
+        """
+        Optionally show a rendered template (never in headless mode).
+
+        A figure shown in a window is closed and its template discarded, since the
+        window owns it from then on. With a non-interactive backend (e.g. Agg)
+        nothing is shown, and like all other templates it is kept for the next render.
+
+        :param name: Layout name of the rendered template.
+        :param show: Whether to display the figure.
+        """
+        if show and not self.headless:
+            plt.show()
+            if _interactive_backend():
+                self._release_template(name)
+
+    def _release_template(self, name: str) -> None:
+        """
+        Free the figure of a template of the current thread.
+
+        :param name: Layout name of the template.
+        """
+        template = self._templates().pop(name, None)
+        if template is None:
+            return
+        if self.headless:
+            template['figure'].clear()
+        else:
+            plt.close(template['figure'])  # Close the figure to free memory
+
+    def close(self) -> None:
+        """
+        Free the figures of all templates of the current thread.
+        """
+        for name in list(self._templates()):
+            self._release_template(name)
+
     def set_processor(self, processor: 'DataProcessor') -> None:
         """
         Set the DataProcessor instance.
@@ -40,213 +183,286 @@ class Plotter:
         """
         self.processor = processor
 
-    def plot_data(self) -> None:
+    def _downsample(self, x: Any, y: Any, figsize: Any) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Plot the processed offline and online data and save the figure to the plot directory.
+        Reduce a line series to the number of points the figure can show.
+
+        Without an explicit max_points, the target is two points (a minimum and a
+        maximum) per pixel column of the saved figure.
+
+        :param x: X values of the series.
+        :param y: Y values of the series.
+        :param figsize: Figure size in inches of the figure the series is drawn in.
+        :return: Tuple of the reduced x and y arrays.
         """
-        if self.processor is None:
-            logger.error("DataProcessor is not set. Use set_processor() before plotting.")
-            raise ValueError("DataProcessor is not set.")
+        max_points = self.max_points
+        if max_points is None:
+            max_points = 2 * int(figsize[0] * self.dpi)
+        return downsample_minmax(x, y, max_points)
 
-        logger.info("Generating main culture simulation plots.")
-        try:
-            sns.set(style=self.style)
+    @staticmethod
+    def _set_line_data(line: Any, x: Any, y: Any) -> None:
+        """
+        Replace the data of a template line, registering datetime units on first use.
 
-            fig, (ax1, ax2, ax3, ax4) = plt.subplots(
-                4,
-                gridspec_kw={'height_ratios': [1.5, 1.3, 1.3, 1.3]},
-                figsize=self.figsize_main
-            )
+        :param line: Line2D of a template.
+        :param x: New x values.
+        :param y: New y values.
+        """
+        line.axes.xaxis.update_units(x)
+        line.set_data(x, y)
 
-            label_font_size = 18
-            tick_font_size = 14
-            title_font_size = 20
-
-            # Plot 1 - Glucose, Biomass, Ethanol
-            ax1.set_xlim([0, 48])
-            ax1.set_ylim([0, 25])
-            ax1.set_ylabel(r"Glucose / g $\cdot$ L$^{-1}$", fontsize=label_font_size)
-            ax1.tick_params(axis='x', labelsize=tick_font_size)
-            ax1.tick_params(axis='y', labelsize=tick_font_size)
-
-            ax1y2 = ax1.twinx()
-            ax1y2.set_ylim([0, 75])
-            ax1y2.set_ylabel(r"Ethanol, Biomass / g $\cdot$ L$^{-1}$", fontsize=label_font_size)
-            ax1y2.tick_params(axis='y', labelsize=tick_font_size)
-            time_feed_glucose_numeric = np.array(self.processor.time_feed_glucose_numeric)
-            glucose_feed = np.array(self.processor.glucose_feed)
-            valid_feed_glucose_mask = np.array(self.processor.valid_feed_glucose_mask)
-
-            ax1.plot(
-                self.processor.time_glucose,
-                self.processor.glucose,
-                color="#ff9933",
-                marker="o",
-                linestyle="--",
-                linewidth=2,
-                label="Glucose"
-            )
-            ax1y2.plot(
-                self.processor.time_biomass,
-                self.processor.biomass,
-                color="#008b00",
-                marker="^",
-                linestyle="--",
-                linewidth=2,
-                label="Biomass"
-            )
-            ax1y2.plot(
-                self.processor.time_ethanol,
-                self.processor.ethanol,
-                color="#3a5fcd",
-                marker="s",
-                linestyle="--",
-                linewidth=2,
-                label="Ethanol"
-            )
+    def _save_figure(self, template: Dict[str, Any], plot_filename: Path, **layout_kwargs: Any) -> None:
+        """
+        Lay out and save a template's figure, timing it as the save stage.
 
-            # Plot 2 - CO2, O2
-            ax2.set_ylabel(r"CO$_2$ / %", fontsize=label_font_size)
-            ax2y2 = ax2.twinx()
-            ax2y2.set_ylabel(r"O$_2$ / %", fontsize=label_font_size)
-
-            ax2.plot(
-                self.processor.online_data['time'],
-                self.processor.online_data['sCO2'],
-                color="#31BF05",
-                linestyle="-",
-                linewidth=1,
-                label="CO2"
-            )
-            ax2y2.plot(
-                self.processor.online_data['time'],
-                self.processor.online_data['sO2'],
-                color="#36605A",
-                linestyle="-",
-                linewidth=1,
-                label="O2"
-            )
+        :param template: Template whose figure is saved.
+        :param plot_filename: Path of the image file.
+        :param layout_kwargs: Arguments for tight_layout.
+        """
+        start = time.perf_counter()
+        fig = template['figure']
+        # Automatically adjust the layout to avoid overlap, starting from the initial
+        # subplot parameters so that a reused template is laid out like a new one
+        with _RENDER_LOCK:
+            fig.subplots_adjust(**template['subplotpars'])
+            fig.tight_layout(**layout_kwargs)
+            fig.savefig(plot_filename, dpi=self.dpi)
+        self.render_timings['save'] = time.perf_counter() - start
+
+    def _build_main_template(self) -> Dict[str, Any]:
+        """
+        Build the main-culture layout: four rows with twin axes, labels, limits, empty lines and legends.
 
-            # Plot 3 - pO2, Glucose Feed
-            ax3.set_ylabel(r"spO$_2$ / %", fontsize=label_font_size)
-            ax3y2 = ax3.twinx()
-            ax3y2.set_ylabel(r"Glucose Feed / mL $\cdot$ min$^{-1}$", fontsize=label_font_size)
-
-            ax3.plot(
-                self.processor.online_data['time'],
-                self.processor.online_data['spO2'],
-                color="#27ABCF",
-                linestyle="-",
-                linewidth=1,
-                label="spO2"
-            )
-            ax3y2.plot(
+        :return: Template with the figure, the axes to rescale and the lines by label.
+        """
+        fig, (ax1, ax2, ax3, ax4) = self._new_figure(
+            self.figsize_main,
+            4,
+            gridspec_kw={'height_ratios': [1.5, 1.3, 1.3, 1.3]}
+        )
+
+        label_font_size = 18
+        tick_font_size = 14
+        title_font_size = 20
+
+        # Plot 1 - Glucose, Biomass, Ethanol (fixed limits)
+        ax1.set_xlim([0, 48])
+        ax1.set_ylim([0, 25])
+        ax1.set_ylabel(r"Glucose / g $\cdot$ L$^{-1}$", fontsize=label_font_size)
+        ax1.tick_params(axis='x', labelsize=tick_font_size)
+        ax1.tick_params(axis='y', labelsize=tick_font_size)
+
+        ax1y2 = ax1.twinx()
+        ax1y2.set_ylim([0, 75])
+        ax1y2.set_ylabel(r"Ethanol, Biomass / g $\cdot$ L$^{-1}$", fontsize=label_font_size)
+        ax1y2.tick_params(axis='y', labelsize=tick_font_size)
+
+        lines = {}
+        lines['Glucose'] = ax1.plot([], [], color="#ff9933", marker="o", linestyle="--", linewidth=2, label="Glucose")[0]
+        lines['Biomass'] = ax1y2.plot([], [], color="#008b00", marker="^", linestyle="--", linewidth=2, label="Biomass")[0]
+        lines['Ethanol'] = ax1y2.plot([], [], color="#3a5fcd", marker="s", linestyle="--", linewidth=2, label="Ethanol")[0]
+
+        # Plot 2 - CO2, O2
+        ax2.set_ylabel(r"CO$_2$ / %", fontsize=label_font_size)
+        ax2y2 = ax2.twinx()
+        ax2y2.set_ylabel(r"O$_2$ / %", fontsize=label_font_size)
+        lines['CO2'] = ax2.plot([], [], color="#31BF05", linestyle="-", linewidth=1, label="CO2")[0]
+        lines['O2'] = ax2y2.plot([], [], color="#36605A", linestyle="-", linewidth=1, label="O2")[0]
+
+        # Plot 3 - pO2, Glucose Feed
+        ax3.set_ylabel(r"spO$_2$ / %", fontsize=label_font_size)
+        ax3y2 = ax3.twinx()
+        ax3y2.set_ylabel(r"Glucose Feed / mL $\cdot$ min$^{-1}$", fontsize=label_font_size)
+        lines['spO2'] = ax3.plot([], [], color="#27ABCF", linestyle="-", linewidth=1, label="spO2")[0]
+        lines['Glucose Feed'] = ax3y2.plot([], [], color="#CD5B45", linestyle="-", linewidth=1, label="Glucose Feed")[0]
+
+        # Plot 4 - Volume, Air, pH, Stirrer Speed
+        ax4.set_ylabel(r"Volume / L, Air / L $\cdot$ min$^{-1}$, pH", fontsize=label_font_size)
+        ax4y2 = ax4.twinx()
+        ax4y2.set_ylabel(r"Stirrer Speed / min$^{-1}$", fontsize=label_font_size)
+        lines['Volume'] = ax4.plot([], [], color="#27ABCF", linestyle="-", linewidth=1, label="Volume")[0]
+        lines['pH'] = ax4.plot([], [], color="#8B4513", linestyle="-", linewidth=1, label="pH")[0]
+        lines['Stirrer Speed'] = ax4y2.plot([], [], color="#CD1076", linestyle="-", linewidth=1, label="Stirrer Speed")[0]
+        lines['Air'] = ax4.plot([], [], color="#0B610B", linestyle="-", linewidth=1, label="Air")[0]
+
+        # Set title and subtitle
+        fig.suptitle('Main Culture Simulation', fontsize=title_font_size)
+        subtitle = fig.text(
+            0.5,
+            0.01,
+            '',
+            fontstyle='italic',
+            fontsize=10,
+            horizontalalignment='center'
+        )
+
+        # Add legends
+        for ax in [ax1, ax1y2, ax2, ax2y2, ax3, ax3y2, ax4, ax4y2]:
+            handles, labels = ax.get_legend_handles_labels()
+            if handles:
+                ax.legend(loc='upper right', fontsize=12)
+
+        return {
+            'figure': fig,
+            'subtitle': subtitle,
+            # The glucose row keeps its fixed limits; the other rows follow the data
+            'rescale': [ax2, ax2y2, ax3, ax3y2, ax4, ax4y2],
+            'lines': lines,
+        }
+
+    def _build_kla_template(self) -> Dict[str, Any]:
+        """
+        Build the KLA layout: one axes with labels and an empty line per KLA signal.
+
+        :return: Template with the figure, the axes to rescale and the lines by column.
+        """
+        fig, ax = self._new_figure(self.figsize_kla)
+        lines = {}
+        for col, color in zip(KLA_PLOT_COLUMNS, KLA_PLOT_COLORS):
+            lines[col] = ax.plot([], [], label=f'{col}', color=color)[0]
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Measurements')
+        return {'figure': fig, 'axes': ax, 'rescale': [ax], 'lines': lines}
+
+    def _update_main_template(self, template: Dict[str, Any]) -> None:
+        """
+        Swap the processor's data into the main-culture template and rescale it.
+
+        :param template: Template returned by _build_main_template().
+        """
+        lines = template['lines']
+        time_feed_glucose_numeric = np.array(self.processor.time_feed_glucose_numeric)
+        glucose_feed = np.array(self.processor.glucose_feed)
+        valid_feed_glucose_mask = np.array(self.processor.valid_feed_glucose_mask)
+
+        # Online signals are plotted against the elapsed hours when available
+        online_data = self.processor.online_data
+        online_time = online_data['elapsed_hours'] if 'elapsed_hours' in online_data.columns else online_data['time']
+
+        self._set_line_data(lines['Glucose'], self.processor.time_glucose, self.processor.glucose)
+        self._set_line_data(lines['Biomass'], self.processor.time_biomass, self.processor.biomass)
+        self._set_line_data(lines['Ethanol'], self.processor.time_ethanol, self.processor.ethanol)
+
+        for label, column in [('CO2', 'sCO2'), ('O2', 'sO2'), ('spO2', 'spO2'), ('Volume', 'sVR'), ('pH', 'spH')]:
+            self._set_line_data(lines[label], *self._downsample(online_time, online_data[column], self.figsize_main))
+        self._set_line_data(
+            lines['Glucose Feed'],
+            *self._downsample(
                 time_feed_glucose_numeric[valid_feed_glucose_mask],
                 glucose_feed[valid_feed_glucose_mask],
-                color="#CD5B45",
-                linestyle="-",
-                linewidth=1,
-                label="Glucose Feed"
+                self.figsize_main
             )
-
-            # Plot 4 - Volume, Air, pH, Stirrer Speed
-            ax4.set_ylabel(r"Volume / L, Air / L $\cdot$ min$^{-1}$, pH", fontsize=label_font_size)
-            ax4y2 = ax4.twinx()
-            ax4y2.set_ylabel(r"Stirrer Speed / min$^{-1}$", fontsize=label_font_size)
-
-            ax4.plot(
-                self.processor.online_data['time'],
-                self.processor.online_data['sVR'],
-                color="#27ABCF",
-                linestyle="-",
-                linewidth=1,
-                label="Volume"
-            )
-            ax4.plot(
-                self.processor.online_data['time'],
-                self.processor.online_data['spH'],
-                color="#8B4513",
-                linestyle="-",
-                linewidth=1,
-                label="pH"
-            )
-            ax4y2.plot(
-                self.processor.online_data['time'][self.processor.valid_stirrer_mask],
-                self.processor.online_data['NStirrer'][self.processor.valid_stirrer_mask],
-                color="#CD1076",
-                linestyle="-",
-                linewidth=1,
-                label="Stirrer Speed"
+        )
+        self._set_line_data(
+            lines['Stirrer Speed'],
+            *self._downsample(
+                online_time[self.processor.valid_stirrer_mask],
+                online_data['NStirrer'][self.processor.valid_stirrer_mask],
+                self.figsize_main
             )
-            ax4.plot(
-                self.processor.online_data['time'][self.processor.valid_aeration_mask],
-                self.processor.online_data['FAirIn'][self.processor.valid_aeration_mask],
-                color="#0B610B",
-                linestyle="-",
-                linewidth=1,
-                label="Air"
+        )
+        self._set_line_data(
+            lines['Air'],
+            *self._downsample(
+                online_time[self.processor.valid_aeration_mask],
+                online_data['FAirIn'][self.processor.valid_aeration_mask],
+                self.figsize_main
             )
+        )
 
-            # Set title and subtitle
-            plt.suptitle('Main Culture Simulation', fontsize=title_font_size)
-            plt.figtext(
-                0.5,
-                0.01,
-                f"Group 1: Carolin Beck, Ann-Kathrin Debatin, etc., {date.today().strftime('%d/%m/%Y')}",
-                fontstyle='italic',
-                fontsize=10,
-                horizontalalignment='center'
-            )
+        template['subtitle'].set_text(
+            f"Group 1: Carolin Beck, Ann-Kathrin Debatin, etc., {date.today().strftime('%d/%m/%Y')}"
+        )
+        for ax in template['rescale']:
+            ax.relim()
+            ax.autoscale_view()
 
-            # Add legends
-            for ax in [ax1, ax1y2, ax2, ax2y2, ax3, ax3y2, ax4, ax4y2]:
-                handles, labels = ax.get_legend_handles_labels()
-                if handles:
-                    ax.legend(loc='upper right', fontsize=12)
+    def _update_kla_template(self, template: Dict[str, Any], df: pd.DataFrame, kla_filename: str) -> None:
+        """
+        Swap a KLA file's data into the KLA template and rescale it.
 
-            # Automatically adjust the layout to avoid overlap
-            plt.tight_layout(pad=3)
+        :param template: Template returned by _build_kla_template().
+        :param df: DataFrame containing KLA data.
+        :param kla_filename: Name of the KLA data file for the title.
+        """
+        ax = template['axes']
+        visible = []
+        for col, line in template['lines'].items():
+            if col in df.columns:
+                self._set_line_data(line, *self._downsample(df['Time'], df[col], self.figsize_kla))
+                line.set_visible(True)
+                visible.append(line)
+            else:
+                logger.warning("Column '%s' not found in KLA data and will be skipped.", col)
+                line.set_data([], [])
+                line.set_visible(False)
+
+        ax.set_title(f'Measurement Data Over Time - {kla_filename}')
+        ax.legend(handles=visible)
+        ax.relim(visible_only=True)
+        ax.autoscale_view()
+
+    def plot_data(self, filename: Optional[str] = None, show: bool = True) -> Path:
+        """
+        Plot the processed offline and online data and save the figure to the plot directory.
+
+        :param filename: File name within the plot directory (optional). Defaults to a
+            timestamped name; a fixed name is overwritten on every call.
+        :param show: Whether to display the figure after saving it.
+        :return: Path of the saved plot.
+        """
+        if self.processor is None:
+            logger.error("DataProcessor is not set. Use set_processor() before plotting.")
+            raise ValueError("DataProcessor is not set.")
+
+        logger.info("Generating main culture simulation plots.")
+        try:
+            template = self._get_template('main')
+
+            start = time.perf_counter()
+            self._update_main_template(template)
+            self.render_timings['update'] = time.perf_counter() - start
 
             # Create a timestamp for unique filenames
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            plot_filename = self.plot_dir / f"main_culture_simulation_{timestamp}.png"
-            plt.savefig(plot_filename, dpi=self.dpi)
-            logger.info(f"Main culture simulation plot saved to {plot_filename}")
+            if filename is None:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"main_culture_simulation_{timestamp}.png"
+            plot_filename = self.plot_dir / filename
+            self._save_figure(template, plot_filename, pad=3)
+            logger.info("Main culture simulation plot saved to %s", plot_filename)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Main plot timings: %s",
+                    ", ".join(f"{stage} {seconds:.3f} s" for stage, seconds in self.render_timings.items())
+                )
 
             # Optionally, display the plot
-            plt.show()
-            plt.close(fig)  # Close the figure to free memory
+            self._finish_render('main', show)
             logger.info("Main culture simulation plots generated successfully.")
+            return plot_filename
         except Exception as e:
-            logger.error(f"Error generating main culture simulation plots: {e}")
+            # A half-updated template is not reused
+            self._release_template('main')
+            logger.error("Error generating main culture simulation plots: %s", e)
             raise
 
-    def plot_kla_data(self, df: pd.DataFrame, kla_filename: str) -> None:
+    def plot_kla_data(self, df: pd.DataFrame, kla_filename: str, show: bool = True) -> Path:
         """
         Plot KLA data and save the figure to the plot directory.
 
         :param df: DataFrame containing KLA data.
         :param kla_filename: Name of the KLA data file for descriptive plotting.
+        :param show: Whether to display the figure after saving it.
+        :return: Path of the saved plot.
         """
-        logger.info(f"Generating KLA data plots for {kla_filename}.")
+        logger.info("Generating KLA data plots for %s.", kla_filename)
         try:
-            sns.set(style=self.style)
-            plt.figure(figsize=self.figsize_kla)
-
-            plot_columns = ['spO2', 'sO2', 'sCO2', 'NStirrer', 'FAirIn', 'FO2In']
-            colors = ['blue', 'green', 'red', 'orange', 'purple', 'brown']
+            template = self._get_template('kla')
 
-            for col, color in zip(plot_columns, colors):
-                if col in df.columns:
-                    plt.plot(df['Time'], df[col], label=f'{col}', color=color)
-                else:
-                    logger.warning(f"Column '{col}' not found in KLA data and will be skipped.")
-
-            plt.xlabel('Time')
-            plt.ylabel('Measurements')
-            plt.title(f'Measurement Data Over Time - {kla_filename}')
-            plt.legend()
-            plt.tight_layout()
+            start = time.perf_counter()
+            self._update_kla_template(template, df, kla_filename)
+            self.render_timings['update'] = time.perf_counter() - start
 
             # Extract parameters from filename for descriptive naming
             # Assuming filename format: Daten(klA)400rpm 3L.txt
@@ -260,13 +476,20 @@ class Plotter:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             # Use the rpm and volume in the plot filename
             plot_filename = self.plot_dir / f"kla_data_plot_{rpm_volume}_{timestamp}.png"
-            plt.savefig(plot_filename, dpi=self.dpi)
-            logger.info(f"KLA data plot saved to {plot_filename}")
+            self._save_figure(template, plot_filename)
+            logger.info("KLA data plot saved to %s", plot_filename)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "KLA plot timings: %s",
+                    ", ".join(f"{stage} {seconds:.3f} s" for stage, seconds in self.render_timings.items())
+                )
 
             # Optionally, display the plot
-            plt.show()
-            plt.close()
+            self._finish_render('kla', show)
             logger.info("KLA data plots generated successfully.")
+            return plot_filename
         except Exception as e:
-            logger.error(f"Error generating KLA data plots for {kla_filename}: {e}")
+            # A half-updated template is not reused
+            self._release_template('kla')
+            logger.error("Error generating KLA data plots for %s: %s", kla_filename, e)
             raise
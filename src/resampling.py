@@ -0,0 +1,104 @@
+# resampling.py
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+def _valid_groups(x: np.ndarray, values: np.ndarray) -> Iterator[Tuple[List[int], np.ndarray, np.ndarray]]:
+    """
+    Split signals into groups with the same valid samples, sorted by time.
+
+    The online signals are logged at different rates and are missing in between,
+    so every signal is looked up among its own valid samples. Signals with the same
+    missing values form one group and share one searchsorted.
+
+    :param x: Sample times (n,); samples with a missing time are ignored.
+    :param values: Signal values (n, signals).
+    :return: Iterator of (signal columns, increasing valid times, their values).
+    """
+    if np.any(np.diff(x[~np.isnan(x)]) < 0):
+        order = np.argsort(x, kind='stable')  # NaN times sort last
+        x, values = x[order], values[order]
+
+    valid = ~np.isnan(values) & ~np.isnan(x)[:, None]
+    groups: Dict[bytes, List[int]] = {}
+    for column in range(values.shape[1]):
+        groups.setdefault(np.packbits(valid[:, column]).tobytes(), []).append(column)
+    for columns in groups.values():
+        rows = valid[:, columns[0]]
+        yield columns, x[rows], values[rows][:, columns]
+
+
+def interpolate_to_grid(x: np.ndarray, values: np.ndarray, grid: np.ndarray,
+                        max_gap: Optional[float] = None) -> np.ndarray:
+    """
+    Linearly interpolate several signals sampled at the same times onto a grid.
+
+    Every signal is interpolated between its own valid samples; signals with the
+    same missing values are interpolated together in one array operation. Grid
+    points outside the valid samples of a signal, or missing themselves, are NaN.
+
+    :param x: Sample times, e.g. elapsed hours (n,); samples with a missing time are ignored.
+    :param values: Signal values (n, signals).
+    :param grid: Grid times (g,), in any order.
+    :param max_gap: Grid points between valid samples further apart than this are NaN (optional).
+    :return: Interpolated values (g, signals).
+    """
+    values = np.asarray(values, dtype=float).reshape(len(x), -1)
+    result = np.full((len(grid), values.shape[1]), np.nan)
+    for columns, valid_x, valid_values in _valid_groups(x, values):
+        result[:, columns] = _interpolate_sorted(valid_x, valid_values, grid, max_gap)
+    return result
+
+
+def nearest_to_grid(x: np.ndarray, values: np.ndarray, grid: np.ndarray,
+                    tolerance: Optional[float] = None) -> np.ndarray:
+    """
+    Take the nearest valid sample of several signals at every grid point.
+
+    :param x: Sample times, e.g. elapsed hours (n,); samples with a missing time are ignored.
+    :param values: Signal values (n, signals).
+    :param grid: Grid times (g,), in any order.
+    :param tolerance: Grid points whose nearest valid sample is further away than this are NaN (optional).
+    :return: Values of the nearest samples (g, signals); ties take the earlier sample.
+    """
+    values = np.asarray(values, dtype=float).reshape(len(x), -1)
+    result = np.full((len(grid), values.shape[1]), np.nan)
+    for columns, valid_x, valid_values in _valid_groups(x, values):
+        if len(valid_x) == 0:
+            continue
+        right = np.clip(np.searchsorted(valid_x, grid, side='left'), 0, len(valid_x) - 1)
+        left = np.maximum(right - 1, 0)
+        nearest = np.where(grid - valid_x[left] <= valid_x[right] - grid, left, right)
+        found = ~np.isnan(grid)
+        if tolerance is not None:
+            found &= np.abs(valid_x[nearest] - grid) <= tolerance
+        result[np.ix_(found, columns)] = valid_values[nearest[found]]
+    return result
+
+
+def _interpolate_sorted(x: np.ndarray, values: np.ndarray, grid: np.ndarray,
+                        max_gap: Optional[float]) -> np.ndarray:
+    """
+    Linearly interpolate signals without missing values, sampled at increasing times, onto a grid.
+
+    :param x: Increasing sample times (n,).
+    :param values: Signal values (n, signals).
+    :param grid: Grid times (g,).
+    :param max_gap: Grid points between samples further apart than this are NaN (optional).
+    :return: Interpolated values (g, signals).
+    """
+    result = np.full((len(grid), values.shape[1]), np.nan)
+    if len(x) == 0:
+        return result
+    right = np.clip(np.searchsorted(x, grid, side='left'), 1 if len(x) > 1 else 0, len(x) - 1)
+    left = np.maximum(right - 1, 0)
+    x0, x1 = x[left], x[right]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(x1 > x0, (grid - x0) / (x1 - x0), 1.0)
+    interpolated = values[left] + np.clip(weight, 0.0, 1.0)[:, None] * (values[right] - values[left])
+    inside = (grid >= x[0]) & (grid <= x[-1])
+    if max_gap is not None:
+        inside &= (x1 - x0) <= max_gap
+    result[inside] = interpolated[inside]
+    return result
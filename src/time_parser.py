@@ -0,0 +1,118 @@
+# time_parser.py
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+# Reference date of the parsed online timestamps. The old HH:MM:SS parsing put every
+# value on this date, so elapsed offsets are added to it to keep 'time' comparable.
+ZEIT_EPOCH = np.datetime64('1900-01-01T00:00:00', 'ns')
+
+# Excel renders elapsed durations of one day or more as a 1900 date (serial 1 is
+# 1900-01-01). Serial 60 is Excel's fictitious 1900-02-29, and serials from 61 on
+# are shifted by it.
+_EXCEL_DAY_ZERO = np.datetime64('1899-12-31', 'D')
+_EXCEL_LEAP_BUG = np.datetime64('1900-03-01', 'D')
+_EXCEL_LEAP_DAY = b'1900-02-29'
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_HOUR = 3600 * NS_PER_SECOND
+
+_ZERO = ord('0')
+
+
+def parse_elapsed_time(values: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """
+    Parse elapsed-time strings of the online 'Zeit' column into nanosecond offsets.
+
+    Accepted layouts are 'HH:MM:SS', 'HH:MM:SS.f' with up to nine fractional digits,
+    and either of them prefixed by an Excel 1900 date ('1900-01-02HH:MM:SS.ffffff',
+    optionally with a space or 'T' before the time), which stands for whole elapsed
+    days; Excel's fictitious 1900-02-29 counts as day 60. The strings are parsed as
+    a 2-D byte array in one vectorized pass.
+
+    :param values: Series or array of strings; missing values are allowed.
+    :return: int64 array of nanosecond offsets, with NaT's integer value for unparsable entries.
+    """
+    strings = pd.Series(values, copy=False)
+    raw = strings.where(strings.notna(), '').astype(str).to_numpy().astype('S')
+    count = len(raw)
+    result = np.full(count, np.iinfo(np.int64).min, dtype=np.int64)
+    if count == 0 or raw.itemsize == 0:
+        return result
+
+    width = raw.itemsize
+    chars = raw.view(np.uint8).reshape(count, width)
+    lengths = (chars != 0).sum(axis=1)
+    rows = np.arange(count)
+
+    def char_at(position: np.ndarray) -> np.ndarray:
+        return chars[rows, np.minimum(position, width - 1)]
+
+    def digit_at(position: np.ndarray) -> np.ndarray:
+        return char_at(position).astype(np.int64) - _ZERO
+
+    def is_digit(position: np.ndarray) -> np.ndarray:
+        return (position < lengths) & (char_at(position) >= _ZERO) & (char_at(position) <= _ZERO + 9)
+
+    # Optional 'YYYY-MM-DD' prefix, optionally followed by ' ' or 'T'
+    has_date = (width >= 10) & (chars[:, min(4, width - 1)] == ord('-')) & (chars[:, min(7, width - 1)] == ord('-'))
+    start = np.where(has_date, 10, 0)
+    separator = char_at(start)
+    start = start + (has_date & ((separator == ord(' ')) | (separator == ord('T'))))
+
+    # 'HH:MM:SS'
+    valid = lengths >= start + 8
+    valid &= (char_at(start + 2) == ord(':')) & (char_at(start + 5) == ord(':'))
+    for offset in (0, 1, 3, 4, 6, 7):
+        valid &= is_digit(start + offset)
+    hours = digit_at(start) * 10 + digit_at(start + 1)
+    minutes = digit_at(start + 3) * 10 + digit_at(start + 4)
+    seconds = digit_at(start + 6) * 10 + digit_at(start + 7)
+    valid &= (minutes < 60) & (seconds < 60)
+
+    # Optional '.f' to '.fffffffff'
+    has_fraction = lengths > start + 8
+    valid &= ~has_fraction | ((char_at(start + 8) == ord('.')) & (lengths > start + 9) & (lengths <= start + 18))
+    fraction = np.zeros(count, dtype=np.int64)
+    scale = NS_PER_SECOND
+    for offset in range(9):
+        scale //= 10
+        position = start + 9 + offset
+        present = has_fraction & (position < lengths)
+        valid &= ~present | is_digit(position)
+        fraction += np.where(present, digit_at(position), 0) * scale
+
+    nanoseconds = ((hours * 60 + minutes) * 60 + seconds) * NS_PER_SECOND + fraction
+
+    # Whole days from the Excel date prefix
+    if has_date.any():
+        prefixes = np.where(has_date, raw.astype('S10'), b'1899-12-31')
+        # 1900-02-29 does not exist for numpy; parse it as the 28th and add its day below
+        leap_day = prefixes == _EXCEL_LEAP_DAY
+        prefixes = np.where(leap_day, b'1900-02-28', prefixes)
+        try:
+            dates = prefixes.astype('datetime64[D]')
+        except ValueError:
+            dates = pd.to_datetime(pd.Series(prefixes).str.decode('ascii'), format='%Y-%m-%d', errors='coerce')
+            dates = dates.to_numpy().astype('datetime64[D]')
+            valid &= ~np.isnat(dates)
+            dates = np.where(np.isnat(dates), _EXCEL_DAY_ZERO, dates)
+        days = (dates - _EXCEL_DAY_ZERO).astype(np.int64)
+        days += (dates >= _EXCEL_LEAP_BUG) | leap_day
+        nanoseconds += days * 24 * NS_PER_HOUR
+
+    result[valid] = nanoseconds[valid]
+    return result
+
+
+def elapsed_hours(offsets: np.ndarray) -> np.ndarray:
+    """
+    Convert nanosecond offsets from parse_elapsed_time() into float hours.
+
+    :param offsets: int64 nanosecond offsets, NaT's integer value for missing entries.
+    :return: Float hours with NaN for missing entries.
+    """
+    hours = offsets / NS_PER_HOUR
+    hours[offsets == np.iinfo(np.int64).min] = np.nan
+    return hours
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from batch_loader import BatchLoader
+from config_loader import ConfigLoader
+from tools.data_generator import generate_offline, generate_online
+
+
+def test_load_resamples_runs_onto_common_grid(tmp_path):
+    for name, hours in [('run_a', 10.0), ('run_b', 20.0)]:
+        generate_online(tmp_path / name / 'onlindata_1.txt', rows=300, duration_hours=hours)
+        generate_offline(tmp_path / name / 'offlindata_1.txt', rows=5)
+    (tmp_path / 'run_empty').mkdir()
+    config = ConfigLoader(Path(__file__).resolve().parent.parent / 'config.yaml')
+    config.config['data_loader']['batch'] = {'grid_step_hours': 0.5, 'workers': 3, 'signals': ['sO2', 'spH']}
+
+    batch = BatchLoader(config, tmp_path, use_cache=False).load('run_*')
+
+    assert batch.runs == ['run_a', 'run_b'] and list(batch.failed) == ['run_empty']
+    assert batch.signals['sO2'].shape == (2, len(batch.grid))
+    assert batch.grid[-1] == pytest.approx(20.0, abs=0.5)
+    assert np.isnan(batch.signals['spH'][0, batch.grid > 10.5]).all()
+    assert not np.isnan(batch.signals['spH'][1, 1:-1]).any()
+    assert batch.frame('spH').shape == (len(batch.grid), 2)
+    assert batch.to_frame().loc['run_b', 'sO2'].shape == (len(batch.grid),)
+    assert len(batch.offline_data['run_a']) == 5
+
+
+def test_load_keeps_runs_with_the_same_name_apart(tmp_path):
+    for line, hours in [('line_1', 10.0), ('line_2', 20.0)]:
+        generate_online(tmp_path / line / 'run' / 'onlindata_1.txt', rows=100, duration_hours=hours)
+        generate_offline(tmp_path / line / 'run' / 'offlindata_1.txt', rows=3)
+    config = ConfigLoader(Path(__file__).resolve().parent.parent / 'config.yaml')
+    config.config['data_loader']['batch'] = {'grid_step_hours': 0.5, 'workers': 2, 'signals': ['spH']}
+    loader = BatchLoader(config, tmp_path, use_cache=False)
+
+    batch = loader.load(['line_1/run', 'line_2/run'])
+
+    assert batch.runs == ['line_1/run', 'line_2/run']
+    assert np.isnan(batch.signals['spH'][0, batch.grid > 10.5]).all()
+    assert not np.isnan(batch.signals['spH'][1, 1:-1]).any()
+    with pytest.raises(ValueError):
+        loader.load(['line_1/run', 'line_1/run'])
@@ -0,0 +1,22 @@
+from tools.benchmark import compare, run_size
+
+
+def test_run_size_reports_every_stage(tmp_path):
+    result = run_size(500, tmp_path, plot=False)
+
+    names = [stage['name'] for stage in result['stages']]
+    assert names == [
+        'load_data', 'process_online_time_column', 'convert_columns_to_numeric', 'calculate_feed_time',
+        'get_valid_masks', 'load_kla_data', 'preprocess_kla_data', 'estimate_kla'
+    ]
+    assert result['rows'] == 500 and result['max_rss_mb'] > 0
+    assert all(stage['seconds'] >= 0 and stage['peak_memory_mb'] is not None for stage in result['stages'])
+    assert result['stages'][0]['mb_per_second'] is not None
+
+
+def test_compare_flags_slower_stages():
+    baseline = {'results': [{'rows': 10, 'stages': [{'name': 'load_data', 'seconds': 1.0}]}]}
+    report = {'results': [{'rows': 10, 'stages': [{'name': 'load_data', 'seconds': 1.5}]}]}
+
+    assert len(compare(report, baseline, tolerance=0.2)) == 1
+    assert compare(report, baseline, tolerance=0.6) == []
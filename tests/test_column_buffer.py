@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from column_buffer import ColumnBuffer, FrameBuffer
+
+
+def test_column_buffer_appends_without_changing_earlier_views():
+    buffer = ColumnBuffer([1.0, 2.0])
+    first = buffer.view()
+
+    buffer.append(np.arange(100, dtype=float))
+
+    assert len(buffer) == 102
+    assert first.tolist() == [1.0, 2.0]
+    assert buffer.view()[:3].tolist() == [1.0, 2.0, 0.0]
+
+
+def test_column_buffer_promotes_incompatible_values():
+    buffer = ColumnBuffer(np.array([1, 2]))
+    buffer.append(np.array([2.5]))
+    buffer.append(np.array(['x'], dtype=object))
+
+    assert buffer.view().dtype == object
+    assert buffer.view().tolist() == [1, 2, 2.5, 'x']
+
+
+def test_frame_buffer_shares_the_buffers_between_frames():
+    buffer = FrameBuffer(pd.DataFrame({'a': [1.0, 2.0], 'b': ['x', 'y']}))
+    first = buffer.frame()
+    buffer.append(pd.DataFrame({'a': [3.0], 'b': ['z']}))
+    second = buffer.frame()
+
+    assert second['a'].tolist() == [1.0, 2.0, 3.0]
+    assert second['b'].tolist() == ['x', 'y', 'z']
+    assert second.index.equals(pd.RangeIndex(3))
+    assert np.shares_memory(first['a'].to_numpy(), second['a'].to_numpy())
+    with pytest.raises(ValueError):
+        buffer.append(pd.DataFrame({'c': [1.0]}))
@@ -0,0 +1,102 @@
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from data_cache import DataCache, read_frame, write_frame_atomic
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'Zeit': ['00:02:00.010000', np.nan, '00:06:00.029000'],
+        'time': pd.to_datetime(['1900-01-01 00:02:00', None, '1900-01-01 00:06:00']),
+        'sO2': [9.1, np.nan, 9.3],
+        'count': [1, 2, 3]
+    })
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    file_path = tmp_path / 'online.txt'
+    file_path.write_text('a\tb\n1\t2\n')
+    return file_path
+
+
+def test_store_and_load_roundtrip(tmp_path, frame):
+    cache = DataCache(tmp_path / 'cache')
+
+    cache.store('entry', frame)
+    result = cache.load('entry')
+
+    pd.testing.assert_frame_equal(result, frame)
+
+
+def test_load_missing_entry(tmp_path):
+    assert DataCache(tmp_path / 'cache').load('missing') is None
+
+
+@pytest.mark.parametrize('validation', ['mtime', 'hash'])
+def test_key_depends_on_file_and_settings(source_file, tmp_path, validation):
+    cache = DataCache(tmp_path / 'cache', validation=validation)
+    key = cache.key(source_file, {'decimal_separator': ','})
+
+    assert key == cache.key(source_file, {'decimal_separator': ','})
+    assert key != cache.key(source_file, {'decimal_separator': '.'})
+
+    source_file.write_text('a\tb\n1\t3\n')
+    os.utime(source_file, ns=(0, 10 ** 9))
+    assert key != cache.key(source_file, {'decimal_separator': ','})
+
+
+def test_evict_least_recently_used(tmp_path, frame):
+    cache = DataCache(tmp_path / 'cache')
+    cache.store('old', frame)
+    cache.store('new', frame)
+    os.utime(tmp_path / 'cache' / 'old' / 'schema.json', (0, 0))
+    entry_size = sum(path.stat().st_size for path in (tmp_path / 'cache' / 'new').iterdir())
+
+    cache.max_size_bytes = entry_size
+    cache.evict()
+
+    assert cache.load('old') is None
+    assert cache.load('new') is not None
+
+
+def test_invalid_validation(tmp_path):
+    with pytest.raises(ValueError):
+        DataCache(tmp_path, validation='size')
+
+
+def test_store_and_load_categorical_roundtrip(tmp_path, frame):
+    frame['Zeit_FG'] = pd.Series(['08:32:17', '08:32:17', np.nan], dtype='category')
+    frame['level'] = pd.Series([1, 2, 1], dtype='category')
+    frame['sO2'] = frame['sO2'].astype(np.float32)
+    cache = DataCache(tmp_path / 'cache')
+
+    cache.store('entry', frame)
+    result = cache.load('entry')
+
+    pd.testing.assert_frame_equal(result, frame)
+
+
+def test_write_frame_atomic_replaces_the_directory(tmp_path, frame):
+    directory = tmp_path / 'runs' / 'online'
+    write_frame_atomic(directory, frame.iloc[:1])
+    write_frame_atomic(directory, frame)
+
+    pd.testing.assert_frame_equal(read_frame(directory), frame)
+    assert sorted(path.name for path in directory.parent.iterdir()) == ['online']
+
+
+def test_write_frame_atomic_keeps_the_old_directory_on_failure(tmp_path, frame):
+    directory = tmp_path / 'online'
+    write_frame_atomic(directory, frame)
+
+    with patch('data_cache.write_frame', side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            write_frame_atomic(directory, frame.iloc[:1])
+
+    pd.testing.assert_frame_equal(read_frame(directory), frame)
+    assert [path.name for path in tmp_path.iterdir()] == ['online']
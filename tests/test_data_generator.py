@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from data_loader import DataLoader
+from data_processor import DataProcessor
+from tools.data_generator import format_elapsed, generate_dataset, parse_size
+from time_parser import parse_elapsed_time
+
+
+def make_loader(files):
+    config = MagicMock()
+    config.get.return_value = {
+        'offline_file': str(files['offline']),
+        'online_file': str(files['online']),
+        'kla_dir': str(files['kla'][0].parent),
+        'column_separator': '\\t',
+        'decimal_separator': ',',
+        'encoding': 'utf-8',
+    }
+    return DataLoader(config, Path('/'), use_cache=False)
+
+
+def test_parse_size():
+    assert [parse_size(size) for size in ['10k', '1M', '2.5k', '123']] == [10_000, 1_000_000, 2_500, 123]
+
+
+def test_format_elapsed_roundtrips_through_parser():
+    nanoseconds = np.array([0, 59_000_000_000, 86_400_000_000_000, 61 * 86_400_000_000_000 + 3_600_000_000_000])
+
+    text = format_elapsed(nanoseconds)
+
+    assert text[2] == '1900-01-0100:00:00.000000'
+    np.testing.assert_array_equal(parse_elapsed_time(text), nanoseconds)
+
+
+def test_generated_files_load_like_real_exports(tmp_path):
+    files = generate_dataset(tmp_path, 2000, kla_files=2)
+    loader = make_loader(files)
+
+    loader.load_data()
+    loader.process_online_time_column()
+    loader.convert_columns_to_numeric(['spO2', 'NStirrer', 'FAirIn', 'FGlucose'])
+
+    assert len(loader.online_data) == 2000
+    assert loader.online_data['elapsed_hours'].iloc[-3] > 47.9
+    assert loader.online_data['elapsed_hours'].isna().sum() == 2
+    assert list(loader.offline_data.columns) == ['Zeit_BTM', 'BTM', 'Zeit_G', 'Glu', 'Zeit_N', 'N', 'Zeit_E', 'EtOH']
+
+    processor = DataProcessor(offline_data=None, online_data=None)
+    kla_data = {
+        kla_file.stem: processor.preprocess_kla_data(loader.load_kla_data(str(kla_file)))
+        for kla_file in files['kla']
+    }
+    assert all(len(data) == 2000 and pd.api.types.is_datetime64_any_dtype(data['Time']) for data in kla_data.values())
+
+    table = processor.estimate_kla(kla_data)
+    np.testing.assert_allclose(table['kla'], [240.0, 300.0], rtol=0.05)
@@ -1,7 +1,12 @@
+import threading
+import time
+
+import numpy as np
 import pytest
 import pandas as pd
 from unittest.mock import patch, mock_open, MagicMock
 from io import StringIO
+import kla_header
 from data_loader import DataLoader
 from pathlib import Path
 
@@ -53,12 +58,15 @@ def test_load_data_parser_error(data_loader):
 
 
 def test_process_online_time_column_success(data_loader):
-    online_data = pd.DataFrame({'Zeit': ['12:00:00', '13:00:00']})
+    online_data = pd.DataFrame({'Zeit': ['12:00:00', '13:00:00.500000', '1900-01-0100:00:00', 'nan']})
     data_loader.online_data = online_data
 
     data_loader.process_online_time_column()
 
     assert 'time' in data_loader.online_data.columns
+    assert data_loader.online_data['time'].iloc[0] == pd.Timestamp('1900-01-01 12:00:00')
+    assert data_loader.online_data['elapsed_hours'].tolist()[:3] == [12.0, 13.0 + 0.5 / 3600, 24.0]
+    assert pd.isna(data_loader.online_data['elapsed_hours'].iloc[3])
 
 
 def test_process_online_time_column_missing_column(data_loader):
@@ -98,6 +106,14 @@ def test_find_data_start_success(data_loader):
     assert units == 'unit;unit'
 
 
+def test_find_data_start_without_header(data_loader, tmp_path, caplog):
+    file_path = tmp_path / 'kla.csv'
+    file_path.write_text('Project: test\nno data\n', encoding='utf-16-le')
+
+    assert data_loader.find_data_start(file_path) == (0, None, None)
+    assert "Header with 'Time' was not found." in caplog.text
+
+
 def test_load_kla_data_success(data_loader):
     kla_content = 'Time;Val\n01.01.2020 00:00:00;100\n02.01.2020 00:00:00;200\n'
     with patch.object(data_loader, 'find_data_start', return_value=(1, 'Time;Val', 'unit;unit')):
@@ -109,7 +125,366 @@ def test_load_kla_data_success(data_loader):
     assert 'Time' in result.columns
 
 
-def test_load_kla_data_file_not_found(data_loader):
-    with patch.object(data_loader, 'find_data_start', side_effect=FileNotFoundError):
-        with pytest.raises(FileNotFoundError):
-            data_loader.load_kla_data('/some/fake/path')
+def test_load_kla_data_file_not_found(data_loader, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        data_loader.load_kla_data(str(tmp_path / 'missing.txt'))
+
+
+@pytest.fixture
+def online_file(tmp_path):
+    file_path = tmp_path / 'online.txt'
+    file_path.write_text(
+        "Zeit\tspH\tsO2\tNStirrer\tZeit_FG\n"
+        "00:02:00.010000\t6.9\t9,1\t500\t2024-10-1308:32:17\n"
+        "00:04:00.019000\t6.5\tnan\t500\t#NAN\n"
+        "00:06:00.029000\tinf\t9,3\t510\tNaT\n",
+        encoding='utf-8'
+    )
+    return file_path
+
+
+def make_loader(backend, separator='\t', decimal=',', schema=None):
+    config = MagicMock()
+    config.get.return_value = {
+        'offline_file': 'offline.txt',
+        'online_file': 'online.txt',
+        'column_separator': separator,
+        'decimal_separator': decimal,
+        'parser_backend': backend,
+        'schema': schema
+    }
+    return DataLoader(config, Path('/some/fake/path'))
+
+
+@pytest.mark.parametrize('backend', ['c', 'numpy', 'auto'])
+def test_read_table_matches_python_engine(online_file, backend):
+    expected = make_loader('python').read_table(online_file)
+    result = make_loader(backend).read_table(online_file)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result['sO2'].tolist()[0] == 9.1
+    assert pd.isna(result['spH'].iloc[2])
+    assert pd.isna(result['Zeit_FG'].iloc[1])
+
+
+@pytest.mark.parametrize('backend', ['c', 'numpy', 'auto'])
+def test_read_table_from_content_matches_file(online_file, backend):
+    loader = make_loader(backend)
+
+    result = loader.read_table(online_file, content=online_file.read_bytes())
+
+    pd.testing.assert_frame_equal(result, loader.read_table(online_file))
+
+
+def test_fetch_files_limits_concurrent_reads(tmp_path):
+    file_paths = [tmp_path / f'file{index}.txt' for index in range(6)]
+    for index, file_path in enumerate(file_paths):
+        file_path.write_bytes(str(index).encode())
+    file_paths.append(tmp_path / 'missing.txt')
+    loader = make_loader('auto')
+    loader.io_workers = 2
+    active, peak, lock = [0], [0], threading.Lock()
+    read_bytes = Path.read_bytes
+
+    def tracked_read(path):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return read_bytes(path)
+
+    with patch.object(Path, 'read_bytes', tracked_read):
+        fetched = {index: content for index, _, content in loader.fetch_files(file_paths)}
+        ordered = [index for index, _, _ in loader.fetch_files(file_paths, ordered=True)]
+
+    assert peak[0] == 2
+    assert fetched == {**{index: str(index).encode() for index in range(6)}, 6: None}
+    assert ordered == list(range(7))
+
+
+def test_load_kla_files_reads_concurrently_and_skips_failures(data_loader, tmp_path):
+    file_path = tmp_path / 'kla.txt'
+    file_path.write_bytes((
+        'Time                ;spO2 ;\r\n'
+        '                    ;%    ;\r\n'
+        '13.10.2024 14:15:50 ; 98,2;\r\n'
+    ).encode('utf-16-le'))
+    missing = tmp_path / 'missing.txt'
+
+    result = data_loader.load_kla_files([missing, file_path])
+
+    assert list(result) == [file_path]
+    pd.testing.assert_frame_equal(result[file_path], data_loader.load_kla_data(str(file_path)))
+
+
+ONLINE_SCHEMA = {'online': {'Zeit': 'str', 'spH': 'float', 'sO2': 'float', 'NStirrer': 'int', 'Zeit_FG': 'str'}}
+
+
+@pytest.mark.parametrize('backend', ['c', 'numpy', 'python', 'auto'])
+def test_read_table_applies_schema(online_file, backend):
+    with open(online_file, 'a', encoding='utf-8') as file:
+        file.write("00:08:00.039000\terror\t9,4\t520\t0012\n")
+
+    result = make_loader(backend, schema=ONLINE_SCHEMA).read_table(online_file, dataset='online')
+
+    assert result['sO2'].tolist()[0] == 9.1 and result['sO2'].dtype == 'float64'
+    assert pd.isna(result['spH'].iloc[3]) and result['spH'].dtype == 'float64'
+    assert result['NStirrer'].dtype == 'int64'
+    assert result['Zeit_FG'].iloc[3] == '0012'
+
+
+def test_read_table_without_dataset_ignores_schema(online_file):
+    result = make_loader('c', schema={'online': {'NStirrer': 'float'}}).read_table(online_file)
+
+    assert result['NStirrer'].dtype == 'int64'
+
+
+def test_unknown_schema_type():
+    with pytest.raises(ValueError):
+        make_loader('auto', schema={'online': {'sO2': 'double'}})
+
+
+def test_iter_online_chunks_applies_schema(online_file):
+    loader = make_loader('c', schema=ONLINE_SCHEMA)
+    loader.online_file = online_file
+
+    chunks = list(loader.iter_online_chunks(2, []))
+
+    assert all(chunk['sO2'].dtype == 'float64' for chunk in chunks)
+    assert pd.concat(chunks)['sO2'].tolist()[2] == 9.3
+
+
+def test_read_table_escaped_separator(online_file):
+    result = make_loader('c', separator='\\t').read_table(online_file)
+
+    assert list(result.columns) == ['Zeit', 'spH', 'sO2', 'NStirrer', 'Zeit_FG']
+
+
+def test_read_table_numpy_rejects_quoted_fields(tmp_path):
+    file_path = tmp_path / 'quoted.txt'
+    file_path.write_text('a\tb\n"1"\t2\n', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        make_loader('numpy').read_table(file_path)
+    assert make_loader('auto').read_table(file_path)['a'].tolist() == [1]
+
+
+def test_unknown_parser_backend():
+    with pytest.raises(ValueError):
+        make_loader('fortran')
+
+
+def test_load_kla_data_streams_typed_columns(data_loader, tmp_path):
+    file_path = tmp_path / 'kla.txt'
+    content = (
+        '﻿;Measurement export;\r\n'
+        ';Mean time:;5.000;\r\n'
+        'Time                ;spO2 ;NStirrer;\r\n'
+        '                    ;%    ;1/min   ;\r\n'
+        ';\r\n'
+        '13.10.2024 14:15:50 ; 98,2;     0,0;\r\n'
+        '13.10.2024 14:15:55 ;  bad;   400,0;\r\n'
+    )
+    file_path.write_bytes(content.encode('utf-16-le'))
+
+    result = data_loader.load_kla_data(str(file_path))
+
+    assert list(result.columns) == ['Time', 'spO2', 'NStirrer']
+    assert result['Time'].tolist() == [pd.Timestamp('2024-10-13 14:15:50'), pd.Timestamp('2024-10-13 14:15:55')]
+    assert result['spO2'].iloc[0] == 98.2
+    assert pd.isna(result['spO2'].iloc[1])
+    assert result['NStirrer'].dtype == 'float64'
+    assert result.attrs['units'] == {'Time': '', 'spO2': '%', 'NStirrer': '1/min'}
+
+
+def write_kla(file_path, times, interval='2.500'):
+    rows = ''.join(f'{time} ; 98,2;\r\n' for time in times)
+    file_path.write_bytes((
+        ';Measurement export;Project: test; User: User;\r\n'
+        f';Measurement start:;{times[0].replace(" ", "  ")};\r\n'
+        f';Mean time:;{interval};\r\n'
+        'Time                ;spO2 ;\r\n'
+        '                    ;%    ;\r\n'
+        ';\r\n' + rows
+    ).encode('utf-16-le'))
+
+
+def test_load_kla_data_exposes_header_and_builds_time_index(data_loader, tmp_path):
+    file_path = tmp_path / 'kla.txt'
+    expected = (pd.Timestamp('2024-10-09 16:31:57') + pd.to_timedelta(np.arange(20) * 2.5, unit='s')).floor('s')
+    times = expected.strftime('%d.%m.%Y %H:%M:%S').tolist()
+    write_kla(file_path, times)
+
+    with patch('kla_header._parse_kla_times', wraps=kla_header._parse_kla_times) as parse:
+        result = data_loader.load_kla_data(str(file_path))
+
+    header = result.attrs['header']
+    assert header.start == np.datetime64('2024-10-09T16:31:57') and header.interval == 2.5
+    assert header.metadata['Project'] == ['test']
+    assert result['Time'].tolist() == expected.tolist()
+    assert all(len(call.args[0]) < len(times) for call in parse.call_args_list)
+    assert data_loader.load_kla_header(str(file_path)).interval == 2.5
+
+
+def test_load_kla_data_parses_all_times_after_a_gap(data_loader, tmp_path):
+    file_path = tmp_path / 'kla.txt'
+    times = ['09.10.2024 16:31:57', '09.10.2024 16:31:59', '09.10.2024 16:32:10', '09.10.2024 16:32:12']
+    write_kla(file_path, times)
+
+    result = data_loader.load_kla_data(str(file_path))
+
+    assert result['Time'].tolist() == [pd.Timestamp(f'2024-10-09 {time[11:]}') for time in times]
+
+
+def test_load_kla_data_missing_header(data_loader, tmp_path, caplog):
+    file_path = tmp_path / 'kla.txt'
+    file_path.write_bytes(';Measurement export;\r\n'.encode('utf-16-le'))
+
+    with pytest.raises(ValueError):
+        data_loader.load_kla_data(str(file_path))
+    assert "Header with 'Time' was not found." in caplog.text
+
+
+def test_load_kla_data_logs_undecodable_file(data_loader, tmp_path, caplog):
+    file_path = tmp_path / 'kla.txt'
+    file_path.write_bytes(b'Time;spO2\r\n\x00\xd8')  # Unpaired UTF-16 surrogate
+
+    with pytest.raises(UnicodeDecodeError):
+        data_loader.load_kla_data(str(file_path))
+    assert 'Malformed KLA file' in caplog.text
+
+
+def test_load_processed_data_uses_cache(tmp_path):
+    (tmp_path / 'offline.txt').write_text('Zeit_BTM\tBTM\n0\t1.97\n2\t2.54\n')
+    (tmp_path / 'online.txt').write_text('Zeit\tsO2\n00:02:00.010000\t9.1\n00:04:00.019000\t9.2\n')
+    config = MagicMock()
+    config.get.return_value = {
+        'offline_file': 'offline.txt',
+        'online_file': 'online.txt',
+        'column_separator': '\t',
+        'decimal_separator': ',',
+        'cache': {'enabled': True, 'dir': 'cache'}
+    }
+
+    first = DataLoader(config, tmp_path)
+    first.load_processed_data(['sO2'])
+    second = DataLoader(config, tmp_path)
+    with patch.object(second, 'load_data') as mock_load_data:
+        second.load_processed_data(['sO2'])
+
+    mock_load_data.assert_not_called()
+    pd.testing.assert_frame_equal(second.online_data, first.online_data)
+    pd.testing.assert_frame_equal(second.offline_data, first.offline_data)
+
+    uncached = DataLoader(config, tmp_path, use_cache=False)
+    assert uncached.cache is None
+
+
+@pytest.mark.parametrize('backend', ['auto', 'python'])
+def test_iter_online_chunks_yields_typed_chunks(online_file, backend):
+    loader = make_loader(backend)
+    loader.online_file = online_file
+
+    chunks = list(loader.iter_online_chunks(2, ['sO2', 'NStirrer']))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    for chunk in chunks:
+        assert {'time', 'elapsed_hours'} <= set(chunk.columns)
+        assert chunk['sO2'].dtype == 'float64'
+    assert chunks[1]['sO2'].iloc[0] == 9.3
+    assert chunks[0]['elapsed_hours'].iloc[1] == pytest.approx(4 / 60 + 0.019 / 3600)
+
+
+def test_poll_online_data_parses_only_appended_rows(online_file):
+    loader = make_loader('auto')
+    loader.online_file = online_file
+
+    first = loader.poll_online_data(['sO2'])
+    assert len(first) == 3
+    first = loader.online_data
+    assert len(loader.poll_online_data(['sO2'])) == 0
+
+    with open(online_file, 'a', encoding='utf-8') as file:
+        file.write("00:08:00.000000\t7.0\t9,4\t520\tNaT\n00:10:00")
+    appended = loader.poll_online_data(['sO2'])
+
+    assert len(appended) == 1
+    assert appended.index.tolist() == [3]
+    assert loader.online_data['sO2'].tolist()[3] == 9.4
+    assert loader.online_data['elapsed_hours'].iloc[3] == pytest.approx(8 / 60)
+
+    with open(online_file, 'a', encoding='utf-8') as file:
+        file.write(".000000\t7.1\t9,5\t530\tNaT\n")
+    assert len(loader.poll_online_data(['sO2'])) == 1
+    assert len(loader.online_data) == 5
+
+    # Earlier rows are kept in the buffers rather than copied on every poll
+    assert np.shares_memory(first['spH'].to_numpy(), loader.online_data['spH'].to_numpy())
+
+
+def test_poll_online_data_restarts_when_the_file_is_rewritten(online_file):
+    loader = make_loader('auto')
+    loader.online_file = online_file
+    loader.poll_online_data(['sO2'])
+
+    # Same size and inode, but another header: the file was rewritten in place
+    content = online_file.read_bytes()
+    online_file.write_bytes(content.replace(b'NStirrer', b'NStirrex') + b"00:08:00.000000\t7.0\t9,4\t520\tNaT\n")
+    rewritten = loader.poll_online_data(['sO2'])
+    assert len(rewritten) == 4
+    assert 'NStirrex' in loader.online_data.columns
+
+    # Replaced by a new file (another inode) that is longer than the followed offset
+    replacement = online_file.with_name('replacement.txt')
+    replacement.write_bytes(content + content.split(b'\n', 1)[1])
+    replacement.replace(online_file)
+    assert len(loader.poll_online_data(['sO2'])) == 6
+    assert len(loader.online_data) == 6
+
+def test_compact_data_downcasts_and_categorizes(data_loader):
+    data_loader.online_data = pd.DataFrame({
+        'Zeit': ['00:00:00', '00:00:05', '00:00:10', '00:00:15'],
+        'spO2': [10.3, 98.7, float('nan'), 19.8],
+        'sTR': [1234567.891, 1.0, 2.0, 3.0],
+        'Zeit_FG': ['08:32:17', '08:32:17', '08:32:22', None],
+        'Label': ['a', 'b', 'c', 'd'],
+    })
+    data_loader.process_online_time_column()
+
+    data_loader.compact_data('online')
+    data = data_loader.online_data
+
+    assert 'Zeit' not in data.columns
+    assert str(data['time'].dtype) == 'datetime64[ns]'
+    assert data['spO2'].dtype == 'float32'
+    assert data['spO2'].astype(float).round(1).tolist()[:2] == [10.3, 98.7]
+    assert data['sTR'].dtype == 'float64'  # Needs more precision than float32 offers
+    assert data['Zeit_FG'].dtype == 'category'
+    assert data['Label'].dtype == object
+    report = DataLoader.memory_report(data)
+    assert list(report.index) == list(data.columns)
+
+
+def test_export_and_import_online_run(data_loader, tmp_path):
+    online_data = pd.DataFrame({
+        'time': pd.to_datetime(['1900-01-01 00:00:00', '1900-01-01 00:00:05', None]),
+        'spO2': [10.3, 98.7, float('nan')],
+        'Zeit_FG': pd.Series(['08:32:17', None, '08:32:22'], dtype='category'),
+        'Comment': ['a', float('nan'), 'c'],
+    })
+    data_loader.online_data = online_data
+
+    run_dir = data_loader.export_data(tmp_path / 'runs' / 'HK18')
+    data_loader.online_data = None
+    result = data_loader.import_data(run_dir)
+
+    pd.testing.assert_frame_equal(result, online_data)
+    assert data_loader.online_data is result
+    # Typed columns are read-only views of the memory-mapped files
+    assert not result['spO2'].to_numpy().flags.writeable
+    assert not result['time'].to_numpy().flags.writeable
+
+    with pytest.raises(FileNotFoundError):
+        data_loader.import_data(tmp_path / 'missing')
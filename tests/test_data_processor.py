@@ -1,4 +1,6 @@
 import pytest
+from unittest.mock import patch
+import numpy as np
 import pandas as pd
 from data_processor import DataProcessor
 
@@ -64,6 +66,17 @@ def test_get_valid_masks_success(processor):
     assert processor.valid_feed_glucose_mask is not None
 
 
+def test_preprocess_kla_data_keeps_parsed_time(processor):
+    kla_data = pd.DataFrame({'Time': pd.to_datetime(['2020-01-01 00:00:00', '2020-01-01 00:00:05']),
+                             'spO2': [1.0, 2.0]})
+
+    with patch('pandas.to_datetime') as to_datetime:
+        processed_data = processor.preprocess_kla_data(kla_data)
+
+    to_datetime.assert_not_called()
+    assert np.shares_memory(processed_data['Time'].to_numpy(), kla_data['Time'].to_numpy())
+
+
 def test_preprocess_kla_data_success(processor):
     kla_data = pd.DataFrame({
         'Time': ['01.01.2020 00:00:00', '02.01.2020 00:00:00'],
@@ -74,3 +87,235 @@ def test_preprocess_kla_data_success(processor):
 
     assert 'Time' in processed_data.columns
     assert pd.api.types.is_numeric_dtype(processed_data['SomeColumn'])
+
+
+def test_consume_online_chunks_matches_eager_processing():
+    online_data = pd.DataFrame({
+        'time': pd.to_datetime(['1900-01-01 00:02:00', '1900-01-01 00:04:00', '1900-01-01 00:06:00']),
+        'elapsed_hours': [2 / 60, 4 / 60, 6 / 60],
+        'sO2': [9.1, None, 9.3],
+        'FAirIn': [9.0, None, 9.0],
+        'NStirrer': [500.0, 500.0, None],
+        'Zeit_FG': ['08:32:17', '08:32:22', 'NaT'],
+        'FGlucose': ['2.0', '2.5', None]
+    })
+    eager = DataProcessor(offline_data=None, online_data=online_data.copy())
+    eager.calculate_feed_time()
+    eager.get_valid_masks()
+
+    streamed = DataProcessor(offline_data=None, online_data=None)
+    streamed.consume_online_chunks([online_data.iloc[:2], online_data.iloc[2:]])
+
+    assert 'Zeit_FG' not in streamed.online_data.columns
+    assert streamed.time_feed_glucose_numeric.tolist()[:2] == eager.time_feed_glucose_numeric.tolist()[:2]
+    assert streamed.valid_feed_glucose_mask.tolist() == eager.valid_feed_glucose_mask.tolist()
+    assert streamed.valid_stirrer_mask.tolist() == eager.valid_stirrer_mask.tolist()
+    assert streamed.glucose_feed.tolist()[:2] == [2.0, 2.5]
+
+
+
+def test_consume_online_chunks_bounds_the_reduced_rows():
+    rows = 5000
+    hours = np.arange(rows) / 60
+    online_data = pd.DataFrame({
+        'elapsed_hours': hours,
+        'sO2': np.sin(hours),
+        'NStirrer': np.full(rows, 500.0),
+        'Zeit_FG': np.where(np.arange(rows) < 3000, 'NaT', '08:32:17'),
+        'FGlucose': np.linspace(0, 1, rows)
+    })
+    online_data.loc[3500, 'Zeit_FG'] = '08:30:00'
+    online_data.loc[1234, 'sO2'] = 5.0
+    eager = DataProcessor(offline_data=None, online_data=online_data.copy())
+
+    streamed = DataProcessor(offline_data=None, online_data=None)
+    streamed.consume_online_chunks(
+        (online_data.iloc[start:start + 500] for start in range(0, rows, 500)), max_rows=400
+    )
+
+    assert len(streamed.online_data) <= 400
+    assert streamed.online_data['sO2'].max() == 5.0
+    assert streamed.online_data['sO2'].min() == online_data['sO2'].min()
+    assert streamed.feed_start_time == eager.feed_start_time
+    assert streamed.online_data['elapsed_hours'].is_monotonic_increasing
+
+def test_append_online_data_updates_derived_series_incrementally():
+    online_data = pd.DataFrame({
+        'Zeit_FG': ['08:32:17', '08:32:22'],
+        'FGlucose': [2.0, None],
+        'FAirIn': [9.0, 9.0],
+        'NStirrer': [500.0, None]
+    })
+    processor = DataProcessor(offline_data=None, online_data=None)
+    processor.append_online_data(online_data, new_rows=2)
+
+    appended = pd.DataFrame({
+        'Zeit_FG': ['08:32:17', '08:32:22', '08:32:07'],
+        'FGlucose': [2.0, None, 3.0],
+        'FAirIn': [9.0, 9.0, None],
+        'NStirrer': [500.0, None, 510.0]
+    })
+    with patch('pandas.to_datetime', wraps=pd.to_datetime) as mock_to_datetime:
+        processor.append_online_data(appended, new_rows=1)
+
+    assert len(mock_to_datetime.call_args[0][0]) == 1
+    assert processor.time_feed_glucose_numeric.tolist() == pytest.approx([10 / 3600, 15 / 3600, 0.0])
+    assert processor.valid_feed_glucose_mask.tolist() == [True, False, True]
+    assert processor.valid_aeration_mask.tolist() == [True, True, False]
+    assert processor.valid_stirrer_mask.tolist() == [True, False, True]
+
+    extended = processor.valid_stirrer_mask
+    row = pd.DataFrame({'Zeit_FG': ['08:32:27'], 'FGlucose': [4.0], 'FAirIn': [9.0], 'NStirrer': [520.0]})
+    processor.append_online_data(pd.concat([appended, row], ignore_index=True), new_rows=1)
+
+    # The derived series grow in their buffers instead of being concatenated
+    assert processor.valid_stirrer_mask.tolist() == [True, False, True, True]
+    assert np.shares_memory(extended.to_numpy(), processor.valid_stirrer_mask.to_numpy())
+
+
+def test_estimate_kla_table_by_rpm_and_volume(processor):
+    def kla_frame(kla_per_h, rpm):
+        seconds = np.arange(200) * 2.0
+        dissolved_oxygen = np.where(
+            seconds >= 100, 99.5 * (1 - np.exp(-kla_per_h / 3600 * (seconds - 100))), 0.0
+        )
+        return pd.DataFrame({
+            'Time': pd.Timestamp('2024-10-13 14:00:00') + pd.to_timedelta(seconds, unit='s'),
+            'spO2': dissolved_oxygen,
+            'NStirrer': float(rpm),
+            'FAirIn': np.where(seconds >= 100, 3.0, 0.0),
+        })
+
+    table = processor.estimate_kla({
+        'Daten(klA)600rpm 3L': kla_frame(400.0, 600),
+        'Daten(klA)400rpm 6L': kla_frame(250.0, 400),
+        'no_conditions': kla_frame(300.0, 500),
+    })
+
+    assert table['file'].tolist() == ['Daten(klA)400rpm 6L', 'no_conditions', 'Daten(klA)600rpm 3L']
+    assert table['rpm'].tolist() == [400.0, 500.0, 600.0]
+    assert table['volume'].tolist()[0] == 6.0 and np.isnan(table['volume'].tolist()[1])
+    np.testing.assert_allclose(table['kla'], [250.0, 300.0, 400.0], rtol=0.02)
+
+    with pytest.raises(KeyError):
+        processor.estimate_kla({'bad': pd.DataFrame({'Time': []})})
+
+
+def test_derived_series_are_lazy_and_cached(processor):
+    processor.online_data['NStirrer'] = [500.0, None]
+
+    with patch('pandas.to_datetime', wraps=pd.to_datetime) as mock_to_datetime:
+        mask = processor.valid_stirrer_mask
+        assert processor.valid_stirrer_mask is mask
+        mock_to_datetime.assert_not_called()
+
+        processor.time_feed_glucose_numeric
+        processor.valid_feed_glucose_mask
+        assert mock_to_datetime.call_count == 1
+
+    assert mask.tolist() == [True, False]
+
+
+def test_derived_series_are_invalidated_when_the_frame_changes(processor):
+    assert processor.glucose_feed.tolist() == [5.0, 6.0]
+
+    processor.online_data = pd.DataFrame({'Zeit_FG': ['12:00:00'], 'FGlucose': ['7.0']})
+    assert processor.glucose_feed.tolist() == [7.0]
+
+    processor.online_data.loc[1] = ['12:00:05', '8.0']
+    assert processor.glucose_feed.tolist() == [7.0, 8.0]
+    assert processor.time_feed_glucose_numeric.tolist() == pytest.approx([0.0, 5 / 3600])
+
+    processor.online_data.loc[1, 'FGlucose'] = '9.0'
+    processor.invalidate('online_data')
+    assert processor.glucose_feed.tolist() == [7.0, 9.0]
+
+
+def test_derived_series_follow_columns_assigned_in_place(processor):
+    assert processor.glucose_feed.tolist() == [5.0, 6.0]
+
+    processor.online_data['FGlucose'] = ['8.0', '9.0']
+    assert processor.glucose_feed.tolist() == [8.0, 9.0]
+
+    processor.online_data['FGlucose'] = processor.online_data['FGlucose'].astype(float) * 2
+    assert processor.glucose_feed.tolist() == [16.0, 18.0]
+
+    processor.online_data['FGlucose'] = pd.Categorical(['1.0', '2.0'])
+    assert processor.glucose_feed.tolist() == [1.0, 2.0]
+
+
+def test_assigning_a_frame_again_outdates_derived_series(processor):
+    assert processor.glucose_feed.tolist() == [5.0, 6.0]
+
+    processor.online_data.loc[0, 'FGlucose'] = '7.0'
+    assert processor.glucose_feed.tolist() == [5.0, 6.0]  # Single values written in place are not detected
+
+    processor.online_data = processor.online_data
+    assert processor.glucose_feed.tolist() == [7.0, 6.0]
+
+
+def test_derived_series_raise_for_missing_data():
+    processor = DataProcessor(offline_data=None, online_data=pd.DataFrame({'FAirIn': [1.0]}))
+
+    with pytest.raises(ValueError):
+        processor.biomass
+    with pytest.raises(KeyError):
+        processor.valid_stirrer_mask
+
+
+def test_processing_leaves_read_only_source_frames_untouched(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from data_cache import read_frame, write_frame
+
+    write_frame(tmp_path, pd.DataFrame({
+        'Zeit_FG': ['08:32:17', 'NaT', '08:32:27'],
+        'FGlucose': [2.0, 2.5, np.nan],
+        'FAirIn': [9.0, np.nan, 9.0],
+        'NStirrer': [500.0, 500.0, np.nan]
+    }))
+    online_data = read_frame(tmp_path)  # Memory-mapped, read-only columns
+    expected = online_data.copy()
+    kla_data = pd.DataFrame({' Time ': ['01.01.2020 00:00:00', 'x'], ' spO2': [1.0, 2.0]})
+
+    def process(_):
+        processor = DataProcessor(offline_data=None, online_data=online_data)
+        processor.calculate_feed_time()
+        processor.get_valid_masks()
+        return processor
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        processors = list(executor.map(process, range(4)))
+    cleaned = processors[0].preprocess_kla_data(kla_data)
+
+    pd.testing.assert_frame_equal(online_data, expected)
+    assert all(p.valid_feed_glucose_mask.tolist() == [True, False, False] for p in processors)
+    assert np.shares_memory(processors[0].glucose_feed.to_numpy(), online_data['FGlucose'].to_numpy())
+    assert list(kla_data.columns) == [' Time ', ' spO2'] and kla_data[' Time '].iloc[1] == 'x'
+    assert list(cleaned.columns) == ['Time', 'spO2'] and len(cleaned) == 1
+
+
+def test_align_offline_attaches_online_values_at_sample_times():
+    offline_data = pd.DataFrame({
+        'Zeit_BTM': [0, 2], 'BTM': [1.0, 2.0],
+        'Zeit_G': [1, 5], 'Glu': [10.0, 9.0],
+        'Zeit_E': [2, np.nan], 'EtOH': [0.1, 0.2],
+    })
+    online_data = pd.DataFrame({
+        'elapsed_hours': [0.0, 1.0, 2.0, 3.0],
+        'sO2': [8.0, 9.0, 10.0, 11.0],
+        'sCO2': [1.0, np.nan, 3.0, np.nan],
+        'FGlucose': [0.0, 0.0, 2.0, 2.0],
+        'sVR': [1.0, 1.5, 2.0, 2.5],
+    })
+    processor = DataProcessor(offline_data=offline_data, online_data=online_data)
+
+    aligned = processor.aligned_offline
+    nearest = processor.align_offline(signals=['sO2'], method='nearest', tolerance=1.0)
+
+    assert aligned['measurement'].tolist() == ['biomass'] * 2 + ['glucose'] * 2 + ['ethanol'] * 2
+    # Glucose at 5 h is after the last online sample; the second ethanol time is missing
+    np.testing.assert_allclose(aligned['sO2'], [8.0, 10.0, 9.0, np.nan, 10.0, np.nan])
+    np.testing.assert_allclose(aligned['sCO2'], [1.0, 3.0, 2.0, np.nan, 3.0, np.nan])
+    assert nearest['sO2'].tolist()[:3] == [8.0, 10.0, 9.0] and np.isnan(nearest['sO2'][3])
+    with pytest.raises(KeyError):
+        processor.align_offline(signals=['pO2'])
@@ -0,0 +1,59 @@
+import numpy as np
+from downsampler import downsample_minmax, minmax_rows
+
+
+def test_downsample_keeps_extremes_in_order():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50)
+    y[123] = 5.0
+    y[877] = -5.0
+
+    reduced_x, reduced_y = downsample_minmax(x, y, 100)
+
+    assert len(reduced_x) <= 100
+    assert np.all(np.diff(reduced_x) > 0)
+    assert reduced_y.max() == 5.0 and reduced_y.min() == -5.0
+    assert 123.0 in reduced_x and 877.0 in reduced_x
+
+
+def test_downsample_short_series_unchanged():
+    x, y = np.arange(10), np.arange(10.0)
+
+    reduced_x, reduced_y = downsample_minmax(x, y, 100)
+
+    assert np.array_equal(reduced_x, x) and np.array_equal(reduced_y, y)
+    assert len(downsample_minmax(np.arange(1000), np.arange(1000.0), 0)[0]) == 1000
+
+
+def test_downsample_preserves_nan_gaps_and_datetimes():
+    x = np.datetime64('1900-01-01') + np.arange(1000).astype('timedelta64[m]')
+    y = np.ones(1000)
+    y[400:600] = np.nan
+
+    reduced_x, reduced_y = downsample_minmax(x, y, 50)
+
+    assert reduced_x.dtype.kind == 'M'
+    assert np.isnan(reduced_y).any()
+    assert not np.isnan(reduced_y[0])
+
+
+def test_minmax_rows_keeps_extremes_of_every_column():
+    x = np.linspace(0, 10, 1000)
+    values = np.column_stack([np.sin(x), np.cos(x)])
+    values[500:600, 1] = np.nan
+
+    rows = minmax_rows(x, values, buckets=10)
+
+    assert len(rows) <= 2 * 10 * 2
+    assert np.all(np.diff(rows) > 0)
+    assert np.argmax(values[:, 0]) in rows
+    assert np.argmin(values[:, 0]) in rows
+    assert np.nanargmin(values[:, 1]) in rows
+    # The bucket in which the second column is all missing keeps a missing row
+    assert np.isnan(values[rows, 1]).any()
+
+
+def test_minmax_rows_without_x_keeps_all_rows():
+    rows = minmax_rows([np.nan, np.nan], [[1.0], [2.0]], buckets=1)
+
+    assert rows.tolist() == [0, 1]
@@ -0,0 +1,73 @@
+import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import DataLoader
+from tools.excel_converter import convert_excel_to_txt, convert_sheet, read_sheet
+
+openpyxl = pytest.importorskip('openpyxl')
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    file_path = tmp_path / 'onlindata_test.xlsx'
+    book = openpyxl.Workbook()
+    book.active.title = 'other'
+    book.active.append(['ignored'])
+    sheet = book.create_sheet('onlindata_test')
+    sheet.append(['Zeit', 'sO2  ', 'NStirrer', 'Zeit_FG', 'Note'])
+    sheet.append([datetime.time(0, 2, 0, 10000), 9.1, 500, datetime.datetime(2024, 10, 13, 8, 32, 17), 'a b'])
+    sheet.append([datetime.datetime(1900, 1, 1, 0, 0, 6, 912000), None, 510, None, 3])
+    sheet.append([None, None, None, None, None])
+    sheet.append([datetime.time(0, 6), '#NAN', 520, None, None])
+    book.save(file_path)
+    return file_path
+
+
+def test_read_sheet_keeps_numbers_and_cleans_text(workbook):
+    data = read_sheet(workbook, 'onlindata_test')
+
+    assert list(data.columns) == ['Zeit', 'sO2', 'NStirrer', 'Zeit_FG', 'Note']
+    assert data['Zeit'].tolist() == ['00:02:00.010000', '1900-01-0100:00:06.912000', '00:06:00']
+    np.testing.assert_array_equal(data['sO2'].to_numpy(), [9.1, np.nan, np.nan])
+    assert data['NStirrer'].dtype == np.int64
+    assert data['Zeit_FG'].iloc[0] == '2024-10-1308:32:17' and pd.isna(data['Zeit_FG'].iloc[1])
+    assert data['Note'].tolist()[:2] == ['ab', '3']
+
+
+def test_read_sheet_unknown_sheet(workbook):
+    with pytest.raises(KeyError):
+        read_sheet(workbook, 'missing')
+
+
+def test_converted_sheet_loads_like_text(workbook, tmp_path):
+    directory = convert_sheet(workbook, 'onlindata_test', tmp_path / 'store' / 'online')
+    config = MagicMock()
+    config.get.return_value = {'offline_file': 'offline.txt', 'online_file': str(directory)}
+    loader = DataLoader(config, Path('/'), use_cache=False)
+
+    loader.online_data = loader.read_table(directory)
+    loader.process_online_time_column()
+
+    pd.testing.assert_frame_equal(loader.online_data[['Zeit', 'sO2']], read_sheet(workbook, 'onlindata_test')[['Zeit', 'sO2']])
+    np.testing.assert_allclose(loader.online_data['elapsed_hours'], [120.01 / 3600, 24 + 6.912 / 3600, 0.1], rtol=1e-6)
+
+
+def test_convert_excel_to_txt_converts_the_default_sheets(tmp_path):
+    files = []
+    for name in ('onlindata_HK_453', 'offlindata_HK_45'):
+        book = openpyxl.Workbook()
+        book.active.title = name
+        book.active.append(['Zeit', 'sO2'])
+        book.active.append(['00:02:00', 9.1])
+        files.append(tmp_path / f'{name}.xlsx')
+        book.save(files[-1])
+
+    directories = convert_excel_to_txt(files[0], files[1], tmp_path / 'data')
+
+    assert directories == [tmp_path / 'data' / 'onlindata_HK_453', tmp_path / 'data' / 'offlindata_HK_45']
+    assert all((directory / 'schema.json').is_file() for directory in directories)
@@ -0,0 +1,100 @@
+import json
+from unittest.mock import patch
+
+from instrumentation import StageRecorder
+
+
+def test_disabled_recorder_records_nothing():
+    recorder = StageRecorder(enabled=False)
+
+    with recorder.stage('parse', rows=10) as stage:
+        stage.rows = 20
+    assert recorder.stage('other') is stage
+    assert recorder.records == []
+
+
+def test_stage_records_time_rows_and_memory():
+    recorder = StageRecorder(enabled=True, trace_memory=True)
+
+    with recorder.stage('outer', input_bytes=4_000_000, file='a.txt') as stage:
+        with recorder.stage('inner', rows=1000):
+            buffer = bytearray(5_000_000)
+        del buffer
+        stage.rows = 1000
+
+    inner, outer = recorder.records
+    assert inner['name'] == 'inner' and inner['nested'] is True
+    assert inner['peak_memory_mb'] >= 5 and outer['peak_memory_mb'] >= 5
+    assert outer['file'] == 'a.txt' and outer['rows'] == 1000
+    assert outer['rows_per_second'] > 0 and outer['mb_per_second'] > 0
+    assert outer['seconds'] >= inner['seconds'] and outer['cpu_seconds'] >= 0
+    assert recorder.report()['stage_seconds'] == outer['seconds']
+
+
+def test_nested_stage_without_memory_trace_is_counted_once():
+    recorder = StageRecorder(enabled=True, trace_memory=False)
+
+    with recorder.stage('outer'):
+        with recorder.stage('inner'):
+            pass
+
+    inner, outer = recorder.records
+    assert inner['nested'] is True and 'nested' not in outer
+    assert recorder.report()['stage_seconds'] == outer['seconds']
+
+
+def test_stage_memory_without_reset_peak():
+    recorder = StageRecorder(enabled=True)
+
+    with patch('instrumentation._RESET_PEAK', False):
+        with recorder.stage('outer'):
+            with recorder.stage('inner'):
+                buffer = bytearray(5_000_000)
+
+    inner, outer = recorder.records
+    assert inner['peak_memory_mb'] >= 5 and outer['peak_memory_mb'] >= 5
+    assert len(buffer) == 5_000_000
+
+
+def test_failed_stage_is_recorded_and_reraised():
+    recorder = StageRecorder(enabled=True, trace_memory=False)
+
+    try:
+        with recorder.stage('parse'):
+            raise ValueError("bad file")
+    except ValueError:
+        pass
+
+    assert recorder.records[0]['status'] == 'failed'
+    assert recorder.records[0]['peak_memory_mb'] is None
+
+
+def test_report_and_summary(tmp_path):
+    recorder = StageRecorder(enabled=True, trace_memory=False)
+
+    for rows in (3, 3):
+        with recorder.stage('get_valid_masks') as stage:
+            stage.rows = rows
+    report_file = recorder.write_report(tmp_path / 'logs' / 'run_report.json')
+
+    report = json.loads(report_file.read_text())
+    assert [stage['rows'] for stage in report['stages']] == [3, 3]
+    assert report['total_seconds'] >= report['stage_seconds']
+    assert recorder.summary().startswith('get_valid_masks ')
+    assert recorder.summary().count('get_valid_masks') == 1
+
+
+def test_worker_stages_are_reported_apart_from_the_run_time():
+    recorder = StageRecorder(enabled=True, trace_memory=False)
+    worker_records = [{'name': 'kla_plot', 'seconds': 30.0, 'status': 'success'}]
+
+    with recorder.stage('load'):
+        recorder.extend(worker_records, worker=True)
+
+    report = recorder.report()
+    assert report['stages'][0]['worker'] is True and 'worker' not in worker_records[0]
+    assert report['worker_seconds'] == 30.0
+    assert report['total_seconds'] < 30.0
+    assert report['stage_seconds'] == report['stages'][1]['seconds']
+    assert 'kla_plot [workers] 30.00 s' in recorder.summary()
+    assert 'workers 30.00 s)' in recorder.summary()
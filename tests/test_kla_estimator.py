@@ -0,0 +1,50 @@
+import numpy as np
+from kla_estimator import estimate_kla, parse_kla_conditions
+
+
+def make_run(kla_per_h, dt=5.0, off=20, on=60, saturation=99.5):
+    time = np.arange(off + on) * dt
+    dissolved_oxygen = np.zeros(off + on)
+    since_step = time[off:] - time[off]
+    dissolved_oxygen[off:] = saturation * (1 - np.exp(-kla_per_h / 3600 * since_step))
+    stirrer = np.full(off + on, 400.0)
+    air = np.r_[np.zeros(off), np.full(on, 3.0)]
+    return time, dissolved_oxygen, stirrer, air
+
+
+def test_estimate_kla_recovers_rates_in_one_batch():
+    runs = [make_run(200.0), make_run(450.0, dt=2.5, off=35, on=90), make_run(300.0, on=40)]
+
+    results = estimate_kla(*zip(*runs))
+
+    np.testing.assert_allclose(results['kla'], [200.0, 450.0, 300.0], rtol=0.02)
+    assert np.all(results['r_squared'] > 0.99)
+    np.testing.assert_allclose(results['step_time'], [100.0, 87.5, 100.0])
+    np.testing.assert_allclose(results['stirrer_speed'], 400.0)
+
+
+def test_estimate_kla_matches_polyfit_on_noisy_data():
+    time, dissolved_oxygen, stirrer, air = make_run(250.0)
+    dissolved_oxygen[20:] += np.random.default_rng(0).normal(0, 0.3, 60)
+
+    results = estimate_kla([time], [dissolved_oxygen], [stirrer], [air], saturation_points=5)
+
+    saturation = dissolved_oxygen[-5:].mean()
+    fit = (np.arange(80) >= 20) & (dissolved_oxygen >= 0.1 * saturation) & (dissolved_oxygen <= 0.8 * saturation)
+    slope = np.polyfit(time[fit] - time[20], np.log(saturation - dissolved_oxygen[fit]), 1)[0]
+    np.testing.assert_allclose(results['kla'][0], -slope * 3600)
+    assert results['points'][0] == fit.sum()
+
+
+def test_estimate_kla_without_step_gives_nan():
+    time, dissolved_oxygen, stirrer, air = make_run(200.0)
+
+    results = estimate_kla([time], [dissolved_oxygen], [stirrer], [np.zeros_like(air)])
+
+    assert np.isnan(results['kla'][0]) and np.isnan(results['saturation'][0])
+
+
+def test_parse_kla_conditions():
+    assert parse_kla_conditions('Daten(klA)400rpm 3L') == (400.0, 3.0)
+    assert parse_kla_conditions('run_1000 rpm_1,5L.txt') == (1000.0, 1.5)
+    assert parse_kla_conditions('unknown.txt') == (None, None)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from kla_header import kla_time_index, parse_kla_header
+
+METADATA = [
+    '﻿;Measurement export;Project: 240930_BioRefineryTrainer; User: User; 13.10.2024 14:21:21;\r\n',
+    ';Measurement 1;Simulation measurement, Su 13.10.2024 14:15:46 ;\r\n',
+    ';Measurement start:;13.10.2024  14:15:50;\r\n',
+    ';Measurement finish:;13.10.2024  14:29:39;\r\n',
+    ';Time range:;13.10.2024  14:15:50;13.10.2024  14:29:39;\r\n',
+    ';Mean time:;5.000;\r\n',
+    ';\r\n',
+]
+
+
+def test_parse_kla_header():
+    header = parse_kla_header(METADATA)
+
+    assert header.start == np.datetime64('2024-10-13T14:15:50')
+    assert header.finish == np.datetime64('2024-10-13T14:29:39')
+    assert header.interval == 5.0 and header.duration == 829.0
+    assert header.metadata['Project'] == ['240930_BioRefineryTrainer']
+    assert header.metadata['Time range'] == ['13.10.2024  14:15:50', '13.10.2024  14:29:39']
+
+
+def test_parse_kla_header_without_metadata():
+    header = parse_kla_header([';Mean time:;n/a;\r\n'])
+
+    assert header.start is None and header.interval is None and header.duration is None
+    assert header.time_index(3) is None
+
+
+def test_time_index_truncates_to_whole_seconds():
+    header = parse_kla_header([';Measurement start:;09.10.2024  16:31:57;', ';Mean time:;2.500;'])
+
+    index = header.time_index(4)
+
+    assert np.diff(index).astype('timedelta64[s]').astype(int).tolist() == [2, 3, 2]
+
+
+def test_kla_time_index_falls_back_to_parsing():
+    header = parse_kla_header(METADATA)
+    regular = ['13.10.2024 14:15:50', '13.10.2024 14:15:55', '13.10.2024 14:16:00']
+    with_gap = ['13.10.2024 14:15:50', '13.10.2024 14:16:05', 'bad']
+
+    expected = pd.to_datetime(regular, format='%d.%m.%Y %H:%M:%S').to_numpy()
+    np.testing.assert_array_equal(kla_time_index(regular, header), expected)
+    result = kla_time_index(with_gap, header)
+    assert result[1] == np.datetime64('2024-10-13T14:16:05') and np.isnat(result[2])
+    np.testing.assert_array_equal(kla_time_index(regular, None), expected)
+
+
+def test_kla_time_index_checks_every_row():
+    header = parse_kla_header(METADATA)
+    expected = header.time_index(60)
+    times = [f"{pd.Timestamp(value):%d.%m.%Y %H:%M:%S}" for value in expected]
+    times[37] = 'garbage'
+    times[38] = '13.10.2024 15:00:00'
+    times[39] = times[39].replace(' ', '   ')
+
+    result = kla_time_index(times, header)
+
+    assert np.isnat(result[37]) and result[38] == np.datetime64('2024-10-13T15:00:00')
+    assert result[39] == expected[39]
+    np.testing.assert_array_equal(result, pd.to_datetime(
+        pd.Series(times).str.split().str.join(' '), format='%d.%m.%Y %H:%M:%S', errors='coerce').to_numpy())
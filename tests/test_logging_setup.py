@@ -0,0 +1,49 @@
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from logging_setup import (RateLimitFilter, configure_worker_logging, setup_logging, stop_logging,
+                           worker_logging_args)
+
+
+def make_record(level, msg, *args):
+    return logging.LogRecord('test', level, __file__, 1, msg, args, None)
+
+
+def test_rate_limit_filter_limits_debug_records_per_message():
+    rate_limit = RateLimitFilter(interval=0.05, burst=3)
+
+    passed = [rate_limit.filter(make_record(logging.DEBUG, "chunk %d", number)) for number in range(10)]
+    other = rate_limit.filter(make_record(logging.DEBUG, "other message"))
+    info = [rate_limit.filter(make_record(logging.INFO, "chunk %d", number)) for number in range(10)]
+    time.sleep(0.06)
+    record = make_record(logging.DEBUG, "chunk %d", 10)
+
+    assert passed == [True] * 3 + [False] * 7
+    assert other and all(info)
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "chunk 10 (7 similar messages suppressed)"
+
+
+def _log_from_worker(number):
+    logging.getLogger('worker').info("worker record %d", number)
+    return number
+
+
+def test_queued_logging_collects_records_from_worker_processes(tmp_path):
+    log_file = tmp_path / 'logs' / 'application.log'
+    setup_logging({'level': 'INFO', 'format': '%(name)s: %(message)s',
+                   'handlers': [{'type': 'file', 'filename': str(log_file)}]})
+    try:
+        logging.getLogger('main').info("main record %s", 'a')
+        logging.getLogger('main').debug("below the level")
+        with ProcessPoolExecutor(max_workers=2, initializer=configure_worker_logging,
+                                 initargs=worker_logging_args()) as executor:
+            list(executor.map(_log_from_worker, range(4)))
+    finally:
+        stop_logging()
+
+    lines = log_file.read_text().splitlines()
+    assert 'main: main record a' in lines
+    assert sorted(line for line in lines if line.startswith('worker')) == [f'worker: worker record {n}' for n in range(4)]
+    assert not any('below the level' in line for line in lines)
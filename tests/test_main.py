@@ -1,5 +1,9 @@
+import json
+import subprocess
+import sys
 from unittest.mock import patch, MagicMock
-from main import MainApp
+from config_loader import ConfigLoader
+from main import MainApp, main, parse_args
 import pytest
 from pathlib import Path
 
@@ -29,11 +33,24 @@ def test_run_success(app):
             patch('data_processor.DataProcessor.calculate_feed_time'), \
             patch('data_processor.DataProcessor.get_valid_masks'), \
             patch('plotter.Plotter.plot_data'):
-        app.run()
+        assert app.run() is True
 
     mock_load_data.assert_called_once()
 
 
+def test_run_failure_sets_exit_status():
+    with patch('main.MainApp.run', return_value=False) as mock_run, \
+            patch('main.ConfigLoader') as mock_config_loader, \
+            patch('main.setup_logging'):
+        mock_config_loader.return_value.get.side_effect = lambda section, key=None, default=None: {
+            'data_loader': {'offline_file': __file__, 'online_file': __file__},
+        }.get(section, default)
+        status = main(['plot'])
+
+    mock_run.assert_called_once()
+    assert status == 1
+
+
 def test_run_kla_workflow_success(app):
     kla_file = Path('/some/fake/path/kla_data.txt')
 
@@ -41,3 +58,148 @@ def test_run_kla_workflow_success(app):
             patch('data_processor.DataProcessor.preprocess_kla_data'), \
             patch('plotter.Plotter.plot_kla_data'):
         app.run_kla_workflow(kla_file)
+
+
+def test_run_kla_workflow_failure_returns_summary(app):
+    kla_file = Path('/some/fake/path/kla_data.txt')
+
+    with patch.object(app.data_loader, 'load_kla_data', side_effect=ValueError("bad file")):
+        summary = app.run_kla_workflow(kla_file)
+
+    assert summary['status'] == 'failed'
+    assert summary['error'] == 'bad file'
+
+
+def test_run_kla_batch_sequential_isolates_errors(app):
+    kla_files = [Path('a.txt'), Path('b.txt')]
+    summaries = [
+        {'file': 'a.txt', 'status': 'failed', 'rows': 0, 'plot': None, 'error': 'boom'},
+        {'file': 'b.txt', 'status': 'success', 'rows': 10, 'plot': 'b.png', 'error': None},
+    ]
+
+    with patch.object(app, 'run_kla_workflow', side_effect=summaries) as mock_run:
+        result = app.run_kla_batch(kla_files, workers=1)
+
+    assert mock_run.call_count == 2
+    assert [summary['status'] for summary in result] == ['failed', 'success']
+
+
+def test_run_kla_batch_builds_the_kla_template_once(tmp_path):
+    from plotter import Plotter
+
+    project_root = Path(__file__).resolve().parent.parent
+    config = ConfigLoader(project_root / 'config.yaml')
+    config.config['plotter']['plot_dir'] = str(tmp_path / 'plots')
+    kla_files = sorted((project_root / 'data' / 'data(kla)').glob('*.txt'))[:2]
+    app = MainApp(config, project_root, use_cache=False)
+
+    with patch.object(Plotter, '_build_kla_template', autospec=True,
+                      side_effect=Plotter._build_kla_template) as build, \
+            patch('plotter.plt.show') as show:
+        summaries = app.run_kla_batch(kla_files, workers=1)
+
+    assert [summary['status'] for summary in summaries] == ['success', 'success']
+    assert build.call_count == 1
+    show.assert_not_called()
+
+
+def test_run_kla_batch_process_pool(tmp_path):
+    project_root = Path(__file__).resolve().parent.parent
+    config = ConfigLoader(project_root / 'config.yaml')
+    config.config['plotter']['plot_dir'] = str(tmp_path / 'plots')
+    kla_files = sorted((project_root / 'data' / 'data(kla)').glob('*.txt'))[:2]
+    kla_files.append(tmp_path / 'missing.txt')
+
+    app = MainApp(config, project_root)
+    result = app.run_kla_batch(kla_files, workers=2)
+
+    assert [summary['file'] for summary in result] == [kla_file.name for kla_file in kla_files]
+    assert [summary['status'] for summary in result] == ['success', 'success', 'failed']
+    assert all(Path(summary['plot']).is_file() for summary in result[:2])
+    assert all('data' not in summary for summary in result)
+    assert list(app.kla_frames) == kla_files[:2]
+
+    with patch.object(app.data_loader, 'load_kla_files', return_value={}) as load:
+        table = app.run_kla_estimation(kla_files)
+
+    load.assert_called_once_with([kla_files[2]])
+    assert len(table) == 2
+
+
+def test_parse_args_jobs():
+    assert parse_args(['--jobs', '3']).jobs == 3
+    assert parse_args([]).jobs is None
+
+
+def test_parse_args_no_cache():
+    assert parse_args(['--no-cache']).no_cache is True
+    assert parse_args([]).no_cache is False
+
+
+def test_run_kla_estimation_writes_table(tmp_path):
+    project_root = Path(__file__).resolve().parent.parent
+    config = ConfigLoader(project_root / 'config.yaml')
+    config.config['plotter']['plot_dir'] = str(tmp_path / 'plots')
+    kla_files = sorted((project_root / 'data' / 'data(kla)').glob('*.txt'))
+    kla_files.append(tmp_path / 'missing.txt')
+
+    results = MainApp(config, project_root, use_cache=False).run_kla_estimation(kla_files)
+
+    assert len(results) == len(kla_files) - 1
+    assert results['kla'].notna().all() and (results['kla'] > 0).all()
+    assert (tmp_path / 'plots' / 'kla_results.csv').is_file()
+
+
+def test_run_with_instrumentation_writes_report(tmp_path):
+    project_root = Path(__file__).resolve().parent.parent
+    config = ConfigLoader(project_root / 'config.yaml')
+    config.config['plotter'].update({'plot_dir': str(tmp_path / 'plots'), 'dpi': 50, 'headless': True})
+    config.config['instrumentation'] = {'enabled': True, 'report_file': str(tmp_path / 'run_report.json')}
+    kla_files = sorted((project_root / 'data' / 'data(kla)').glob('*.txt'))[:2]
+
+    app = MainApp(config, project_root, use_cache=False)
+    app.run()
+    app.run_kla_batch(kla_files, workers=2)
+    report = json.loads(app.write_run_report().read_text())
+
+    names = [stage['name'] for stage in report['stages']]
+    # The schema types the numeric columns while parsing, so there is no numeric_conversion stage
+    assert names[:3] == ['parse', 'time_conversion', 'plot']
+    assert names.count('kla_load') == 2 and names.count('kla_plot') == 2
+    assert report['stages'][0]['rows'] > 0 and report['stages'][0]['peak_memory_mb'] > 0
+    assert set(report['stages'][2]['details']) == {'build', 'update', 'save'}
+
+
+def test_parse_args_instrument():
+    assert parse_args(['--instrument']).instrument is True
+    assert parse_args([]).instrument is False
+
+
+def test_parse_args_commands():
+    assert parse_args([]).command == 'all'
+    assert parse_args(['validate']).command == 'load'
+    assert parse_args(['kla', '--jobs', '2']).jobs == 2
+    assert parse_args(['--jobs', '3', 'kla']).jobs == 3
+    assert parse_args(['--no-cache', 'process']).no_cache is True
+
+
+def test_import_main_is_lightweight():
+    src = Path(__file__).resolve().parent.parent / 'src'
+    code = (
+        f"import sys; sys.path.insert(0, {str(src)!r}); import main; "
+        "print(sorted(m for m in ('pandas', 'matplotlib', 'seaborn', 'numpy') if m in sys.modules))"
+    )
+
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == '[]'
+
+
+def test_validate_reports_missing_columns():
+    project_root = Path(__file__).resolve().parent.parent
+    config = ConfigLoader(project_root / 'config.yaml')
+    app = MainApp(config, project_root, use_cache=False)
+    assert app.validate() == []
+
+    config.config['data_processor']['online_numeric_columns'] = ['sO2', 'pressure']
+    assert MainApp(config, project_root, use_cache=False).validate() == ["Online column 'pressure' is missing."]
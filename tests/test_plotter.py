@@ -82,3 +82,41 @@ def test_plot_data_success(plotter):
         handles, labels = ax.get_legend_handles_labels()
         assert isinstance(handles, list)
         assert isinstance(labels, list)
+
+
+def test_plot_data_headless_threads(mock_processor, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    import matplotlib.pyplot as plt
+
+    config = {'plot_dir': str(tmp_path), 'headless': True, 'dpi': 20}
+    plotter = Plotter(processor=mock_processor, config=config)
+
+    with patch('plotter.plt.show') as mock_show:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            paths = list(executor.map(lambda i: plotter.plot_data(filename=f"plot_{i}.png"), range(4)))
+
+    mock_show.assert_not_called()
+    assert all(path.is_file() for path in paths)
+    assert plt.get_fignums() == []
+
+
+def test_plot_data_reuses_template(mock_processor, tmp_path):
+    config = {'plot_dir': str(tmp_path), 'headless': True, 'dpi': 20}
+    plotter = Plotter(processor=mock_processor, config=config)
+
+    plotter.plot_data(filename='first.png')
+    figure = plotter._templates()['main']['figure']
+    assert plotter.render_timings['build'] > 0
+
+    mock_processor.online_data['sCO2'] = [40, 50, 60]
+    plotter.plot_data(filename='second.png')
+
+    template = plotter._templates()['main']
+    assert template['figure'] is figure
+    assert plotter.render_timings['build'] == 0.0
+    assert set(plotter.render_timings) == {'build', 'update', 'save'}
+    assert list(template['lines']['CO2'].get_ydata()) == [40, 50, 60]
+    assert (tmp_path / 'second.png').is_file()
+
+    plotter.close()
+    assert plotter._templates() == {}
@@ -0,0 +1,31 @@
+import numpy as np
+
+from resampling import interpolate_to_grid, nearest_to_grid
+
+
+def test_interpolate_to_grid_matches_np_interp():
+    x = np.array([0.0, 0.5, 1.5, np.nan, 3.0])
+    values = np.column_stack([[1.0, 2.0, 4.0, 9.0, 5.0], [0.0, 1.0, 0.0, 9.0, np.nan]])
+    grid = np.array([-1.0, 0.0, 0.25, 1.0, 2.0, 3.0, 4.0])
+
+    result = interpolate_to_grid(x, values, grid)
+
+    valid = ~np.isnan(x)
+    expected = np.interp(grid[1:6], x[valid], values[valid, 0])
+    np.testing.assert_allclose(result[1:6, 0], expected)
+    assert np.isnan(result[[0, 6]]).all()
+    np.testing.assert_allclose(result[1:4, 1], [0.0, 0.5, 0.5])
+    assert np.isnan(result[[0, 4, 5, 6], 1]).all()  # Outside the valid samples of the second signal
+    assert np.isnan(interpolate_to_grid(x, values, grid, max_gap=1.0)[4]).all()
+
+
+def test_nearest_to_grid_uses_valid_samples_within_tolerance():
+    x = np.array([0.0, 1.0, 2.0, 3.0])
+    values = np.column_stack([[10.0, 11.0, 12.0, 13.0], [5.0, np.nan, np.nan, 8.0]])
+    grid = np.array([2.4, 0.5, np.nan, 9.0])
+
+    result = nearest_to_grid(x, values, grid)
+
+    np.testing.assert_allclose(result[[0, 1, 3]], [[12.0, 8.0], [10.0, 5.0], [13.0, 8.0]])
+    assert np.isnan(result[2]).all()
+    assert np.isnan(nearest_to_grid(x, values, grid, tolerance=1.0)[3]).all()
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from time_parser import elapsed_hours, parse_elapsed_time
+
+NAT = np.iinfo(np.int64).min
+
+
+def test_parse_elapsed_time_keeps_fractional_seconds():
+    offsets = parse_elapsed_time(pd.Series(['00:02:00.010000', '12:00:00.5', '01:02:03']))
+
+    assert offsets.tolist() == [120_010_000_000, 43_200_500_000_000, 3_723_000_000_000]
+
+
+def test_parse_elapsed_time_excel_day_prefix():
+    offsets = parse_elapsed_time(pd.Series([
+        '1900-01-0100:00:06.912000',
+        '1900-01-02 01:00:00',
+        '1900-03-01T00:00:00'
+    ]))
+
+    assert elapsed_hours(offsets).tolist() == [24 + 6.912 / 3600, 49.0, 61 * 24.0]
+
+
+def test_parse_elapsed_time_excel_leap_day():
+    offsets = parse_elapsed_time(pd.Series(['1900-02-2823:00:00', '1900-02-2900:00:00', '1900-02-29 12:00:00',
+                                            '1900-03-0100:00:00']))
+
+    assert elapsed_hours(offsets).tolist() == [59 * 24 + 23.0, 60 * 24.0, 60 * 24 + 12.0, 61 * 24.0]
+
+
+def test_parse_elapsed_time_invalid_values():
+    offsets = parse_elapsed_time(pd.Series(['nan', None, np.nan, '12:61:00', '1:00:00', '12:00:00.', 'bad']))
+
+    assert (offsets == NAT).all()
+    assert np.isnan(elapsed_hours(offsets)).all()
+
+
+def test_parse_elapsed_time_empty():
+    assert parse_elapsed_time(pd.Series([], dtype=object)).size == 0
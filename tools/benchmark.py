@@ -0,0 +1,207 @@
+# benchmark.py
+"""Benchmark the loading, processing and plotting stages on synthetic data of growing size."""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT / 'src') not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import yaml  # noqa: E402
+
+from tools.data_generator import generate_dataset, parse_size  # noqa: E402
+
+DEFAULT_SIZES = ['10k', '100k', '1M', '10M']
+
+
+def write_config(directory: Path, files: Dict[str, Any]) -> Path:
+    """
+    Write a config.yaml for the generated files, based on the project configuration.
+
+    :param directory: Directory of the generated files.
+    :param files: Paths returned by generate_dataset().
+    :return: Path of the written configuration.
+    """
+    with open(PROJECT_ROOT / 'config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+    config['data_loader'].update({
+        'offline_file': str(files['offline']),
+        'online_file': str(files['online']),
+        'kla_dir': str(files['kla'][0].parent),
+        'chunk_size': None,
+        'cache': {'enabled': False},
+    })
+    config['plotter'].update({'plot_dir': str(directory / 'plots'), 'dpi': 100, 'headless': True})
+    config_path = directory / f"config_{files['online'].stem}.yaml"
+    with open(config_path, 'w') as file:
+        yaml.safe_dump(config, file)
+    return config_path
+
+
+def run_size(rows: int, data_dir: Path, plot: bool = True, trace_memory: bool = True) -> Dict[str, Any]:
+    """
+    Generate (or reuse) the files for one size and run every stage on them.
+
+    :param rows: Number of online and KLA rows.
+    :param data_dir: Directory of the generated files.
+    :param plot: Whether to include the plotting stage.
+    :param trace_memory: Whether to trace the peak memory of each stage.
+    :return: Result for this size with the per-stage records.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from config_loader import ConfigLoader
+    from data_loader import DataLoader
+    from data_processor import DataProcessor
+    from instrumentation import StageRecorder
+    from plotter import Plotter
+
+    data_dir = Path(data_dir)
+    generation_start = time.perf_counter()
+    files = generate_dataset(data_dir, rows)
+    generation_seconds = time.perf_counter() - generation_start
+    config = ConfigLoader(write_config(data_dir, files))
+    online_bytes = files['online'].stat().st_size
+    offline_bytes = files['offline'].stat().st_size
+    kla_file = files['kla'][0]
+    kla_bytes = kla_file.stat().st_size
+
+    recorder = StageRecorder(enabled=True, trace_memory=trace_memory)
+    loader = DataLoader(config, PROJECT_ROOT, use_cache=False)
+    with recorder.stage('load_data', rows, online_bytes + offline_bytes):
+        loader.load_data()
+    with recorder.stage('process_online_time_column', rows):
+        loader.process_online_time_column()
+    with recorder.stage('convert_columns_to_numeric', rows):
+        loader.convert_columns_to_numeric(config.get('data_processor', 'online_numeric_columns', []))
+
+    processor = DataProcessor(loader.offline_data, loader.online_data)
+    processor.extract_offline_columns()
+    with recorder.stage('calculate_feed_time', rows):
+        processor.calculate_feed_time()
+    with recorder.stage('get_valid_masks', rows):
+        processor.get_valid_masks()
+    if plot:
+        plotter = Plotter(processor=processor, config=config.get('plotter'))
+        with recorder.stage('plot_data', rows) as stage:
+            plotter.plot_data(filename=f'benchmark_{rows}.png', show=False)
+            stage.details = dict(plotter.render_timings)
+        plotter.close()
+
+    with recorder.stage('load_kla_data', rows, kla_bytes):
+        kla_data = loader.load_kla_data(str(kla_file))
+    with recorder.stage('preprocess_kla_data', rows):
+        kla_data = processor.preprocess_kla_data(kla_data)
+    with recorder.stage('estimate_kla', rows):
+        processor.estimate_kla({kla_file.stem: kla_data})
+    stages = recorder.records
+
+    # Peak resident set size of this process (kilobytes on Linux, bytes on macOS)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    max_rss_mb = max_rss / 1e6 if sys.platform == 'darwin' else max_rss / 1e3
+    return {
+        'rows': rows,
+        'files': {'online_bytes': online_bytes, 'offline_bytes': offline_bytes, 'kla_bytes': kla_bytes},
+        'generation_seconds': generation_seconds,
+        'total_seconds': sum(stage['seconds'] for stage in stages),
+        'max_rss_mb': max_rss_mb,
+        'stages': stages,
+    }
+
+
+def run_benchmark(sizes: List[str], data_dir: Path, plot: bool = True, trace_memory: bool = True) -> Dict[str, Any]:
+    """
+    Run the benchmark for every size, each in a fresh process so that its peak memory is its own.
+
+    :param sizes: Row counts such as '10k' or '1M'.
+    :param data_dir: Directory of the generated files.
+    :param plot: Whether to include the plotting stage.
+    :param trace_memory: Whether to trace the peak memory of each stage.
+    :return: Benchmark report.
+    """
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for size in sizes:
+        rows = parse_size(size)
+        print(f"Benchmarking {rows} rows...", file=sys.stderr)
+        with context.Pool(1) as pool:
+            results.append(pool.apply(run_size, (rows, data_dir, plot, trace_memory)))
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'trace_memory': trace_memory,
+        'results': results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Find stages that got slower than a baseline report by more than the tolerance.
+
+    :param report: Current benchmark report.
+    :param baseline: Earlier benchmark report.
+    :param tolerance: Allowed relative slowdown, e.g. 0.2 for 20 %.
+    :return: One message per regressed stage.
+    """
+    previous = {
+        (result['rows'], stage['name']): stage['seconds']
+        for result in baseline.get('results', []) for stage in result['stages']
+    }
+    regressions = []
+    for result in report['results']:
+        for stage in result['stages']:
+            before = previous.get((result['rows'], stage['name']))
+            if before and stage['seconds'] > before * (1 + tolerance):
+                regressions.append(
+                    f"{stage['name']} at {result['rows']} rows: {before:.3f} s -> {stage['seconds']:.3f} s"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark data_handler on synthetic data.')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help='Row counts, e.g. 10k 100k 1M 10M.')
+    parser.add_argument('--data-dir', type=Path, default=PROJECT_ROOT / '.cache' / 'benchmark',
+                        help='Directory for the generated files (reused between runs).')
+    parser.add_argument('--output', type=Path, default=None, help='Write the JSON report to this file.')
+    parser.add_argument('--baseline', type=Path, default=None,
+                        help='Earlier JSON report; exit with status 1 if a stage got slower.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative slowdown (default 0.2).')
+    parser.add_argument('--no-plot', action='store_true', help='Skip the plotting stage.')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Do not trace the peak memory per stage (tracemalloc slows the stages down).')
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.sizes, args.data_dir, plot=not args.no_plot, trace_memory=not args.no_memory)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+        for message in regressions:
+            print(f"Regression: {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
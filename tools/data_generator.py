@@ -0,0 +1,263 @@
+# data_generator.py
+"""Generate synthetic offline, online and KLA files in the formats of the real exports."""
+import argparse
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Rows formatted and written at a time, which bounds the generator's memory use
+WRITE_CHUNK_ROWS = 500_000
+
+ONLINE_COLUMNS = ['Zeit', 'spH', 'spO2', 'NStirrer', 'sTR', 'sCO2', 'sO2', 'FAirIn', 'sVR',
+                  'Zeit_FG', 'FGlucose', 'Zeit_FN', 'Fstickstoff']
+KLA_COLUMNS = ['spO2', 'sO2', 'sCO2', 'NStirrer', 'FAirIn', 'FO2In']
+KLA_UNITS = ['%', '%', '%', '1/min', 'L/min', 'L/min']
+
+# Start of the simulated runs
+RUN_START = np.datetime64('2024-10-13T08:32:17')
+
+# Excel renders elapsed durations of one day or more as a 1900 date (serial 1 is 1900-01-01)
+EXCEL_DAY_ZERO = np.datetime64('1899-12-31', 'D')
+
+
+def parse_size(size: str) -> int:
+    """
+    Parse a row count such as '10k', '1M' or '2500'.
+
+    :param size: Row count with an optional 'k' or 'M' suffix.
+    :return: Number of rows.
+    """
+    multipliers = {'k': 1_000, 'K': 1_000, 'm': 1_000_000, 'M': 1_000_000}
+    if size and size[-1] in multipliers:
+        return int(float(size[:-1]) * multipliers[size[-1]])
+    return int(size)
+
+
+def format_elapsed(nanoseconds: np.ndarray) -> np.ndarray:
+    """
+    Format elapsed times like the online 'Zeit' column: 'HH:MM:SS.ffffff', prefixed by
+    the Excel 1900 date of the elapsed day from the first day on.
+
+    :param nanoseconds: Elapsed times in nanoseconds.
+    :return: Array of strings.
+    """
+    microseconds = nanoseconds // 1000
+    days, rest = np.divmod(microseconds, 86_400_000_000)
+    seconds, fraction = np.divmod(rest, 1_000_000)
+    # 'HH:MM:SS' from the ISO rendering of the seconds within the day
+    clock = pd.Series((np.datetime64('1970-01-01T00:00:00', 's') + seconds.astype('timedelta64[s]')).astype('U19'))
+    text = (clock.str[11:] + '.' + pd.Series(fraction.astype('U6')).str.zfill(6)).to_numpy(dtype=str)
+    # Excel counts the fictitious 1900-02-29, so dates from March 1900 on are one day earlier
+    dates = EXCEL_DAY_ZERO + days.astype('timedelta64[D]')
+    dates = dates - (dates >= np.datetime64('1900-03-01')).astype('timedelta64[D]')
+    prefixed = np.char.add(dates.astype('U10'), text)
+    return np.where(days > 0, prefixed, text)
+
+
+def generate_online(file_path: Path, rows: int, duration_hours: float = 48.0, seed: int = 0) -> Path:
+    """
+    Write a tab-separated online export with the columns of the real files.
+
+    The elapsed time covers duration_hours; after one day it carries the Excel date
+    prefix. Feed timestamps and set points stop after the first 2 % of the rows, and
+    the last rows have no time, as in the real exports.
+
+    :param file_path: Path of the file to write.
+    :param rows: Number of data rows.
+    :param duration_hours: Length of the simulated run.
+    :param seed: Seed of the random noise.
+    :return: The file path.
+    """
+    rng = np.random.default_rng(seed)
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    interval_ns = int(duration_hours * 3600e9 / max(rows, 1))
+    feed_rows = max(1, rows // 50)
+    with open(file_path, 'w', newline='') as file:
+        file.write('\t'.join(ONLINE_COLUMNS) + '\n')
+        for start in range(0, rows, WRITE_CHUNK_ROWS):
+            index = np.arange(start, min(start + WRITE_CHUNK_ROWS, rows))
+            count = len(index)
+            progress = index / max(rows - 1, 1)
+            elapsed = (index + 1) * interval_ns + rng.integers(0, 20_000_000, count)
+            feeding = index < feed_rows
+            feed_time = (RUN_START + (index * 5).astype('timedelta64[s]')).astype('U19')
+            feed_time = np.where(feeding, np.char.replace(feed_time, 'T', ''), 'NaT')
+            chunk = pd.DataFrame({
+                'Zeit': format_elapsed(elapsed),
+                'spH': np.round(6.9 - 0.7 * progress + rng.normal(0, 0.05, count), 1),
+                'spO2': np.where(feeding, 10.3, np.nan),
+                'NStirrer': np.where(feeding, 500.0, np.nan),
+                'sTR': np.round(19.8 + 11.5 * np.minimum(progress * 20, 1) + rng.normal(0, 0.1, count), 1),
+                'sCO2': np.where(feeding, 1.9, np.nan),
+                'sO2': np.where(feeding, 9.1, np.nan),
+                'FAirIn': np.where(feeding, 9.0, np.nan),
+                'sVR': np.round(0.1 + 13.2 * progress, 1),
+                'Zeit_FG': feed_time,
+                'FGlucose': np.where(feeding, 2.0, np.nan),
+                'Zeit_FN': feed_time,
+                'Fstickstoff': np.where(feeding, 1.0, np.nan),
+            })
+            if start + count == rows:
+                chunk.loc[chunk.index[-min(2, count):], 'Zeit'] = 'nan'
+            chunk.to_csv(file, sep='\t', index=False, header=False, na_rep='nan', float_format='%.1f')
+    return file_path
+
+
+def generate_offline(file_path: Path, rows: int, seed: int = 0) -> Path:
+    """
+    Write a tab-separated offline export with sampling times and concentrations.
+
+    :param file_path: Path of the file to write.
+    :param rows: Number of samples.
+    :param seed: Seed of the random noise.
+    :return: The file path.
+    """
+    rng = np.random.default_rng(seed)
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    hours = np.arange(rows) * 2
+    progress = np.arange(rows) / max(rows - 1, 1)
+    data = pd.DataFrame({
+        'Zeit_BTM': hours,
+        'BTM': np.round(2.0 + 13.0 * progress + rng.normal(0, 0.2, rows), 2),
+        'Zeit_G': hours,
+        'Glu': np.round(np.clip(16.4 * (1 - 2 * progress), 0.05, None), 2),
+        'Zeit_N': hours,
+        'N': np.round(8.2 + 20 * progress, 2),
+        'Zeit_E': hours,
+        'EtOH': np.round(np.clip(5 * np.sin(np.pi * progress), 0.01, None), 2),
+    })
+    data.to_csv(file_path, sep='\t', index=False)
+    return file_path
+
+
+def generate_kla(
+    file_path: Path,
+    rows: int,
+    rpm: float = 400.0,
+    volume: float = 3.0,
+    kla_per_h: Optional[float] = None,
+    interval_s: int = 5,
+    seed: int = 0
+) -> Path:
+    """
+    Write a UTF-16 KLA export of a dynamic gassing-in experiment.
+
+    Nitrogen stripping brings spO2 to zero; from 80 % of the rows on, air flows at
+    volume L/min and spO2 recovers with the given kLa.
+
+    :param file_path: Path of the file to write.
+    :param rows: Number of data rows.
+    :param rpm: Stirrer speed.
+    :param volume: Volume in L, also used as the air flow in L/min.
+    :param kla_per_h: kLa of the recovery in 1/h (default: proportional to the stirrer speed).
+    :param interval_s: Seconds between samples.
+    :param seed: Seed of the random noise.
+    :return: The file path.
+    """
+    rng = np.random.default_rng(seed)
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    kla_per_h = kla_per_h if kla_per_h is not None else 0.6 * rpm
+    start = RUN_START
+    finish = start + np.timedelta64(interval_s * max(rows - 1, 0), 's')
+    step = int(rows * 0.8)
+
+    def kla_time(value: np.datetime64) -> str:
+        return pd.Timestamp(value).strftime('%d.%m.%Y  %H:%M:%S')
+
+    header = [
+        f";Measurement export;Project: synthetic; User: User; Computer: generator; {kla_time(start)};{kla_time(start)};",
+        f";Measurement 1;Simulation measurement {rpm:g}rpm {volume:g}L ;",
+        f";Measurement start:;{kla_time(start)};",
+        f";Measurement finish:;{kla_time(finish)};",
+        f";Time range:;{kla_time(start)};{kla_time(finish)};",
+        f";Mean time:;{interval_s:.3f};",
+        ";",
+        "Time                      ;" + ";".join(f"{name:<5}" for name in KLA_COLUMNS) + ";",
+        "                          ;" + ";".join(
+            f"{unit:<{max(5, len(name))}}" for name, unit in zip(KLA_COLUMNS, KLA_UNITS)
+        ) + ";",
+        ";",
+    ]
+    with open(file_path, 'wb') as file:
+        file.write('\ufeff'.encode('utf-16-le'))
+        file.write(('\r\n'.join(header) + '\r\n').encode('utf-16-le'))
+        for chunk_start in range(0, rows, WRITE_CHUNK_ROWS):
+            index = np.arange(chunk_start, min(chunk_start + WRITE_CHUNK_ROWS, rows))
+            count = len(index)
+            seconds = index * interval_s
+            iso = (start + seconds.astype('timedelta64[s]')).astype('U19')
+            # 'YYYY-MM-DDTHH:MM:SS' -> 'DD.MM.YYYY HH:MM:SS' padded to the column width
+            series = pd.Series(iso)
+            times = (series.str[8:10] + '.' + series.str[5:7] + '.' + series.str[0:4] + ' '
+                     + series.str[11:19]).str.ljust(26)
+            aerating = index >= step
+            since_step = np.maximum(seconds - step * interval_s, 0)
+            dissolved_oxygen = np.where(
+                aerating, 99.5 * (1 - np.exp(-kla_per_h / 3600 * since_step)), 0.0
+            ) + np.abs(rng.normal(0, 0.05, count))
+            chunk = pd.DataFrame({
+                'Time': times,
+                'spO2': np.clip(dissolved_oxygen, 0, 100),
+                'sO2': np.where(aerating, 20.9, 0.0),
+                'sCO2': np.where(aerating, 0.1, 0.0),
+                'NStirrer': np.full(count, float(rpm)),
+                'FAirIn': np.where(aerating, float(volume), 0.0),
+                'FO2In': np.zeros(count),
+            })
+            text = chunk.to_csv(
+                sep=';', index=False, header=False, decimal=',', float_format='%5.1f', lineterminator=';\r\n'
+            )
+            file.write(text.encode('utf-16-le'))
+    return file_path
+
+
+def generate_dataset(directory: Path, rows: int, kla_files: int = 1, seed: int = 0) -> dict:
+    """
+    Generate an online, an offline and kla_files KLA files of the given size.
+
+    The online and KLA files get rows data rows; the offline file gets one sample
+    per 1000 rows (at least 12). Files that already exist are kept.
+
+    :param directory: Directory for the files.
+    :param rows: Number of rows.
+    :param kla_files: Number of KLA files, with stirrer speeds from 400 rpm up.
+    :param seed: Seed of the random noise.
+    :return: Dictionary with the paths of the 'online', 'offline' and 'kla' files.
+    """
+    directory = Path(directory)
+    online = directory / f'online_{rows}.txt'
+    offline = directory / f'offline_{rows}.txt'
+    kla_dir = directory / f'kla_{rows}'
+    if not online.is_file():
+        generate_online(online, rows, seed=seed)
+    if not offline.is_file():
+        generate_offline(offline, max(12, rows // 1000), seed=seed)
+    kla = []
+    for number in range(kla_files):
+        rpm = 400 + 100 * number
+        kla_file = kla_dir / f'Daten(klA){rpm}rpm 3L.txt'
+        if not kla_file.is_file():
+            generate_kla(kla_file, rows, rpm=rpm, seed=seed + number)
+        kla.append(kla_file)
+    return {'online': online, 'offline': offline, 'kla': kla}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Generate synthetic offline, online and KLA files.')
+    parser.add_argument('directory', type=Path, help='Output directory.')
+    parser.add_argument('--rows', nargs='+', default=['10k'], help="Row counts, e.g. 10k 100k 1M 10M.")
+    parser.add_argument('--kla-files', type=int, default=1, help='Number of KLA files per size.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for size in args.rows:
+        files = generate_dataset(args.directory, parse_size(size), kla_files=args.kla_files, seed=args.seed)
+        print(f"{size}: {files['online']}, {files['offline']}, {len(files['kla'])} KLA file(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,196 @@
-import os
-import pandas as pd
+# excel_converter.py
+"""Convert sheets of the bioreactor Excel exports into run store directories that DataLoader reads directly."""
+import argparse
+import logging
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, List, Optional
 
-# Define function to clean and convert Excel sheets to tab-separated TXT files
-def clean_and_convert_to_txt(sheet_data, output_txt_file):
-    """Cleans the sheet data by removing spaces and saving as a tab-separated TXT file."""
-    # Remove spaces from column names
-    sheet_data.columns = sheet_data.columns.str.replace(' ', '', regex=False)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT / 'src') not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT / 'src'))
 
-    # Remove spaces from all cells (including numeric and mixed types)
-    sheet_data_cleaned = sheet_data.astype(str).apply(lambda x: x.str.replace(' ', '', regex=False))
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
 
-    # Save the cleaned data into a tab-separated TXT file
-    sheet_data_cleaned.to_csv(output_txt_file, sep='\t', index=False)
+from data_cache import write_frame_atomic  # noqa: E402
+from data_loader import MISSING_TOKENS  # noqa: E402
 
-def convert_excel_to_txt(excel_file_1, excel_file_2, output_dir):
-    """Converts two Excel files into tab-separated TXT files and saves them to the output directory."""
-    # Load the Excel sheets from both files
-    data_1 = pd.read_excel(excel_file_1, sheet_name=None)  # Load all sheets from the first file
-    data_2 = pd.read_excel(excel_file_2, sheet_name=None)  # Load all sheets from the second file
+logger = logging.getLogger(__name__)
 
-    # Print available sheet names for debugging
-    print(f"Available sheets in {os.path.basename(excel_file_1)}: {list(data_1.keys())}")
-    print(f"Available sheets in {os.path.basename(excel_file_2)}: {list(data_2.keys())}")
+DEFAULT_FILES = [PROJECT_ROOT / 'data' / 'excel' / 'onlindata_HK_453.xlsx',
+                 PROJECT_ROOT / 'data' / 'excel' / 'offlindata_HK_45.xlsx']
 
-    # Define the output paths for the cleaned TXT files in the output directory
-    output_cleaned_txt_1 = os.path.join(output_dir, 'onlindata_HK_453.txt')
-    output_cleaned_txt_2 = os.path.join(output_dir, 'offlindata_HK_45.txt')
 
-    # Ensure correct sheet name access (adjust based on sheet names in your Excel files)
-    clean_and_convert_to_txt(data_1['onlindata_HK_453'], output_cleaned_txt_1)
-    clean_and_convert_to_txt(data_2['offlindata_HK_45'], output_cleaned_txt_2)
+class _ColumnBuffer:
+    """Collects the cells of one column, typed as numbers until the first text cell arrives."""
 
-    print(f'Files have been cleaned and converted to {output_cleaned_txt_1} and {output_cleaned_txt_2}')
+    def __init__(self):
+        self.numbers: Optional[array] = array('d')
+        self.texts: List[Optional[str]] = []
+        self.integers = True  # Every cell so far is an integer (and none is missing)
 
-if __name__ == "__main__":
-    # Define paths to the Excel files in the `data/excel/` directory
-    excel_file_1 = '../data/excel/onlindata_HK_453.xlsx'
-    excel_file_2 = '../data/excel/offlindata_HK_45.xlsx'
+    def append(self, value: Any) -> None:
+        """
+        Append one cell value as read from the sheet.
+
+        Numbers stay numbers. Text, times and dates are stored as text with their
+        spaces removed, as in the tab-separated exports (e.g. '1900-01-0100:00:06.912000').
+
+        :param value: Cell value, or None for an empty cell.
+        """
+        if isinstance(value, str):
+            value = value.replace(' ', '')
+            if value in MISSING_TOKENS:
+                value = None
+        elif value is not None and not isinstance(value, (int, float)):
+            value = str(value).replace(' ', '')  # datetime.time, datetime.datetime, ...
+
+        if self.numbers is not None:
+            if value is None:
+                self.numbers.append(np.nan)
+                self.integers = False
+                return
+            if not isinstance(value, str):
+                self.numbers.append(value)
+                self.integers = self.integers and float(value).is_integer()
+                return
+            # First text cell: the column holds text from now on
+            self.texts = [self._format_number(number) for number in self.numbers]
+            self.numbers = None
+        if value is None or isinstance(value, str):
+            self.texts.append(value)
+        else:
+            self.texts.append(self._format_number(value))
+
+    @staticmethod
+    def _format_number(number: float) -> Optional[str]:
+        """
+        Render a number that precedes text in the same column.
+
+        :param number: Cell value.
+        :return: The number as text, or None if it is missing.
+        """
+        if number != number:  # NaN
+            return None
+        return str(int(number)) if float(number).is_integer() else str(number)
+
+    def to_array(self) -> np.ndarray:
+        """
+        Return the column as an int64, float64 or object array.
+
+        :return: Column values.
+        """
+        if self.numbers is None:
+            return np.array(self.texts, dtype=object)
+        values = np.frombuffer(self.numbers, dtype=np.float64)
+        return values.astype(np.int64) if self.integers and len(values) else values.copy()
+
+
+def read_sheet(excel_file: Path, sheet_name: str) -> pd.DataFrame:
+    """
+    Read one sheet of an Excel workbook into a typed DataFrame, streaming its rows.
+
+    The workbook is opened in read-only mode, so only the named sheet is parsed and
+    its rows are not kept as cell objects. Spaces are removed from the column names
+    and from text cells; numeric cells stay numeric. Empty rows are skipped.
+
+    :param excel_file: Path to the .xlsx workbook.
+    :param sheet_name: Name of the sheet to read.
+    :return: DataFrame with int64 or float64 columns for numeric columns and text columns otherwise.
+    """
+    try:
+        import openpyxl
+    except ImportError:
+        logger.error("Reading Excel workbooks requires the 'openpyxl' package.")
+        raise
+
+    logger.info("Reading sheet '%s' from %s", sheet_name, Path(excel_file).resolve())
+    workbook = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        if sheet_name not in workbook.sheetnames:
+            logger.error("Sheet '%s' not found in %s; available: %s", sheet_name, excel_file, workbook.sheetnames)
+            raise KeyError(f"Sheet '{sheet_name}' not found in {excel_file}")
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+
+        positions = [position for position, name in enumerate(header) if name is not None]
+        names = [str(header[position]).replace(' ', '') for position in positions]
+        buffers = [_ColumnBuffer() for _ in positions]
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            for position, buffer in zip(positions, buffers):
+                buffer.append(row[position] if position < len(row) else None)
+    finally:
+        workbook.close()
 
-    # Output directory where the TXT files will be saved
-    output_dir = '../data'
+    data = pd.DataFrame({name: buffer.to_array() for name, buffer in zip(names, buffers)}, columns=names)
+    logger.info("Read %s rows and %s columns from sheet '%s'.", len(data), len(names), sheet_name)
+    return data
 
-    # Convert Excel to TXT
-    convert_excel_to_txt(excel_file_1, excel_file_2, output_dir)
+
+def convert_sheet(excel_file: Path, sheet_name: str, directory: Path) -> Path:
+    """
+    Convert one sheet into a run store directory (see data_cache.write_frame()).
+
+    The directory can be used as 'offline_file' or 'online_file' in the configuration,
+    or opened with DataLoader.import_data(). An existing directory is replaced.
+
+    :param excel_file: Path to the .xlsx workbook.
+    :param sheet_name: Name of the sheet to convert.
+    :param directory: Directory of the run store entry.
+    :return: The directory.
+    """
+    data = read_sheet(excel_file, sheet_name)
+    directory = Path(directory)
+    try:
+        write_frame_atomic(directory, data)
+    except Exception as e:
+        logger.error("Error writing the run store %s: %s", directory, e)
+        raise
+    logger.info("Sheet '%s' converted to %s", sheet_name, directory.resolve())
+    return directory
+
+
+def convert_excel_to_txt(excel_file_1: Path, excel_file_2: Path, output_dir: Path) -> List[Path]:
+    """
+    Convert the online and offline sheets of the two default workbooks.
+
+    Kept for callers of the former text converter: the sheets 'onlindata_HK_453' and
+    'offlindata_HK_45' are now converted with convert_sheet() into run store
+    directories of the same names in output_dir, not into .txt files.
+
+    :param excel_file_1: Workbook holding the 'onlindata_HK_453' sheet.
+    :param excel_file_2: Workbook holding the 'offlindata_HK_45' sheet.
+    :param output_dir: Directory of the run store directories.
+    :return: The two run store directories.
+    """
+    logger.warning("convert_excel_to_txt() writes run store directories instead of .txt files; "
+                   "use convert_sheet().")
+    return [
+        convert_sheet(excel_file, sheet_name, Path(output_dir) / sheet_name)
+        for excel_file, sheet_name in ((excel_file_1, 'onlindata_HK_453'), (excel_file_2, 'offlindata_HK_45'))
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Convert Excel export sheets into run store directories.')
+    parser.add_argument('files', nargs='*', type=Path, default=DEFAULT_FILES, help='Excel workbooks.')
+    parser.add_argument('--sheets', nargs='+', help='Sheet of each workbook (default: the file name without suffix).')
+    parser.add_argument('--output-dir', type=Path, default=PROJECT_ROOT / 'data', help='Output directory.')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    sheets = args.sheets or [excel_file.stem for excel_file in args.files]
+    if len(sheets) != len(args.files):
+        parser.error('Give one sheet name per workbook.')
+    for excel_file, sheet_name in zip(args.files, sheets):
+        convert_sheet(excel_file, sheet_name, args.output_dir / sheet_name)
+
+
+if __name__ == "__main__":
+    main()